@@ -1,15 +1,33 @@
-import tkinter as tk
-from tkinter import filedialog, ttk, messagebox
-import win32com.client as win32com
+try:
+    import tkinter as tk
+    from tkinter import filedialog, ttk, messagebox
+except ImportError:
+    # The export itself runs through plc5_api and needs no Tk
+    tk = filedialog = ttk = messagebox = None
 import os
-import re
 import threading
 from datetime import datetime
-from openpyxl import Workbook
-from openpyxl.utils import get_column_letter
+
+from plc5_api import export_project
+from plc5_log import LogQueue
+from plc5_progress import ExportProgress, ProgressView
+from plc5_settings import PLAIN_SETTINGS, snapshot
+
+
+# The export options behind the checkboxes (settings of plc5_api.export_project)
+EXPORT_OPTIONS = (
+    'export_tags', 'export_timers', 'export_counters', 'export_controls', 'export_arrays',
+    'export_messages', 'export_io', 'export_rungs', 'export_datatable', 'preload_symbols',
+    'record_fixture', 'collect_stats', 'export_parquet', 'export_database', 'export_csv',
+    'export_jsonl', 'export_xlsx',
+)
 
 
 class PLC5ExcelExporter:
+    # Messages sheet headed LocalLength/RemoteNode/RemoteLength, or with the
+    # MSG dialog's names Size/PortNumber/DHPlusNode (PLC5ExcelExporterMsgs)
+    MESSAGE_ALIASES = False
+    
     def __init__(self, root):
         self.root = root
         self.root.title("PLC-5 RSP to Excel Exporter")
@@ -18,6 +36,10 @@ class PLC5ExcelExporter:
         self.rsp_file = None
         self.output_folder = None
         self.is_processing = False
+        # Max cached lookups per project (None = unbounded, set for huge projects)
+        self.lookup_cache_size = None
+        # Simulated per-call COM latency (seconds) when replaying .plc5rec fixtures
+        self.replay_latency = 0.0
         
         self.setup_ui()
     
@@ -49,6 +71,14 @@ class PLC5ExcelExporter:
         self.export_io = tk.BooleanVar(value=True)
         self.export_rungs = tk.BooleanVar(value=True)
         self.export_datatable = tk.BooleanVar(value=False)
+        self.preload_symbols = tk.BooleanVar(value=True)
+        self.record_fixture = tk.BooleanVar(value=False)
+        self.collect_stats = tk.BooleanVar(value=False)
+        self.export_parquet = tk.BooleanVar(value=False)
+        self.export_database = tk.BooleanVar(value=False)
+        self.export_csv = tk.BooleanVar(value=False)
+        self.export_jsonl = tk.BooleanVar(value=False)
+        self.export_xlsx = tk.BooleanVar(value=True)
         
         ttk.Checkbutton(options_frame, text="Tags/Addresses", variable=self.export_tags).grid(row=0, column=0, sticky="w")
         ttk.Checkbutton(options_frame, text="Timers", variable=self.export_timers).grid(row=0, column=1, sticky="w")
@@ -59,20 +89,36 @@ class PLC5ExcelExporter:
         ttk.Checkbutton(options_frame, text="I/O Points", variable=self.export_io).grid(row=2, column=0, sticky="w")
         ttk.Checkbutton(options_frame, text="Ladder Rungs", variable=self.export_rungs).grid(row=2, column=1, sticky="w")
         ttk.Checkbutton(options_frame, text="Data Table (slow)", variable=self.export_datatable).grid(row=2, column=2, sticky="w")
+        ttk.Checkbutton(options_frame, text="Preload Symbols (fast)", variable=self.preload_symbols).grid(row=3, column=0, sticky="w")
+        ttk.Checkbutton(options_frame, text="Record COM Fixture", variable=self.record_fixture).grid(row=3, column=1, sticky="w")
+        ttk.Checkbutton(options_frame, text="COM Call Stats", variable=self.collect_stats).grid(row=3, column=2, sticky="w")
+        ttk.Checkbutton(options_frame, text="Parquet Files", variable=self.export_parquet).grid(row=4, column=0, sticky="w")
+        ttk.Checkbutton(options_frame, text="SQLite Database", variable=self.export_database).grid(row=4, column=1, sticky="w")
+        ttk.Checkbutton(options_frame, text="CSV Files", variable=self.export_csv).grid(row=4, column=2, sticky="w")
+        ttk.Checkbutton(options_frame, text="JSON Lines", variable=self.export_jsonl).grid(row=5, column=0, sticky="w")
+        ttk.Checkbutton(options_frame, text="Excel Workbook", variable=self.export_xlsx).grid(row=5, column=1, sticky="w")
         
         # Progress frame
         progress_frame = ttk.LabelFrame(self.root, text="Progress", padding=10)
         progress_frame.pack(fill="both", expand=True, padx=10, pady=5)
         
-        self.progress_bar = ttk.Progressbar(progress_frame, mode='indeterminate')
+        self.progress_bar = ttk.Progressbar(progress_frame, mode='determinate')
         self.progress_bar.pack(fill="x", pady=5)
         
+        self.progress_label = ttk.Label(progress_frame, text="")
+        self.progress_label.pack(anchor="w")
+        
         self.log_text = tk.Text(progress_frame, height=10, wrap="word", state="disabled")
         self.log_text.pack(fill="both", expand=True)
         
         scrollbar = ttk.Scrollbar(self.log_text, command=self.log_text.yview)
         scrollbar.pack(side="right", fill="y")
         self.log_text.config(yscrollcommand=scrollbar.set)
+        # Worker threads log through a queue that the Tk main loop drains
+        self.log_queue = LogQueue(self.root, self.log_text)
+        # The worker updates progress; the main loop polls it onto the bar
+        self.progress = ExportProgress()
+        self.progress_view = ProgressView(self.root, self.progress_bar, self.progress_label, self.progress)
         
         # Action buttons
         button_frame = ttk.Frame(self.root)
@@ -81,12 +127,15 @@ class PLC5ExcelExporter:
         self.export_btn = ttk.Button(button_frame, text="Export to Excel", command=self.start_export, state="disabled")
         self.export_btn.pack(side="left", padx=5)
         
+        self.cancel_btn = ttk.Button(button_frame, text="Cancel", command=self.cancel_export, state="disabled")
+        self.cancel_btn.pack(side="left", padx=5)
+        
         ttk.Button(button_frame, text="Exit", command=self.root.quit).pack(side="right", padx=5)
     
     def browse_rsp(self):
         filename = filedialog.askopenfilename(
             title="Select PLC-5 RSP File",
-            filetypes=[("RSLogix 5 Files", "*.rsp"), ("All Files", "*.*")]
+            filetypes=[("RSLogix 5 Files", "*.rsp"), ("RSLogix 5 ASCII Export", "*.pc5"), ("Recorded COM Fixture", "*.plc5rec"), ("All Files", "*.*")]
         )
         if filename:
             self.rsp_file = filename
@@ -105,12 +154,8 @@ class PLC5ExcelExporter:
             self.log(f"Output folder: {folder}")
     
     def log(self, message):
-        self.log_text.config(state="normal")
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        self.log_text.insert("end", f"[{timestamp}] {message}\n")
-        self.log_text.see("end")
-        self.log_text.config(state="disabled")
-        self.root.update()
+        """Log from any thread; the widget is updated by the Tk main loop"""
+        self.log_queue.log(message)
     
     def start_export(self):
         if self.is_processing:
@@ -122,438 +167,70 @@ class PLC5ExcelExporter:
         
         self.is_processing = True
         self.export_btn.config(state="disabled")
-        self.progress_bar.start()
+        self.cancel_btn.config(state="normal")
+        self.progress.reset()
+        self.progress_view.start()
         
         thread = threading.Thread(target=self.export_data, daemon=True)
         thread.start()
     
+    def export_finished(self):
+        """Re-enable the GUI after an export (runs on the Tk main loop)"""
+        self.is_processing = False
+        self.progress_view.stop()
+        self.cancel_btn.config(state="disabled")
+        self.export_btn.config(state="normal")
+    
+    def cancel_export(self):
+        """Stop at the next rung boundary and save what was collected so far"""
+        self.progress.cancel()
+        self.cancel_btn.config(state="disabled")
+        self.log("Cancelling: stopping at the next rung...")
+    
+    def settings(self):
+        """The export options for plc5_api.export_project; this exporter writes no configuration sheets"""
+        settings = snapshot(self, EXPORT_OPTIONS + PLAIN_SETTINGS)
+        settings.update(
+            export_processor=False,
+            export_channel_config=False,
+            export_io_config=False,
+            message_aliases=self.MESSAGE_ALIASES,
+        )
+        return settings
+    
     def export_data(self):
         try:
-            self.log("Opening RSLogix5 Application...")
-            rslogix5 = win32com.Dispatch("RSLogix5.Application.5")
-            rslogix5.visible = True
-            
-            abs_path = os.path.abspath(self.rsp_file)
-            self.log(f"Opening project: {abs_path}")
-            project = rslogix5.FileOpen(abs_path, False, False, True)
-            
-            program_files = project.ProgramFiles
-            addr_sym_records = project.AddrSymRecords
-            datafiles = project.DataFiles
-            
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             base_name = os.path.splitext(os.path.basename(self.rsp_file))[0]
+            # The widget only keeps recent lines; the full log goes to a file
+            self.log_queue.open_file(os.path.join(self.output_folder, f"{base_name}_Log_{timestamp}.log"))
             
-            # Create workbook
-            wb = Workbook()
-            wb.remove(wb.active)  # Remove default sheet
-            
-            # Collect all data
-            self.log("Analyzing ladder logic...")
-            data_collection = self.analyze_ladder_logic(program_files, addr_sym_records, datafiles)
-            
-            # Add rungs if requested
-            if self.export_rungs.get():
-                self.log("Extracting ladder rungs...")
-                data_collection['rungs'] = self.collect_rungs(program_files)
-            
-            # Add datatable if requested
-            if self.export_datatable.get():
-                self.log("Extracting data table...")
-                data_collection['datatable'] = self.collect_datatable(datafiles)
-            
-            # Write all sheets to Excel
-            self.log("Writing Excel file...")
-            self.write_excel_workbook(wb, data_collection)
-            
-            # Save workbook
-            excel_file = os.path.join(self.output_folder, f"{base_name}_Export_{timestamp}.xlsx")
-            wb.save(excel_file)
-            
-            self.log("Closing project...")
-            rslogix5.Quit(True, False)
+            result = export_project(self.rsp_file, self.settings(), self.log, self.progress)
+            if not result.ok:
+                self.log(result.error)
+                self.log_queue.call(messagebox.showerror, "Error", f"Export failed:\n{result.error.splitlines()[0]}")
+                return
             
             self.log("=" * 50)
+            if result.cancelled:
+                self.log("Export cancelled; partial output saved")
+                self.log(f"Output saved: {result.output}")
+                self.log_queue.call(messagebox.showwarning, "Cancelled",
+                                    f"Export cancelled; partial output saved.\n\n{os.path.basename(result.output)}")
+                return
             self.log(f"Export completed successfully!")
-            self.log(f"File saved: {excel_file}")
+            self.log(f"Output saved: {result.output}")
             
-            messagebox.showinfo("Success", f"Export completed!\n\n{os.path.basename(excel_file)}")
+            self.log_queue.call(messagebox.showinfo, "Success", f"Export completed!\n\n{os.path.basename(result.output)}")
             
         except Exception as e:
             import traceback
             self.log(f"ERROR: {str(e)}")
             self.log(traceback.format_exc())
-            messagebox.showerror("Error", f"Export failed:\n{str(e)}")
+            self.log_queue.call(messagebox.showerror, "Error", f"Export failed:\n{str(e)}")
         finally:
-            self.is_processing = False
-            self.progress_bar.stop()
-            self.export_btn.config(state="normal")
-    
-    def analyze_ladder_logic(self, program_files, addr_sym_records, datafiles):
-        """Collect all data from ladder analysis"""
-        data = {
-            'timers': {},
-            'counters': {},
-            'controls': {},
-            'arrays': [],
-            'messages': {},
-            'tags': {},
-            'io': {}
-        }
-        
-        for file_idx in range(2, program_files.Count()):
-            try:
-                ladder_file = program_files(file_idx)
-                if ladder_file and ladder_file.NumberOfRungs() > 0:
-                    self.log(f"  Analyzing: {ladder_file.Name}")
-                    for rung_idx in range(ladder_file.NumberOfRungs()):
-                        try:
-                            rung_ascii = ladder_file.GetRungAsAscii(rung_idx)
-                            
-                            # Extract addresses
-                            self.extract_addresses(rung_ascii, data['tags'], data['io'], 
-                                                  addr_sym_records, datafiles)
-                            
-                            # Extract components
-                            if self.export_timers.get():
-                                self.extract_timers(rung_ascii, data['timers'], addr_sym_records)
-                            if self.export_counters.get():
-                                self.extract_counters(rung_ascii, data['counters'], addr_sym_records)
-                            if self.export_controls.get():
-                                self.extract_controls(rung_ascii, data['controls'], addr_sym_records)
-                            if self.export_messages.get():
-                                self.extract_messages(rung_ascii, data['messages'], addr_sym_records)
-                        except:
-                            continue
-            except:
-                continue
-        
-        return data
-    
-    def extract_addresses(self, rung, tags, io, addr_sym_records, datafiles):
-        """Extract addresses from rung"""
-        pattern = re.compile(r'\b([IONBFLTCRS]:\d+(?:/\d+)?|[BNTCR]\d+:\d+(?:/\d+)?)\b')
-        
-        for addr in pattern.findall(rung):
-            if addr in tags or addr in io:
-                continue
-            
-            symbol, desc = self.get_symbol_desc(addr, addr_sym_records)
-            value = self.get_value(addr, datafiles)
-            
-            if addr.startswith('I:') or addr.startswith('O:'):
-                io[addr] = {
-                    'Type': 'Input' if addr.startswith('I:') else 'Output',
-                    'Address': addr,
-                    'Symbol': symbol,
-                    'Description': desc,
-                    'Value': value
-                }
-            else:
-                tags[addr] = {
-                    'Address': addr,
-                    'Symbol': symbol,
-                    'Description': desc,
-                    'DataType': self.get_data_type(addr),
-                    'Value': value
-                }
-    
-    def extract_timers(self, rung, timers, addr_sym_records):
-        pattern = re.compile(r'(TON|TOF|RTO)\s+(\S+)\s+(\S+)\s+(\S+)\s+(\S+)')
-        for match in pattern.findall(rung):
-            addr = match[1]
-            if addr not in timers:
-                symbol, desc = self.get_symbol_desc(addr, addr_sym_records)
-                timers[addr] = {
-                    'Type': match[0],
-                    'Address': addr,
-                    'Symbol': symbol,
-                    'Description': desc,
-                    'Base': match[2],
-                    'PRE': match[3],
-                    'ACC': match[4]
-                }
-    
-    def extract_counters(self, rung, counters, addr_sym_records):
-        pattern = re.compile(r'(CTU|CTD)\s+(\S+)\s+(\S+)\s+(\S+)')
-        for match in pattern.findall(rung):
-            addr = match[1]
-            if addr not in counters:
-                symbol, desc = self.get_symbol_desc(addr, addr_sym_records)
-                counters[addr] = {
-                    'Type': match[0],
-                    'Address': addr,
-                    'Symbol': symbol,
-                    'Description': desc,
-                    'PRE': match[2],
-                    'ACC': match[3]
-                }
-    
-    def extract_controls(self, rung, controls, addr_sym_records):
-        pattern = re.compile(r'(FAL|FSC|FFL|FFU|COP|DDT|FBC)\s+(\S+)\s+(\S+)\s+(\S+)')
-        for match in pattern.findall(rung):
-            addr = match[1]
-            if addr not in controls:
-                symbol, desc = self.get_symbol_desc(addr, addr_sym_records)
-                controls[addr] = {
-                    'Instruction': match[0],
-                    'Address': addr,
-                    'Symbol': symbol,
-                    'Description': desc,
-                    'Length': match[2],
-                    'Position': match[3]
-                }
-    
-    def extract_messages(self, rung, messages, addr_sym_records):
-        """
-        Extract MSG instructions from a rung, capturing ALL parameters
-        and assigning PLC-5 style headings.
-        """
-
-        # Allow for multiline rungs: MSG ... EOR with anything (incl. \r\n) in between
-        pattern = re.compile(r'\bMSG\b\s+([\s\S]*?)\bEOR\b', re.IGNORECASE)
-        msg_blocks = pattern.findall(rung)
-
-        for block in msg_blocks:
-            parts = block.split()
-            if len(parts) < 4:
-                # Need at least: ControlBlock, PLC_Family, DataType, Direction
-                continue
-
-            def get(idx):
-                return parts[idx] if idx < len(parts) else ""
-
-            # PLC-5 MSG parameter convention:
-            # MSG <ControlBlock> <PLCFamily> <DataType> <Direction>
-            #     <LocalAddr> <LocalLen> <RemoteNode> <RemoteAddr> <RemoteLen> <PortType> <Channel>
-            ctrl_block  = get(0)
-            plc_family  = get(1)
-            data_type   = get(2)
-            direction   = get(3)
-
-            local_addr  = get(4)
-            local_len   = get(5)
-            remote_node = get(6)
-            remote_addr = get(7)
-            remote_len  = get(8)
-            port        = get(9)
-            channel     = get(10)
-
-            # Symbol/description lookup
-            symbol, desc = self.get_symbol_desc(ctrl_block, addr_sym_records)
-
-            # Don't overwrite if we've already seen this control block
-            if ctrl_block in messages:
-                continue
-
-            messages[ctrl_block] = {
-                # Keep Address for compatibility with the rest of the tool
-                "Address": ctrl_block,
-                "Symbol": symbol,
-                "Description": desc,
-
-                "PLC_Family": plc_family,
-                "DataType": data_type,
-                "Direction": direction,
-
-                "LocalAddr": local_addr,
-                "LocalLength": local_len,
-
-                "RemoteNode": remote_node,
-                "RemoteAddr": remote_addr,
-                "RemoteLength": remote_len,
-
-                "PortType": port,
-                "Channel": channel,
-
-                # Optional: useful when you want to debug the raw MSG string
-                "RawParameters": " ".join(parts),
-            }
-
-    
-    def collect_rungs(self, program_files):
-        """Collect all rungs"""
-        rungs = []
-        for file_idx in range(2, program_files.Count()):
-            try:
-                ladder_file = program_files(file_idx)
-                if ladder_file and ladder_file.NumberOfRungs() > 0:
-                    for rung_idx in range(ladder_file.NumberOfRungs()):
-                        try:
-                            rungs.append({
-                                'File_Name': ladder_file.Name,
-                                'File_Number': ladder_file.FileNumber,
-                                'Rung_Number': rung_idx,
-                                'Rung_ASCII': ladder_file.GetRungAsAscii(rung_idx)
-                            })
-                        except:
-                            continue
-            except:
-                continue
-        return rungs
-    
-    def collect_datatable(self, datafiles):
-        """Collect datatable values"""
-        data = []
-        for file_idx in range(datafiles.Count()):
-            try:
-                datafile = datafiles(file_idx)
-                if datafile:
-                    file_type = datafile.TypeAsString
-                    if file_type in ['B', 'N', 'F', 'L', 'T', 'C', 'R']:
-                        file_num = datafile.FileNumber
-                        for elem in range(min(datafile.NumberOfElements, 1000)):
-                            addr = f"{file_type}{file_num}:{elem}"
-                            try:
-                                data.append({
-                                    'FileType': file_type,
-                                    'FileNumber': file_num,
-                                    'Element': elem,
-                                    'Address': addr,
-                                    'Value': datafiles.GetDataValue(addr)
-                                })
-                            except:
-                                pass
-            except:
-                continue
-        return data
-    
-    def write_excel_workbook(self, wb, data):
-        """Write all data to Excel sheets"""
-        if self.export_tags.get() and data['tags']:
-            self.write_sheet(wb, 'Tags', 
-                           ['Address', 'Symbol', 'Description', 'DataType', 'Value'],
-                           data['tags'].values())
-            self.log(f"  Wrote {len(data['tags'])} tags")
-        
-        if self.export_io.get() and data['io']:
-            self.write_sheet(wb, 'IO',
-                           ['Type', 'Address', 'Symbol', 'Description', 'Value'],
-                           data['io'].values())
-            self.log(f"  Wrote {len(data['io'])} I/O points")
-        
-        if self.export_timers.get() and data['timers']:
-            self.write_sheet(wb, 'Timers',
-                           ['Type', 'Address', 'Symbol', 'Description', 'Base', 'PRE', 'ACC'],
-                           data['timers'].values())
-            self.log(f"  Wrote {len(data['timers'])} timers")
-        
-        if self.export_counters.get() and data['counters']:
-            self.write_sheet(wb, 'Counters',
-                           ['Type', 'Address', 'Symbol', 'Description', 'PRE', 'ACC'],
-                           data['counters'].values())
-            self.log(f"  Wrote {len(data['counters'])} counters")
-        
-        if self.export_controls.get() and data['controls']:
-            self.write_sheet(wb, 'Controls',
-                           ['Instruction', 'Address', 'Symbol', 'Description', 'Length', 'Position'],
-                           data['controls'].values())
-            self.log(f"  Wrote {len(data['controls'])} controls")
-        
-        if self.export_messages.get() and data['messages']:
-            self.write_sheet(
-                wb,
-                'Messages',
-                [
-                    'Address',
-                    'Symbol',
-                    'Description',
-                    'PLC_Family',
-                    'DataType',
-                    'Direction',
-                    'LocalAddr',
-                    'LocalLength',
-                    'RemoteNode',
-                    'RemoteAddr',
-                    'RemoteLength',
-                    'PortType',
-                    'Channel',
-                    'RawParameters',   # optional, but handy
-                ],
-                data['messages'].values()
-            )
-            self.log(f"  Wrote {len(data['messages'])} messages")
-
-        
-        if 'rungs' in data and data['rungs']:
-            self.write_sheet(wb, 'Rungs',
-                           ['File_Name', 'File_Number', 'Rung_Number', 'Rung_ASCII'],
-                           data['rungs'])
-            self.log(f"  Wrote {len(data['rungs'])} rungs")
-        
-        if 'datatable' in data and data['datatable']:
-            self.write_sheet(wb, 'DataTable',
-                           ['FileType', 'FileNumber', 'Element', 'Address', 'Value'],
-                           data['datatable'])
-            self.log(f"  Wrote {len(data['datatable'])} datatable values")
-    
-    def write_sheet(self, wb, sheet_name, headers, rows):
-        """Write data to a sheet efficiently, expanding Description into Desc1..Desc5 when present"""
-        ws = wb.create_sheet(title=sheet_name)
-
-        # If a Description column exists, replace it with Desc1..Desc5
-        if 'Description' in headers:
-            desc_index = headers.index('Description')
-            new_headers = (
-                headers[:desc_index]
-                + ['Desc1', 'Desc2', 'Desc3', 'Desc4', 'Desc5']
-                + headers[desc_index + 1:]
-            )
-        else:
-            new_headers = headers
-
-        ws.append(new_headers)
-
-        for row in rows:
-            if isinstance(row, dict):
-                values = [row.get(h, '') for h in headers]
-            else:
-                values = list(row)
-
-            # Split description into 5 columns if applicable
-            if 'Description' in headers:
-                desc_index = headers.index('Description')
-                desc_text = str(values[desc_index]).strip()
-                # Split on pipe, comma, or semicolon — keep non-empty, trimmed parts
-                split_desc = [part.strip() for part in re.split(r'\||,|;', desc_text) if part.strip()]
-                desc_parts = (split_desc + [''] * 5)[:5]  # Always 5 columns
-                values = values[:desc_index] + desc_parts + values[desc_index + 1:]
-
-            ws.append(values)
-
-        # Auto-size columns
-        for col_idx, col in enumerate(ws.columns, 1):
-            max_length = 0
-            column = get_column_letter(col_idx)
-            for cell in col:
-                if cell.value:
-                    max_length = max(max_length, len(str(cell.value)))
-            ws.column_dimensions[column].width = min(max_length + 2, 50)
-    
-    def get_symbol_desc(self, addr, addr_sym_records):
-        try:
-            record = addr_sym_records.GetRecordViaAddrOrSym(addr, 0)
-            if record:
-                return (record.Symbol or "", 
-                       (record.Description or "").replace('\r\n', ' | '))
-        except:
-            pass
-        return "", ""
-    
-    def get_value(self, addr, datafiles):
-        try:
-            return datafiles.GetDataValue(addr)
-        except:
-            return ""
-    
-    def get_data_type(self, addr):
-        if ':' not in addr:
-            return "Unknown"
-        prefix = addr.split(':')[0].replace('#', '')
-        types = {'I': 'Input', 'O': 'Output', 'B': 'Bit', 'N': 'Integer',
-                'F': 'Float', 'L': 'Long', 'T': 'Timer', 'C': 'Counter',
-                'R': 'Control', 'S': 'Status'}
-        return types.get(prefix, prefix)
+            self.log_queue.close_file()
+            self.log_queue.call(self.export_finished)
 
 
 if __name__ == "__main__":
@@ -1,12 +1,79 @@
-import tkinter as tk
-from tkinter import filedialog, ttk, messagebox
-import win32com.client as win32com
+try:
+    import tkinter as tk
+    from tkinter import filedialog, ttk, messagebox
+except ImportError:
+    # Headless use (plc5_api, plc5_cli) needs no Tk
+    tk = filedialog = ttk = messagebox = None
 import os
-import re
 import threading
+import time
 from datetime import datetime
-from openpyxl import Workbook
-from openpyxl.utils import get_column_letter
+
+from plc5_apartment import read_rungs
+from plc5_address import data_type
+from plc5_backend import FIXTURE_EXTENSION, ProjectOpener, find_projects, output_names
+from plc5_compress import COMPRESSIONS, DEFAULT_LEVEL
+from plc5_csvstream import CSVTables
+from plc5_datatable import DATATABLE_HEADERS, iter_datatable
+from plc5_log import LogQueue
+from plc5_manifest import ExportManifest
+from plc5_parquet import ParquetTables
+from plc5_pipeline import PARSE_WORKERS, STAGE_STATS_HEADERS, RungPipeline, parse_workers
+from plc5_pool import ExportPool, ProjectResult
+from plc5_progress import ExportProgress, ProgressView, ladder_files
+from plc5_schedule import CostModel
+from plc5_settings import apply_settings, snapshot
+from plc5_sinks import SINKS, ExportJob, ExportSheets, primary_output, write_outputs
+from plc5_stats import RUN_STATS_HEADERS, RunStats
+from plc5_symbols import LookupResolver, SymbolIndex
+from plc5_tokenizer import (
+    CONTROL_INSTRUCTIONS, COUNTER_INSTRUCTIONS, TIMER_INSTRUCTIONS,
+    find_addresses, find_message_blocks, tokenize_rung,
+)
+from plc5_xlsx import RowSpool, stream_sheet
+
+
+# Tables the rung pipeline fills: the extractors' tables plus the rungs
+PIPELINE_TABLES = ('timers', 'counters', 'controls', 'messages', 'tags', 'io', 'rungs')
+
+
+# Settings that only affect how a batch runs, not what each export contains
+RUN_SETTINGS = ('recursive', 'workers', 'force_export', 'replay_fixtures', 'output_folder', 'replay_latency')
+
+# Every setting and its default; the GUI's checkboxes start from these
+DEFAULT_SETTINGS = {
+    'recursive': True,
+    'force_export': False,
+    'replay_fixtures': False,
+    'workers': 1,
+    'export_tags': True,
+    'export_timers': True,
+    'export_counters': True,
+    'export_controls': True,
+    'export_arrays': True,
+    'export_messages': True,
+    'export_io': True,
+    'export_rungs': True,
+    'export_datatable': False,
+    'preload_symbols': True,
+    'record_fixture': False,
+    'collect_stats': False,
+    'export_parquet': False,
+    'export_database': False,
+    'export_csv': False,
+    'export_jsonl': False,
+    'export_xlsx': True,
+    'message_aliases': True,
+    'stream_csv': False,
+    'compression': 'none',
+    'compression_level': DEFAULT_LEVEL,
+    'export_processor': True,
+    'export_channel_config': True,
+    'export_io_config': True,
+    'output_folder': None,
+    'lookup_cache_size': None,
+    'replay_latency': 0.0,
+}
 
 
 class PLC5ExcelExporter:
@@ -20,6 +87,10 @@ class PLC5ExcelExporter:
         # Optional separate output folder
         self.output_folder = None
         self.is_processing = False
+        # Max cached lookups per project (None = unbounded, set for huge projects)
+        self.lookup_cache_size = None
+        # Simulated per-call COM latency (seconds) when replaying .plc5rec fixtures
+        self.replay_latency = 0.0
 
         self.setup_ui()
     
@@ -39,30 +110,69 @@ class PLC5ExcelExporter:
         ttk.Button(file_frame, text="Browse...", command=self.browse_output).grid(row=1, column=2, padx=5)
         
         # Recursive search option
-        self.recursive = tk.BooleanVar(value=True)
+        self.recursive = tk.BooleanVar(value=DEFAULT_SETTINGS['recursive'])
         ttk.Checkbutton(
             file_frame,
             text="Recursive subfolders",
             variable=self.recursive
         ).grid(row=2, column=1, sticky="w", pady=5)
         
+        # Incremental export: unchanged projects keep their previous workbook
+        self.force_export = tk.BooleanVar(value=DEFAULT_SETTINGS['force_export'])
+        ttk.Checkbutton(
+            file_frame,
+            text="Force re-export of unchanged projects",
+            variable=self.force_export
+        ).grid(row=3, column=1, sticky="w", pady=5)
+        
+        # Recorded fixtures are only exported when asked for (they are saved next to the exports)
+        self.replay_fixtures = tk.BooleanVar(value=DEFAULT_SETTINGS['replay_fixtures'])
+        ttk.Checkbutton(
+            file_frame,
+            text="Replay .plc5rec fixtures",
+            variable=self.replay_fixtures
+        ).grid(row=3, column=2, sticky="w", pady=5)
+        
+        # Parallel workers (one RSLogix instance per worker process)
+        self.workers = tk.IntVar(value=DEFAULT_SETTINGS['workers'])
+        worker_frame = ttk.Frame(file_frame)
+        worker_frame.grid(row=2, column=2, sticky="w", pady=5)
+        ttk.Label(worker_frame, text="Workers:").pack(side="left")
+        ttk.Spinbox(
+            worker_frame,
+            from_=1,
+            to=os.cpu_count() or 1,
+            width=4,
+            textvariable=self.workers
+        ).pack(side="left", padx=5)
+        
         # Export options
         options_frame = ttk.LabelFrame(self.root, text="Export Options", padding=10)
         options_frame.pack(fill="x", padx=10, pady=5)
 
-        self.export_tags = tk.BooleanVar(value=True)
-        self.export_timers = tk.BooleanVar(value=True)
-        self.export_counters = tk.BooleanVar(value=True)
-        self.export_controls = tk.BooleanVar(value=True)
-        self.export_arrays = tk.BooleanVar(value=True)
-        self.export_messages = tk.BooleanVar(value=True)
-        self.export_io = tk.BooleanVar(value=True)
-        self.export_rungs = tk.BooleanVar(value=True)
-        self.export_datatable = tk.BooleanVar(value=False)
+        self.export_tags = tk.BooleanVar(value=DEFAULT_SETTINGS['export_tags'])
+        self.export_timers = tk.BooleanVar(value=DEFAULT_SETTINGS['export_timers'])
+        self.export_counters = tk.BooleanVar(value=DEFAULT_SETTINGS['export_counters'])
+        self.export_controls = tk.BooleanVar(value=DEFAULT_SETTINGS['export_controls'])
+        self.export_arrays = tk.BooleanVar(value=DEFAULT_SETTINGS['export_arrays'])
+        self.export_messages = tk.BooleanVar(value=DEFAULT_SETTINGS['export_messages'])
+        self.export_io = tk.BooleanVar(value=DEFAULT_SETTINGS['export_io'])
+        self.export_rungs = tk.BooleanVar(value=DEFAULT_SETTINGS['export_rungs'])
+        self.export_datatable = tk.BooleanVar(value=DEFAULT_SETTINGS['export_datatable'])
+        self.preload_symbols = tk.BooleanVar(value=DEFAULT_SETTINGS['preload_symbols'])
+        self.record_fixture = tk.BooleanVar(value=DEFAULT_SETTINGS['record_fixture'])
+        self.collect_stats = tk.BooleanVar(value=DEFAULT_SETTINGS['collect_stats'])
+        self.export_parquet = tk.BooleanVar(value=DEFAULT_SETTINGS['export_parquet'])
+        self.export_database = tk.BooleanVar(value=DEFAULT_SETTINGS['export_database'])
+        self.export_csv = tk.BooleanVar(value=DEFAULT_SETTINGS['export_csv'])
+        self.export_jsonl = tk.BooleanVar(value=DEFAULT_SETTINGS['export_jsonl'])
+        self.export_xlsx = tk.BooleanVar(value=DEFAULT_SETTINGS['export_xlsx'])
+        self.message_aliases = tk.BooleanVar(value=DEFAULT_SETTINGS['message_aliases'])
+        self.stream_csv = tk.BooleanVar(value=DEFAULT_SETTINGS['stream_csv'])
         # New export options for configuration data
-        self.export_processor = tk.BooleanVar(value=True)
-        self.export_channel_config = tk.BooleanVar(value=True)
-        self.export_io_config = tk.BooleanVar(value=True)
+        self.export_processor = tk.BooleanVar(value=DEFAULT_SETTINGS['export_processor'])
+        self.export_channel_config = tk.BooleanVar(value=DEFAULT_SETTINGS['export_channel_config'])
+        self.export_io_config = tk.BooleanVar(value=DEFAULT_SETTINGS['export_io_config'])
 
         ttk.Checkbutton(options_frame, text="Tags/Addresses", variable=self.export_tags).grid(row=0, column=0, sticky="w")
         ttk.Checkbutton(options_frame, text="Timers", variable=self.export_timers).grid(row=0, column=1, sticky="w")
@@ -77,20 +187,60 @@ class PLC5ExcelExporter:
         ttk.Checkbutton(options_frame, text="Processor Info", variable=self.export_processor).grid(row=3, column=0, sticky="w")
         ttk.Checkbutton(options_frame, text="Channel Config", variable=self.export_channel_config).grid(row=3, column=1, sticky="w")
         ttk.Checkbutton(options_frame, text="I/O Config", variable=self.export_io_config).grid(row=3, column=2, sticky="w")
+        ttk.Checkbutton(options_frame, text="Preload Symbols (fast)", variable=self.preload_symbols).grid(row=4, column=0, sticky="w")
+        ttk.Checkbutton(options_frame, text="Record COM Fixture", variable=self.record_fixture).grid(row=4, column=1, sticky="w")
+        ttk.Checkbutton(options_frame, text="COM Call Stats", variable=self.collect_stats).grid(row=4, column=2, sticky="w")
+        ttk.Checkbutton(options_frame, text="Parquet Files", variable=self.export_parquet).grid(row=5, column=0, sticky="w")
+        ttk.Checkbutton(options_frame, text="SQLite Database", variable=self.export_database).grid(row=5, column=1, sticky="w")
+        ttk.Checkbutton(options_frame, text="CSV Files", variable=self.export_csv).grid(row=5, column=2, sticky="w")
+        ttk.Checkbutton(options_frame, text="JSON Lines", variable=self.export_jsonl).grid(row=6, column=0, sticky="w")
+        ttk.Checkbutton(options_frame, text="Excel Workbook", variable=self.export_xlsx).grid(row=6, column=1, sticky="w")
+        ttk.Checkbutton(options_frame, text="Stream CSV Rows", variable=self.stream_csv).grid(row=6, column=2, sticky="w")
+        
+        # CSV compression (written on the fly; lower levels are faster)
+        self.compression = tk.StringVar(value=DEFAULT_SETTINGS['compression'])
+        self.compression_level = tk.IntVar(value=DEFAULT_SETTINGS['compression_level'])
+        compression_frame = ttk.Frame(options_frame)
+        compression_frame.grid(row=7, column=0, columnspan=3, sticky="w", pady=(5, 0))
+        ttk.Label(compression_frame, text="CSV Compression:").pack(side="left")
+        ttk.Combobox(
+            compression_frame,
+            values=COMPRESSIONS,
+            state="readonly",
+            width=6,
+            textvariable=self.compression
+        ).pack(side="left", padx=5)
+        ttk.Label(compression_frame, text="Level:").pack(side="left")
+        ttk.Spinbox(
+            compression_frame,
+            from_=1,
+            to=22,
+            width=4,
+            textvariable=self.compression_level
+        ).pack(side="left", padx=5)
+        ttk.Checkbutton(options_frame, text="MSG Size/Port Headings", variable=self.message_aliases).grid(row=8, column=0, sticky="w")
         
         # Progress frame
         progress_frame = ttk.LabelFrame(self.root, text="Progress", padding=10)
         progress_frame.pack(fill="both", expand=True, padx=10, pady=5)
         
-        self.progress_bar = ttk.Progressbar(progress_frame, mode='indeterminate')
+        self.progress_bar = ttk.Progressbar(progress_frame, mode='determinate')
         self.progress_bar.pack(fill="x", pady=5)
         
+        self.progress_label = ttk.Label(progress_frame, text="")
+        self.progress_label.pack(anchor="w")
+        
         self.log_text = tk.Text(progress_frame, height=10, wrap="word", state="disabled")
         self.log_text.pack(fill="both", expand=True)
         
         scrollbar = ttk.Scrollbar(self.log_text, command=self.log_text.yview)
         scrollbar.pack(side="right", fill="y")
         self.log_text.config(yscrollcommand=scrollbar.set)
+        # Worker threads log through a queue that the Tk main loop drains
+        self.log_queue = LogQueue(self.root, self.log_text)
+        # The worker updates progress; the main loop polls it onto the bar
+        self.progress = ExportProgress()
+        self.progress_view = ProgressView(self.root, self.progress_bar, self.progress_label, self.progress)
         
         # Action buttons
         button_frame = ttk.Frame(self.root)
@@ -99,6 +249,9 @@ class PLC5ExcelExporter:
         self.export_btn = ttk.Button(button_frame, text="Export to Excel", command=self.start_export, state="disabled")
         self.export_btn.pack(side="left", padx=5)
         
+        self.cancel_btn = ttk.Button(button_frame, text="Cancel", command=self.cancel_export, state="disabled")
+        self.cancel_btn.pack(side="left", padx=5)
+        
         ttk.Button(button_frame, text="Exit", command=self.root.quit).pack(side="right", padx=5)
     
     def browse_rsp(self):
@@ -122,12 +275,31 @@ class PLC5ExcelExporter:
             self.log(f"Output folder: {folder}")
     
     def log(self, message):
-        self.log_text.config(state="normal")
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        self.log_text.insert("end", f"[{timestamp}] {message}\n")
-        self.log_text.see("end")
-        self.log_text.config(state="disabled")
-        self.root.update()
+        """Log from any thread; the widget is updated by the Tk main loop"""
+        self.log_queue.log(message)
+    
+    def settings(self):
+        """Plain snapshot of the export options, for handing to worker processes"""
+        return snapshot(self, DEFAULT_SETTINGS)
+    
+    def export_options(self):
+        """The settings that change what a project export contains"""
+        return {
+            name: value for name, value in self.settings().items()
+            if name not in RUN_SETTINGS
+        }
+    
+    @classmethod
+    def headless(cls, settings, log):
+        """Build an exporter without a Tk root from settings() (defaults for any left out), logging through log"""
+        self = cls.__new__(cls)
+        self.root = None
+        self.rsp_folder = None
+        self.is_processing = False
+        self.log = log
+        self.progress = ExportProgress()
+        apply_settings(self, settings, DEFAULT_SETTINGS)
+        return self
     
     def start_export(self):
         if self.is_processing:
@@ -139,140 +311,313 @@ class PLC5ExcelExporter:
         
         self.is_processing = True
         self.export_btn.config(state="disabled")
-        self.progress_bar.start()
+        self.cancel_btn.config(state="normal")
+        self.progress.reset()
+        self.progress_view.start()
         
         thread = threading.Thread(target=self.export_data, daemon=True)
         thread.start()
     
+    def export_finished(self):
+        """Re-enable the GUI after an export (runs on the Tk main loop)"""
+        self.is_processing = False
+        self.progress_view.stop()
+        self.cancel_btn.config(state="disabled")
+        self.export_btn.config(state="normal")
+    
+    def cancel_export(self):
+        """Stop at the next rung boundary, save what was collected and start no further projects"""
+        self.progress.cancel()
+        self.cancel_btn.config(state="disabled")
+        self.log("Cancelling: stopping at the next rung...")
+    
     def export_data(self):
-        rslogix5 = None
         try:
-            self.log("Opening RSLogix5 Application...")
-            rslogix5 = win32com.Dispatch("RSLogix5.Application.5")
-            rslogix5.visible = True
-            
             base_folder = os.path.abspath(self.rsp_folder)
-            self.log(f"Scanning folder: {base_folder}")
+            # The widget only keeps recent lines; the full log goes to a file
+            batch_stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            self.log_queue.open_file(os.path.join(self.output_folder or base_folder, f"plc5_batch_{batch_stamp}.log"))
+            if not self.output_folder:
+                self.log_queue.call(self.output_label.config, text=base_folder, foreground="black")
             
-            # Build list of .rsp files
-            rsp_files = []
-            if self.recursive.get():
-                for root_dir, _, files in os.walk(base_folder):
-                    for f in files:
-                        if f.lower().endswith(".rsp"):
-                            rsp_files.append(os.path.join(root_dir, f))
+            batch = self.export_folder(base_folder)
+            if not batch['found']:
+                self.log_queue.call(messagebox.showerror, "Error", "No project files found in the selected folder")
+                return
+            
+            total = len(batch['results']) + batch['not_started']
+            exported = sum(1 for result in batch['results'] if result.ok)
+            if batch['cancelled']:
+                self.log_queue.call(messagebox.showwarning, "Cancelled",
+                                    f"Batch cancelled after {exported} of {total} project file(s).")
             else:
-                for f in os.listdir(base_folder):
-                    full_path = os.path.join(base_folder, f)
-                    if os.path.isfile(full_path) and f.lower().endswith(".rsp"):
-                        rsp_files.append(full_path)
+                self.log_queue.call(messagebox.showinfo, "Success", f"Export completed for {exported} of {total} project file(s).")
+        
+        except Exception as e:
+            import traceback
+            self.log(f"ERROR (global): {str(e)}")
+            self.log(traceback.format_exc())
+            self.log_queue.call(messagebox.showerror, "Error", f"Export failed:\n{str(e)}")
+        finally:
+            self.log_queue.close_file()
+            self.log_queue.call(self.export_finished)
+    
+    def export_folder(self, base_folder, on_result=None):
+        """
+        Export every project in base_folder (no GUI; the GUI and plc5_api
+        both call this), calling on_result(ProjectResult) as each project
+        finishes. Returns a batch summary: 'found' project files,
+        'unchanged' skips, 'results' (a ProjectResult per project tried,
+        in completion order), 'not_started' after a cancel, and whether
+        the batch was 'cancelled' part way.
+        """
+        opener = ProjectOpener(self.log, self.replay_latency)
+        try:
+            self.log(f"Scanning folder: {base_folder}")
             
+            # Build list of .rsp files (plus .pc5 exports, and .plc5rec fixtures when replaying)
+            rsp_files = find_projects(base_folder, self.recursive.get(), self.replay_fixtures.get())
+            # Projects with the same name in different subfolders must not overwrite each other's files
+            names = output_names(rsp_files, base_folder)
+            
+            batch = {'found': len(rsp_files), 'unchanged': 0, 'results': [], 'not_started': 0, 'cancelled': False}
             if not rsp_files:
-                messagebox.showerror("Error", "No .rsp files found in the selected folder")
-                self.log("No .rsp files found.")
-                return
+                self.log("No project files found.")
+                return batch
             
-            self.log(f"Found {len(rsp_files)} RSP file(s).")
+            self.log(f"Found {len(rsp_files)} project file(s).")
             if not self.output_folder:
                 self.output_folder = base_folder
-                self.output_label.config(text=self.output_folder, foreground="black")
+            
+            # Skip projects whose file and export options are unchanged since the last run
+            manifest = ExportManifest.load(self.output_folder)
+            options = self.export_options()
+            skipped = 0
+            if not self.force_export.get():
+                changed = []
+                for rsp_path in rsp_files:
+                    previous = manifest.unchanged(rsp_path, options)
+                    if previous:
+                        self.log(f"Unchanged, keeping {os.path.basename(previous)}: {rsp_path}")
+                    else:
+                        changed.append(rsp_path)
+                skipped = len(rsp_files) - len(changed)
+                if skipped:
+                    self.log(f"Skipping {skipped} unchanged project(s); {len(changed)} to export.")
+                rsp_files = changed
             
             total = len(rsp_files)
+            workers = self.workers.get()
+            results = batch['results']
+            failed = 0
+            partial = 0
             
-            for idx, rsp_path in enumerate(rsp_files, start=1):
-                self.log("=" * 60)
-                self.log(f"Processing {idx}/{total}: {rsp_path}")
-                
-                try:
-                    abs_path = os.path.abspath(rsp_path)
-                    self.log(f"Opening project: {abs_path}")
-                    project = rslogix5.FileOpen(abs_path, False, False, True)
-
-                    program_files = project.ProgramFiles
-                    addr_sym_records = project.AddrSymRecords
-                    datafiles = project.DataFiles
-
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    base_name = os.path.splitext(os.path.basename(rsp_path))[0]
-
-                    # Create workbook
-                    wb = Workbook()
-                    wb.remove(wb.active)  # Remove default sheet
-
-                    # Collect all data
-                    self.log("  Analyzing ladder logic...")
-                    data_collection = self.analyze_ladder_logic(program_files, addr_sym_records, datafiles)
-
-                    # Add rungs if requested
-                    if self.export_rungs.get():
-                        self.log("  Extracting ladder rungs...")
-                        data_collection['rungs'] = self.collect_rungs(program_files)
-
-                    # Add datatable if requested
-                    if self.export_datatable.get():
-                        self.log("  Extracting data table...")
-                        data_collection['datatable'] = self.collect_datatable(datafiles)
-
-                    # Add processor properties if requested
-                    if self.export_processor.get():
-                        self.log("  Extracting processor properties...")
-                        data_collection['processor'] = self.collect_processor_properties(project)
-
-                    # Add channel configuration if requested
-                    if self.export_channel_config.get():
-                        self.log("  Extracting channel configuration...")
-                        data_collection['channel_config'] = self.collect_channel_config(project)
-
-                    # Add I/O configuration if requested
-                    if self.export_io_config.get():
-                        self.log("  Extracting I/O configuration...")
-                        data_collection['io_config'] = self.collect_io_config(project)
-                    
-                    # Write all sheets to Excel
-                    self.log("  Writing Excel file...")
-                    self.write_excel_workbook(wb, data_collection)
-                    
-                    # Save workbook
-                    excel_file = os.path.join(
-                        self.output_folder,
-                        f"{base_name}_Export_{timestamp}.xlsx"
-                    )
-                    wb.save(excel_file)
-                    self.log(f"  File saved: {excel_file}")
-                    
-                    # Close this project before moving to the next
-                    project.Close(False)
-                
-                except Exception as per_file_exc:
-                    import traceback
-                    self.log(f"ERROR processing {rsp_path}: {per_file_exc}")
-                    self.log(traceback.format_exc())
-                    # Continue with the next file
-                    continue
+            def project_done(result):
+                nonlocal failed, partial
+                results.append(result)
+                self.progress.project_done(predicted[result.path], result.worker)
+                if not result.ok:
+                    failed += 1
+                    self.log(f"ERROR processing {result.path}: {result.error}")
+                elif result.result.get('cancelled'):
+                    # Partial output: neither a complete export nor a representative duration
+                    partial += 1
+                else:
+                    self.record_cost(cost_model, predicted[result.path], result.path, result.elapsed, result.result)
+                    manifest.record(result.path, options, result.result['output'])
+                    # Saved per project so a batch that dies part way keeps what it finished
+                    cost_model.save()
+                    manifest.save()
+                if on_result:
+                    on_result(result)
+            
+            # Run the longest predicted projects first so none starts last and dominates the tail
+            cost_model = CostModel.load(self.output_folder)
+            schedule = cost_model.order(rsp_files)
+            predicted = dict(schedule)
+            rsp_files = [path for path, _ in schedule]
+            self.log(f"Predicted batch work: {sum(predicted.values()):.0f}s (largest first)")
+            self.progress.start_batch(list(predicted.values()))
+            batch_start = time.perf_counter()
+            not_started = 0
+            
+            try:
+                if workers > 1 and total > 1:
+                    # Each worker process owns its own COM apartment and RSLogix instance
+                    pool = ExportPool(type(self).headless, self.settings(), workers)
+                    pool.run(rsp_files, self.log, project_done, self.progress.cancel_event,
+                             lambda worker, path, done, rungs: self.progress.worker_progress(
+                                 worker, predicted[path], done, rungs), names)
+                    if self.progress.cancelled:
+                        not_started = total - len(results)
+                    else:
+                        failed += total - len(results)
+                else:
+                    for idx, rsp_path in enumerate(rsp_files, start=1):
+                        if self.progress.cancelled:
+                            not_started = total - idx + 1
+                            break
+                        self.log("=" * 60)
+                        self.log(f"Processing {idx}/{total}: {rsp_path}")
+                        
+                        start = time.perf_counter()
+                        try:
+                            self.progress.project_started(predicted[rsp_path])
+                            summary = self.export_project(opener, rsp_path, names[rsp_path])
+                        except Exception as per_file_exc:
+                            import traceback
+                            project_done(ProjectResult(rsp_path, False, error=f"{per_file_exc}\n{traceback.format_exc()}",
+                                                       elapsed=time.perf_counter() - start))
+                            # Continue with the next file
+                            continue
+                        project_done(ProjectResult(rsp_path, True, result=summary, elapsed=time.perf_counter() - start))
+            finally:
+                cost_model.save()
+                manifest.save()
             
             self.log("=" * 60)
-            self.log("All exports completed.")
-            messagebox.showinfo("Success", f"Export completed for {len(rsp_files)} RSP file(s).")
-        
-        except Exception as e:
-            import traceback
-            self.log(f"ERROR (global): {str(e)}")
-            self.log(traceback.format_exc())
-            messagebox.showerror("Error", f"Export failed:\n{str(e)}")
+            self.log(f"Batch time: {time.perf_counter() - batch_start:.0f}s")
+            batch.update(unchanged=skipped, not_started=not_started, cancelled=bool(not_started or partial))
+            if batch['cancelled']:
+                self.log(f"Batch cancelled ({total - failed - not_started} exported, {failed} failed, "
+                         f"{not_started} not started, {skipped} unchanged).")
+            else:
+                self.log(f"All exports completed ({total - failed} succeeded, {failed} failed, {skipped} unchanged).")
+            return batch
         finally:
-            if rslogix5 is not None:
-                try:
-                    self.log("Closing RSLogix5...")
-                    rslogix5.Quit(True, False)
-                except Exception:
-                    pass
-            
-            self.is_processing = False
-            self.progress_bar.stop()
-            self.export_btn.config(state="normal")
+            if opener.rslogix5 is not None:
+                self.log("Closing RSLogix5...")
+            opener.quit()
+    
+    def record_cost(self, cost_model, predicted, rsp_path, elapsed, summary):
+        """Feed a measured project duration back into the cost model and report it"""
+        cost_model.observe(rsp_path, elapsed, summary['rungs'], summary['data_files'])
+        self.log(f"  {os.path.basename(rsp_path)}: predicted {predicted:.1f}s, actual {elapsed:.1f}s")
     
-    def analyze_ladder_logic(self, program_files, addr_sym_records, datafiles):
-        """Collect all data from ladder analysis"""
+    def export_project(self, opener, rsp_path, name=None):
+        """
+        Export one project to its own workbook. Returns the workbook path and
+        the project's rung and data file counts (for the batch cost model).
+        Output files are named after name (see plc5_backend.output_names),
+        or the project file's name.
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        base_name = name or os.path.splitext(os.path.basename(rsp_path))[0]
+
+        record_to = None
+        if self.record_fixture.get():
+            record_to = os.path.join(self.output_folder, f"{base_name}{FIXTURE_EXTENSION}")
+        stats = RunStats(os.path.abspath(rsp_path)) if self.collect_stats.get() else None
+        project = opener.open(rsp_path, record_to, stats)
+
+        sinks = self.selected_sinks()
+        parquet = None
+        csv_tables = None
+        # Rungs and data table values wait on disk for the outputs
+        rungs = RowSpool()
+        datatable = None
+        sheets = ExportSheets()
+        try:
+            # Parquet (and CSV when streaming) is written as rows are found rather
+            # than from the collection afterwards
+            if 'parquet' in sinks:
+                parquet = ParquetTables(self.output_folder, base_name, timestamp, self.streamed_tables())
+            if 'csv' in sinks and self.stream_csv.get():
+                csv_tables = CSVTables(self.output_folder, base_name, timestamp, self.streamed_tables(),
+                                       self.compression.get(), self.compression_level.get())
+            streams = [stream for stream in (parquet, csv_tables) if stream is not None]
+
+            program_files = project.ProgramFiles
+            addr_sym_records = project.AddrSymRecords
+            if self.preload_symbols.get():
+                self.log("  Loading symbol table...")
+                addr_sym_records = SymbolIndex.from_records(addr_sym_records)
+                self.log(f"    Indexed {len(addr_sym_records)} address records")
+            datafiles = project.DataFiles
+            resolver = LookupResolver(addr_sym_records, datafiles, self.lookup_cache_size)
+
+            # Fetch every rung once and analyze it as it arrives; the Rungs sheet shares it
+            self.log("  Reading and analyzing ladder logic...")
+            data_collection = self.analyze_ladder_logic(self.iter_rungs(program_files), rungs, resolver, stats,
+                                                       parse_workers(rsp_path), streams)
+            cancelled = self.progress.cancelled
+            if cancelled:
+                self.log(f"  Cancelled after {len(rungs)} rungs; saving what was collected")
+            self.log(f"  {resolver.summary()}")
+
+            # Add rungs if requested
+            if self.export_rungs.get():
+                data_collection['rungs'] = rungs
+
+            # Add datatable and configuration if requested (skipped once cancelled)
+            if self.export_datatable.get() and not cancelled:
+                self.log("  Extracting data table...")
+                datatable = data_collection['datatable'] = self.collect_datatable(datafiles, streams)
+                cancelled = self.progress.cancelled
+
+            # Add processor properties if requested
+            if self.export_processor.get() and not cancelled:
+                self.log("  Extracting processor properties...")
+                data_collection['processor'] = self.collect_processor_properties(project)
+
+            # Add channel configuration if requested
+            if self.export_channel_config.get() and not cancelled:
+                self.log("  Extracting channel configuration...")
+                data_collection['channel_config'] = self.collect_channel_config(project)
+
+            # Add I/O configuration if requested
+            if self.export_io_config.get() and not cancelled:
+                self.log("  Extracting I/O configuration...")
+                data_collection['io_config'] = self.collect_io_config(project)
+
+            # Add COM call statistics if requested
+            if stats is not None:
+                self.log(f"  {stats.summary()}")
+                data_collection['run_stats'] = stats.rows()
+                data_collection['stage_stats'] = stats.stages
+
+            # Lay out every sheet once; each selected output writes from this one collection
+            self.log("  Preparing sheets...")
+            self.write_excel_workbook(sheets, data_collection)
+
+            # Write the selected outputs concurrently
+            self.log("  Writing outputs...")
+            job = ExportJob(self.output_folder, base_name, timestamp, rsp_path,
+                            sheets, self.selected_tables(data_collection), rungs, parquet,
+                            csv_tables, self.compression.get(), self.compression_level.get())
+            output_file = primary_output(write_outputs(job, sinks, self.log))
+
+            if stats is not None:
+                stats_file = job.path('Export', '_stats.json')
+                stats.save(stats_file)
+                self.log(f"  Run stats saved: {stats_file}")
+            summary = {
+                'output': output_file,
+                'rungs': len(rungs),
+                'data_files': datafiles.Count(),
+                'cancelled': cancelled,
+            }
+        finally:
+            # Close this project before moving to the next
+            opener.close(project)
+            if parquet is not None:
+                parquet.close()
+            if csv_tables is not None:
+                csv_tables.close()
+            sheets.close()
+            rungs.close()
+            if datatable is not None:
+                datatable.close()
+
+        return summary
+    
+    def analyze_ladder_logic(self, rung_source, rungs, resolver, stats=None, workers=PARSE_WORKERS, streams=()):
+        """
+        Collect all data from ladder analysis, analyzing the rungs as they
+        are fetched (see plc5_pipeline); each rung is appended to rungs,
+        and every rung and new record to each of streams (ParquetTables,
+        CSVTables)
+        """
         data = {
             'timers': {},
             'counters': {},
@@ -283,47 +628,65 @@ class PLC5ExcelExporter:
             'io': {}
         }
         
-        for file_idx in range(2, program_files.Count()):
-            try:
-                ladder_file = program_files(file_idx)
-                if ladder_file and ladder_file.NumberOfRungs() > 0:
-                    self.log(f"  Analyzing: {ladder_file.Name}")
-                    for rung_idx in range(ladder_file.NumberOfRungs()):
-                        try:
-                            rung_ascii = ladder_file.GetRungAsAscii(rung_idx)
-                            
-                            # Extract addresses
-                            self.extract_addresses(
-                                rung_ascii, data['tags'], data['io'], 
-                                addr_sym_records, datafiles
-                            )
-                            
-                            # Extract components
-                            if self.export_timers.get():
-                                self.extract_timers(rung_ascii, data['timers'], addr_sym_records)
-                            if self.export_counters.get():
-                                self.extract_counters(rung_ascii, data['counters'], addr_sym_records)
-                            if self.export_controls.get():
-                                self.extract_controls(rung_ascii, data['controls'], addr_sym_records)
-                            if self.export_messages.get():
-                                self.extract_messages(rung_ascii, data['messages'], addr_sym_records)
-                        except Exception:
-                            continue
-            except Exception:
-                continue
+        def write(table, key, record):
+            if table == 'rungs':
+                rungs.append(record)
+            else:
+                data[table][key] = record
+            for stream in streams:
+                stream.append(table, record)
+        
+        # Rungs that fail to tokenize or analyze are skipped
+        pipeline = RungPipeline(
+            PIPELINE_TABLES,
+            self.parse_rung,
+            lambda rung, instructions, tables: self.analyze_rung(instructions, tables, resolver),
+            write,
+            prefetch=lambda parsed: self.prefetch_lookups(parsed, resolver),
+            workers=workers,
+        )
+        pipeline.run(rung_source)
+        if stats is not None:
+            stats.add_stages(pipeline)
         
         return data
     
-    def extract_addresses(self, rung, tags, io, addr_sym_records, datafiles):
-        """Extract addresses from rung"""
-        pattern = re.compile(r'\b([IONBFLTCRS]:\d+(?:/\d+)?|[BNTCR]\d+:\d+(?:/\d+)?)\b')
+    def parse_rung(self, rung):
+        """Tokenize a rung once; every extractor reads the same instruction list (runs on a parse worker)"""
+        return tokenize_rung(rung['Rung_ASCII'])
+    
+    def prefetch_lookups(self, parsed, resolver):
+        """Resolve the addresses of a batch of tokenized rungs in one COM request"""
+        resolver.prefetch(
+            (address for instructions in parsed for address in find_addresses(instructions)),
+            (block for instructions in parsed for block in find_message_blocks(instructions)),
+        )
+    
+    def analyze_rung(self, instructions, tables, resolver):
+        """Run the selected extractors over one tokenized rung"""
+        # Extract addresses
+        self.extract_addresses(
+            instructions, tables['tags'], tables['io'], resolver
+        )
         
-        for addr in pattern.findall(rung):
+        # Extract components
+        if self.export_timers.get():
+            self.extract_timers(instructions, tables['timers'], resolver)
+        if self.export_counters.get():
+            self.extract_counters(instructions, tables['counters'], resolver)
+        if self.export_controls.get():
+            self.extract_controls(instructions, tables['controls'], resolver)
+        if self.export_messages.get():
+            self.extract_messages(instructions, tables['messages'], resolver)
+    
+    def extract_addresses(self, instructions, tags, io, resolver):
+        """Extract addresses from a tokenized rung"""
+        for addr in find_addresses(instructions):
             if addr in tags or addr in io:
                 continue
             
-            symbol, desc = self.get_symbol_desc(addr, addr_sym_records)
-            value = self.get_value(addr, datafiles)
+            symbol, desc = self.get_symbol_desc(addr, resolver)
+            value = self.get_value(addr, resolver)
             
             if addr.startswith('I:') or addr.startswith('O:'):
                 io[addr] = {
@@ -342,95 +705,73 @@ class PLC5ExcelExporter:
                     'Value': value
                 }
     
-    def extract_timers(self, rung, timers, addr_sym_records):
-        pattern = re.compile(r'(TON|TOF|RTO)\s+(\S+)\s+(\S+)\s+(\S+)\s+(\S+)')
-        for match in pattern.findall(rung):
-            addr = match[1]
+    def extract_timers(self, instructions, timers, resolver):
+        for inst in instructions:
+            if inst.mnemonic not in TIMER_INSTRUCTIONS or len(inst.operands) < 4:
+                continue
+            addr, base, pre, acc = inst.operands[:4]
             if addr not in timers:
-                symbol, desc = self.get_symbol_desc(addr, addr_sym_records)
+                symbol, desc = self.get_symbol_desc(addr, resolver)
                 timers[addr] = {
-                    'Type': match[0],
+                    'Type': inst.mnemonic,
                     'Address': addr,
                     'Symbol': symbol,
                     'Description': desc,
-                    'Base': match[2],
-                    'PRE': match[3],
-                    'ACC': match[4]
+                    'Base': base,
+                    'PRE': pre,
+                    'ACC': acc
                 }
     
-    def extract_counters(self, rung, counters, addr_sym_records):
-        pattern = re.compile(r'(CTU|CTD)\s+(\S+)\s+(\S+)\s+(\S+)')
-        for match in pattern.findall(rung):
-            addr = match[1]
+    def extract_counters(self, instructions, counters, resolver):
+        for inst in instructions:
+            if inst.mnemonic not in COUNTER_INSTRUCTIONS or len(inst.operands) < 3:
+                continue
+            addr, pre, acc = inst.operands[:3]
             if addr not in counters:
-                symbol, desc = self.get_symbol_desc(addr, addr_sym_records)
+                symbol, desc = self.get_symbol_desc(addr, resolver)
                 counters[addr] = {
-                    'Type': match[0],
+                    'Type': inst.mnemonic,
                     'Address': addr,
                     'Symbol': symbol,
                     'Description': desc,
-                    'PRE': match[2],
-                    'ACC': match[3]
+                    'PRE': pre,
+                    'ACC': acc
                 }
     
-    def extract_controls(self, rung, controls, addr_sym_records):
-        pattern = re.compile(r'(FAL|FSC|FFL|FFU|COP|DDT|FBC)\s+(\S+)\s+(\S+)\s+(\S+)')
-        for match in pattern.findall(rung):
-            addr = match[1]
+    def extract_controls(self, instructions, controls, resolver):
+        for inst in instructions:
+            if inst.mnemonic not in CONTROL_INSTRUCTIONS or len(inst.operands) < 3:
+                continue
+            addr, length, position = inst.operands[:3]
             if addr not in controls:
-                symbol, desc = self.get_symbol_desc(addr, addr_sym_records)
+                symbol, desc = self.get_symbol_desc(addr, resolver)
                 controls[addr] = {
-                    'Instruction': match[0],
+                    'Instruction': inst.mnemonic,
                     'Address': addr,
                     'Symbol': symbol,
                     'Description': desc,
-                    'Length': match[2],
-                    'Position': match[3]
+                    'Length': length,
+                    'Position': position
                 }
     
-    def extract_messages(self, rung, messages, addr_sym_records):
+    def extract_messages(self, instructions, messages, resolver):
         """
-        Extract MSG instructions from a rung.
+        Extract MSG instructions from a tokenized rung.
 
-        We look for each occurrence of 'MSG' in the ASCII rung, grab everything
-        up to 'EOR' (if present) or the end of the string, then split into
-        whitespace-separated parameters.
+        The tokenizer gives each MSG its own operand list, which ends at the
+        next instruction (or EOR), so the parameters never run into the rest
+        of the rung.
 
         Expected PLC-5 MSG parameter convention:
 
             MSG <ControlBlock> <PLCFamily> <DataType> <Direction>
                 <LocalAddr> <LocalLength> <RemoteNode> <RemoteAddr> <RemoteLength> <PortType> <Channel>
         """
-        pos = 0
-        while True:
-            idx = rung.find('MSG', pos)
-            if idx == -1:
-                break
-
-            # Ensure 'MSG' is a standalone token
-            before_ok = (idx == 0) or not rung[idx - 1].isalnum()
-            after_ok = (idx + 3 >= len(rung)) or rung[idx + 3].isspace()
-            if not (before_ok and after_ok):
-                pos = idx + 3
-                continue
-
-            # First space after MSG = start of parameters
-            param_start = rung.find(' ', idx + 3)
-            if param_start == -1:
-                break
-
-            # End at ' EOR' if present, else end of string
-            end_idx = rung.find(' EOR', idx)
-            if end_idx == -1:
-                end_idx = len(rung)
-
-            block = rung[param_start + 1:end_idx].strip()
-            pos = end_idx
-
-            if not block:
+        for inst in instructions:
+            if inst.mnemonic != 'MSG':
                 continue
 
-            parts = block.split()
+            parts = inst.operands
             if len(parts) < 4:
                 # Need at least: ControlBlock, PLC_Family, DataType, Direction
                 continue
@@ -455,7 +796,7 @@ class PLC5ExcelExporter:
             if not ctrl_block or ctrl_block in messages:
                 continue
 
-            symbol, desc = self.get_symbol_desc(ctrl_block, addr_sym_records)
+            symbol, desc = self.get_symbol_desc(ctrl_block, resolver)
 
             msg_entry = {
                 # Core identification
@@ -503,52 +844,46 @@ class PLC5ExcelExporter:
 
             messages[ctrl_block] = msg_entry
     
-    def collect_rungs(self, program_files):
-        """Collect all rungs"""
-        rungs = []
-        for file_idx in range(2, program_files.Count()):
+    def iter_rungs(self, program_files):
+        """Yield each rung as (file name, file number, rung index, text) when fetched; stops at a rung boundary once cancelled"""
+        # Count first so the progress bar knows the total
+        files = ladder_files(program_files)
+        total = sum(rung_count for _, rung_count in files)
+        self.progress.start_project(total)
+        self.log(f"    {len(files)} program files, {total} rungs")
+        for ladder_file, rung_count in files:
             try:
-                ladder_file = program_files(file_idx)
-                if ladder_file and ladder_file.NumberOfRungs() > 0:
-                    for rung_idx in range(ladder_file.NumberOfRungs()):
-                        try:
-                            rungs.append({
-                                'File_Name': ladder_file.Name,
-                                'File_Number': ladder_file.FileNumber,
-                                'Rung_Number': rung_idx,
-                                'Rung_ASCII': ladder_file.GetRungAsAscii(rung_idx)
-                            })
-                        except Exception:
-                            continue
+                file_name = ladder_file.Name
+                file_number = ladder_file.FileNumber
+                self.log(f"    Reading: {file_name}")
+                # Rungs arrive in batches, one COM request each
+                for rung_idx, rung_ascii in read_rungs(ladder_file, rung_count):
+                    if self.progress.cancelled:
+                        return
+                    self.progress.rung_done()
+                    if isinstance(rung_ascii, Exception):
+                        continue
+                    yield {
+                        'File_Name': file_name,
+                        'File_Number': file_number,
+                        'Rung_Number': rung_idx,
+                        'Rung_ASCII': rung_ascii
+                    }
             except Exception:
                 continue
-        return rungs
     
-    def collect_datatable(self, datafiles):
-        """Collect datatable values"""
-        data = []
-        for file_idx in range(datafiles.Count()):
-            try:
-                datafile = datafiles(file_idx)
-                if datafile:
-                    file_type = datafile.TypeAsString
-                    if file_type in ['B', 'N', 'F', 'L', 'T', 'C', 'R']:
-                        file_num = datafile.FileNumber
-                        for elem in range(min(datafile.NumberOfElements, 1000)):
-                            addr = f"{file_type}{file_num}:{elem}"
-                            try:
-                                data.append({
-                                    'FileType': file_type,
-                                    'FileNumber': file_num,
-                                    'Element': elem,
-                                    'Address': addr,
-                                    'Value': datafiles.GetDataValue(addr)
-                                })
-                            except Exception:
-                                pass
-            except Exception:
-                continue
-        return data
+    def collect_datatable(self, datafiles, streams=()):
+        """
+        Spool every data table value to disk as it is read, a block of
+        elements at a time (see plc5_datatable), streaming it to each of
+        streams too
+        """
+        datatable = RowSpool()
+        for row in iter_datatable(datafiles, self.progress.cancel_event):
+            datatable.append(row)
+            for stream in streams:
+                stream.append('datatable', row)
+        return datatable
 
     def collect_processor_properties(self, project):
         """Collect processor properties from the project"""
@@ -864,7 +1199,7 @@ class PLC5ExcelExporter:
             pass
     
     def write_excel_workbook(self, wb, data):
-        """Write all data to Excel sheets"""
+        """Lay out all data as sheets, for the workbook and every other output"""
         if self.export_tags.get() and data['tags']:
             self.write_sheet(wb, 'Tags', 
                            ['Address', 'Symbol', 'Description', 'DataType', 'Value'],
@@ -896,6 +1231,8 @@ class PLC5ExcelExporter:
             self.log(f"  Wrote {len(data['controls'])} controls")
         
         if self.export_messages.get() and data['messages']:
+            # With message_aliases, three columns take the MSG dialog's names
+            aliases = self.message_aliases.get()
             self.write_sheet(
                 wb,
                 'Messages',
@@ -907,10 +1244,10 @@ class PLC5ExcelExporter:
                     'DataType',
                     'Direction',
                     'LocalAddr',
-                    'Size',         # was LocalLength
-                    'PortNumber',   # was RemoteNode
+                    'Size' if aliases else 'LocalLength',
+                    'PortNumber' if aliases else 'RemoteNode',
                     'RemoteAddr',
-                    'DHPlusNode',   # was RemoteLength
+                    'DHPlusNode' if aliases else 'RemoteLength',
                     'PortType',
                     'Channel',
                     'RawParameters',
@@ -927,7 +1264,7 @@ class PLC5ExcelExporter:
 
         if 'datatable' in data and data['datatable']:
             self.write_sheet(wb, 'DataTable',
-                           ['FileType', 'FileNumber', 'Element', 'Address', 'Value'],
+                           DATATABLE_HEADERS,
                            data['datatable'])
             self.log(f"  Wrote {len(data['datatable'])} datatable values")
 
@@ -960,85 +1297,54 @@ class PLC5ExcelExporter:
             headers += sorted([k for k in all_keys if k not in preferred_order])
             self.write_sheet(wb, 'IOConfig', headers, data['io_config'])
             self.log(f"  Wrote {len(data['io_config'])} I/O configuration entries")
+
+        # Write COM call statistics
+        if 'run_stats' in data and data['run_stats']:
+            self.write_sheet(wb, 'Run Stats', RUN_STATS_HEADERS, data['run_stats'])
+            self.log(f"  Wrote {len(data['run_stats'])} run stats entries")
+        if 'stage_stats' in data and data['stage_stats']:
+            self.write_sheet(wb, 'Pipeline Stats', STAGE_STATS_HEADERS, data['stage_stats'])
+            self.log(f"  Wrote {len(data['stage_stats'])} pipeline stage entries")
+    
+    def selected_tables(self, data):
+        """Collected tables for Parquet/database output; tags and I/O are always collected, so filter them here"""
+        tables = dict(data)
+        if not self.export_tags.get():
+            tables.pop('tags', None)
+        if not self.export_io.get():
+            tables.pop('io', None)
+        return tables
+    
+    def streamed_tables(self):
+        """The tables selected_tables() keeps, for streaming them to Parquet or CSV"""
+        tables = set(PIPELINE_TABLES) | {'datatable'}
+        if not self.export_rungs.get():
+            tables.discard('rungs')
+        return list(self.selected_tables(dict.fromkeys(tables)))
+    
+    def selected_sinks(self):
+        """The outputs ticked in the options"""
+        options = {
+            'xlsx': self.export_xlsx,
+            'csv': self.export_csv,
+            'jsonl': self.export_jsonl,
+            'parquet': self.export_parquet,
+            'sqlite': self.export_database,
+        }
+        return [sink for sink in SINKS if options[sink].get()]
     
     def write_sheet(self, wb, sheet_name, headers, rows):
-        """Write data to a sheet efficiently, expanding Description into Desc1..Desc5 when present"""
-        ws = wb.create_sheet(title=sheet_name)
-
-        # If a Description column exists, replace it with Desc1..Desc5
-        if 'Description' in headers:
-            desc_index = headers.index('Description')
-            new_headers = (
-                headers[:desc_index]
-                + ['Desc1', 'Desc2', 'Desc3', 'Desc4', 'Desc5']
-                + headers[desc_index + 1:]
-            )
-        else:
-            new_headers = headers
-
-        ws.append(new_headers)
-
-        for row in rows:
-            if isinstance(row, dict):
-                values = [row.get(h, '') for h in headers]
-            else:
-                values = list(row)
-
-            # Split description into 5 columns if applicable
-            if 'Description' in headers:
-                desc_index = headers.index('Description')
-                desc_text = str(values[desc_index]).strip()
-                # Split on pipe, comma, or semicolon — keep non-empty, trimmed parts
-                split_desc = [part.strip() for part in re.split(r'\||,|;', desc_text) if part.strip()]
-                desc_parts = (split_desc + [''] * 5)[:5]  # Always 5 columns
-                values = values[:desc_index] + desc_parts + values[desc_index + 1:]
-
-            ws.append(values)
-
-        # Auto-size columns
-        for col_idx, col in enumerate(ws.columns, 1):
-            max_length = 0
-            column = get_column_letter(col_idx)
-            for cell in col:
-                if cell.value:
-                    max_length = max(max_length, len(str(cell.value)))
-            ws.column_dimensions[column].width = min(max_length + 2, 50)
+        """Stream rows into a new sheet, expanding Description into Desc1..Desc5 when present"""
+        stream_sheet(wb, sheet_name, headers, rows)
     
-    def get_symbol_desc(self, addr, addr_sym_records):
-        try:
-            record = addr_sym_records.GetRecordViaAddrOrSym(addr, 0)
-            if record:
-                return (
-                    record.Symbol or "", 
-                    (record.Description or "").replace('\r\n', ' | ')
-                )
-        except Exception:
-            pass
-        return "", ""
+    def get_symbol_desc(self, addr, resolver):
+        return resolver.symbol_desc(addr)
     
-    def get_value(self, addr, datafiles):
-        try:
-            return datafiles.GetDataValue(addr)
-        except Exception:
-            return ""
+    def get_value(self, addr, resolver):
+        return resolver.value(addr)
     
     def get_data_type(self, addr):
-        if ':' not in addr:
-            return "Unknown"
-        prefix = addr.split(':')[0].replace('#', '')
-        types = {
-            'I': 'Input',
-            'O': 'Output',
-            'B': 'Bit',
-            'N': 'Integer',
-            'F': 'Float',
-            'L': 'Long',
-            'T': 'Timer',
-            'C': 'Counter',
-            'R': 'Control',
-            'S': 'Status'
-        }
-        return types.get(prefix, prefix)
+        return data_type(addr)
 
 
 if __name__ == "__main__":
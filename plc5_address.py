@@ -0,0 +1,150 @@
+"""
+PLC-5 data table address parsing.
+"""
+import re
+from collections import namedtuple
+
+
+Address = namedtuple('Address', ['file_type', 'file_number', 'element', 'member', 'bit'])
+
+# File numbers of the fixed output, input and status files
+DEFAULT_FILE_NUMBERS = {'O': 0, 'I': 1, 'S': 2}
+
+# Words per element for the structured file types
+ELEMENT_WORDS = {'T': 3, 'C': 3, 'R': 3}
+
+# Word offset of each numeric member of a structured element
+STRUCTURE_WORDS = {
+    'T': {'PRE': 1, 'ACC': 2},
+    'C': {'PRE': 1, 'ACC': 2},
+    'R': {'LEN': 1, 'POS': 2},
+}
+
+# Bit number of each status member (all in word 0 of the element)
+STATUS_BITS = {
+    'T': {'EN': 15, 'TT': 14, 'DN': 13},
+    'C': {'CU': 15, 'CD': 14, 'DN': 13, 'OV': 12, 'UN': 11},
+    'R': {'EN': 15, 'EU': 14, 'DN': 13, 'EM': 12, 'ER': 11, 'UL': 10, 'IN': 9, 'FD': 8},
+}
+
+# Data type of each file type
+FILE_TYPE_NAMES = {
+    'I': 'Input', 'O': 'Output', 'S': 'Status', 'B': 'Bit', 'N': 'Integer',
+    'F': 'Float', 'L': 'Long', 'T': 'Timer', 'C': 'Counter', 'R': 'Control',
+}
+
+# File types whose words are 16-bit integers, so bits can be taken from the word
+BIT_FILE_TYPES = ('B', 'N', 'I', 'O', 'S', 'T', 'C', 'R')
+
+_ADDRESS = re.compile(r'^#?([A-Z]+)(\d*)(?::(\d+))?(?:\.([A-Z]+))?(?:/(\w+))?$')
+
+
+def parse_address(addr):
+    """
+    Split an address such as 'I:012/07', 'B3/21', 'N7:0' or 'T4:0.ACC' into
+    Address(file_type, file_number, element, member, bit).
+
+    I/O element and bit numbers are octal, everything else decimal. Bit-file
+    addresses without an element (B3/21) are converted to element/bit form,
+    and named status bits (T4:0/DN) are returned as members.
+    Returns None when the text is not a data table address.
+    """
+    match = _ADDRESS.match(str(addr).strip().upper())
+    if not match:
+        return None
+    file_type, file_number, element, member, bit = match.groups()
+
+    if file_number:
+        file_number = int(file_number)
+    elif file_type in DEFAULT_FILE_NUMBERS:
+        file_number = DEFAULT_FILE_NUMBERS[file_type]
+    else:
+        return None
+
+    radix = 8 if file_type in ('I', 'O') else 10
+    try:
+        element = int(element, radix) if element is not None else None
+        if bit is not None and bit.isdigit():
+            bit = int(bit, radix)
+    except ValueError:
+        return None
+
+    if bit is not None and not isinstance(bit, int):
+        # Named status bit, e.g. T4:0/DN
+        if member is not None:
+            return None
+        member, bit = bit, None
+
+    if element is None:
+        if bit is None:
+            return None
+        # Bit-file addressing: B3/21 is B3:1/5
+        element, bit = divmod(bit, 16)
+
+    return Address(file_type, file_number, element, member, bit)
+
+
+def format_address(file_type, file_number, element, member=None):
+    """Address text of an element or member word, e.g. 'N7:0', 'I:012', 'S:1', 'T4:0.ACC'"""
+    if file_type in ('I', 'O'):
+        text = f"{file_type}:{element:03o}"
+    elif DEFAULT_FILE_NUMBERS.get(file_type) == file_number:
+        text = f"{file_type}:{element}"
+    else:
+        text = f"{file_type}{file_number}:{element}"
+    return f"{text}.{member}" if member else text
+
+
+def normalize_address(addr):
+    """
+    Address text in the form the data table lists it: bit-file addresses in
+    element/bit form (B3/21 -> B3:1/5) and status bits after a slash
+    (T4:0.DN -> T4:0/DN). Any other address is returned unchanged.
+    """
+    text = str(addr).strip()
+    address = parse_address(text)
+    if address is None:
+        return text
+    status = address.member in STATUS_BITS.get(address.file_type, {})
+    if ':' in text and not (status and '.' in text):
+        return text
+
+    element = format_address(address.file_type, address.file_number, address.element,
+                             None if status else address.member)
+    if status:
+        return f"{element}/{address.member}"
+    if address.bit is None:
+        return element
+    if address.file_type in ('I', 'O'):
+        return f"{element}/{address.bit:02o}"
+    return f"{element}/{address.bit}"
+
+
+def data_type(addr):
+    """Data type of an address from its file letter, e.g. 'Bit' for B3/21, 'Timer' for T4:0.DN"""
+    address = parse_address(addr)
+    if address is None:
+        return "Unknown"
+    return FILE_TYPE_NAMES.get(address.file_type, address.file_type)
+
+
+def value_word(address):
+    """
+    The word holding a parsed address's value, as (word address, bit):
+    B3:0/5 is bit 5 of 'B3:0', T4:0/DN bit 13 of the status word 'T4:0',
+    T4:0.ACC the whole word 'T4:0.ACC' (bit None). Returns None when the
+    value cannot be taken from a word (an unknown member, a bit of a
+    float file).
+    """
+    file_type, member, bit = address.file_type, address.member, address.bit
+    word_member = None
+    if member is not None:
+        if member in STRUCTURE_WORDS.get(file_type, {}):
+            word_member = member
+        elif member in STATUS_BITS.get(file_type, {}):
+            bit = STATUS_BITS[file_type][member]
+        else:
+            return None
+    if bit is not None and (file_type not in BIT_FILE_TYPES or not 0 <= bit < 16):
+        return None
+    return format_address(file_type, address.file_number, address.element, word_member), bit
@@ -0,0 +1,161 @@
+"""
+COM apartment thread for the PLC-5 exporters.
+
+COM objects belong to the apartment (thread) that created them, and a
+thread must initialize COM before it touches any. ComApartment is a
+thread that initializes its apartment once, then runs requests from
+other threads off a queue, so RSLogix 5 and the opened project live on
+that one thread whichever thread runs the export.
+
+ProjectOpener hands out the project wrapped in an ApartmentProxy: every
+attribute read and call made through it, from any thread, is run in the
+apartment (directly when already on that thread), and object results
+are wrapped in turn. That keeps every call correct; the hot paths batch
+their work into one request instead of one per call:
+
+    read_rungs()              fetch a ladder file's rungs, RUNG_BATCH per request
+    SymbolIndex.from_records  enumerate the symbol table in one request
+    LookupResolver.prefetch   resolve a batch of addresses in one request
+    apartment.batch(fn, items)  any other per-item loop
+
+A function run by call() or batch() executes on the apartment thread,
+where proxies call straight through, so a loop inside it makes no
+further cross-thread hops.
+"""
+import queue
+import threading
+from concurrent.futures import Future
+
+try:
+    import pythoncom
+except ImportError:
+    # Not on Windows / no pywin32: replayed projects need no COM apartment
+    pythoncom = None
+
+
+# Rungs fetched per apartment request
+RUNG_BATCH = 64
+
+# Results passed back as they are; anything else is a COM object and stays in the apartment
+_PLAIN_TYPES = (str, int, float, bool, bytes, tuple, list, dict, type(None))
+
+
+class ComApartment:
+    """A thread that owns COM objects and runs requests for other threads"""
+
+    def __init__(self, name='com-apartment'):
+        self._requests = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        if pythoncom is not None:
+            pythoncom.CoInitialize()
+        try:
+            while True:
+                request = self._requests.get()
+                if request is None:
+                    break
+                future, fn, args = request
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    future.set_result(fn(*args))
+                except BaseException as exc:
+                    future.set_exception(exc)
+        finally:
+            if pythoncom is not None:
+                pythoncom.CoUninitialize()
+
+    @property
+    def current(self):
+        """True when called on the apartment thread"""
+        return threading.current_thread() is self._thread
+
+    def submit(self, fn, *args):
+        """Queue fn(*args) to run in the apartment; returns a Future"""
+        future = Future()
+        self._requests.put((future, fn, args))
+        return future
+
+    def call(self, fn, *args):
+        """Run fn(*args) in the apartment and return its result (or raise its exception)"""
+        if self.current:
+            return fn(*args)
+        return self.submit(fn, *args).result()
+
+    def batch(self, fn, items):
+        """fn(item) for every item in one request; a failed item's result is its exception"""
+        return self.call(_run_batch, fn, list(items))
+
+    def close(self):
+        """Stop the thread once queued requests are done"""
+        if self._thread.is_alive():
+            self._requests.put(None)
+            if not self.current:
+                self._thread.join()
+
+
+def _run_batch(fn, items):
+    results = []
+    for item in items:
+        try:
+            results.append(fn(item))
+        except Exception as exc:
+            results.append(exc)
+    return results
+
+
+class ApartmentProxy:
+    """Wraps an object living in a ComApartment so any thread can use it"""
+    __slots__ = ('_obj', '_apartment')
+
+    def __init__(self, obj, apartment):
+        self._obj = obj
+        self._apartment = apartment
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return self._wrap(self._apartment.call(getattr, self._obj, name))
+
+    def __call__(self, *args):
+        return self._wrap(self._apartment.call(self._obj, *args))
+
+    def _wrap(self, result):
+        if isinstance(result, _PLAIN_TYPES):
+            return result
+        return ApartmentProxy(result, self._apartment)
+
+
+def apartment_of(obj):
+    """The ComApartment an object lives in, or None for in-process objects"""
+    if isinstance(obj, ApartmentProxy):
+        return obj._apartment
+    return None
+
+
+def _read_rung_batch(ladder_file, start, stop):
+    texts = []
+    for rung_idx in range(start, stop):
+        try:
+            texts.append(ladder_file.GetRungAsAscii(rung_idx))
+        except Exception as exc:
+            texts.append(exc)
+    return texts
+
+
+def read_rungs(ladder_file, rung_count, batch_size=RUNG_BATCH):
+    """
+    Yield (rung index, rung text) for each rung of a ladder file, fetching
+    batch_size rungs per apartment request. A rung that cannot be read
+    yields its exception instead of the text.
+    """
+    apartment = apartment_of(ladder_file)
+    for start in range(0, rung_count, batch_size):
+        stop = min(start + batch_size, rung_count)
+        if apartment is None:
+            texts = _read_rung_batch(ladder_file, start, stop)
+        else:
+            texts = apartment.call(_read_rung_batch, ladder_file, start, stop)
+        yield from zip(range(start, stop), texts)
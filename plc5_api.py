@@ -0,0 +1,179 @@
+"""
+Headless export API.
+
+The same exports the folder GUI runs, callable without Tk (from a
+scheduled task, a build agent or plc5_cli):
+
+    result = export_project('Line3.rsp', {'export_datatable': True})
+    batch = export_folder('C:/Projects', {'workers': 4}, log=print)
+    result = export_csv('Line3.rsp', {'compression': 'gzip'})
+
+Options are the exporter's settings (see DEFAULT_SETTINGS in
+PLC5ExcelExporterMsgs_Folder, and in plc5_csv_exporter for export_csv);
+anything not given keeps the GUI's default. The GUIs run their exports
+through these functions too. Output folders are created if missing. log receives every log line; progress, an ExportProgress, can
+be polled from another thread and cancelled like the GUI's Cancel
+button. Single projects are always exported; folders go through the
+manifest, cost model and worker pool exactly as in the GUI.
+"""
+import os
+import time
+
+from PLC5ExcelExporterMsgs_Folder import DEFAULT_SETTINGS, PLC5ExcelExporter
+from plc5_backend import ProjectOpener
+from plc5_progress import ExportProgress
+
+
+class ExportResult:
+    """Outcome of one project export"""
+    __slots__ = ('path', 'ok', 'output', 'rungs', 'data_files', 'cancelled', 'elapsed', 'error')
+
+    def __init__(self, path, ok, output=None, rungs=0, data_files=0, cancelled=False, elapsed=0.0, error=None):
+        self.path = path
+        self.ok = ok
+        self.output = output
+        self.rungs = rungs
+        self.data_files = data_files
+        self.cancelled = cancelled
+        self.elapsed = elapsed
+        self.error = error
+
+    @classmethod
+    def from_project_result(cls, result):
+        """From the folder exporter's ProjectResult (summary dict or error)"""
+        summary = result.result or {}
+        return cls(result.path, result.ok, summary.get('output'), summary.get('rungs', 0),
+                   summary.get('data_files', 0), summary.get('cancelled', False), result.elapsed, result.error)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class FolderResult:
+    """Outcome of a folder export"""
+
+    def __init__(self, folder, results, found=0, unchanged=0, not_started=0, cancelled=False):
+        self.folder = folder
+        self.results = results
+        self.found = found
+        self.unchanged = unchanged
+        self.not_started = not_started
+        self.cancelled = cancelled
+
+    @property
+    def exported(self):
+        return sum(1 for result in self.results if result.ok)
+
+    @property
+    def failed(self):
+        return sum(1 for result in self.results if not result.ok)
+
+    @property
+    def ok(self):
+        return not self.failed and not self.cancelled
+
+    def to_dict(self):
+        return {
+            'folder': self.folder,
+            'found': self.found,
+            'exported': self.exported,
+            'failed': self.failed,
+            'unchanged': self.unchanged,
+            'not_started': self.not_started,
+            'cancelled': self.cancelled,
+        }
+
+
+def _quiet(message):
+    pass
+
+
+def export_settings(options=None, defaults=DEFAULT_SETTINGS):
+    """defaults with options applied; unknown option names are an error"""
+    options = dict(options or {})
+    unknown = set(options) - set(defaults)
+    if unknown:
+        raise ValueError(f"Unknown export option(s): {', '.join(sorted(unknown))}")
+    settings = dict(defaults)
+    settings.update(options)
+    return settings
+
+
+def _output_folder(settings, default):
+    """Resolve settings['output_folder'] (default if unset) and create it"""
+    folder = settings['output_folder'] = os.path.abspath(settings['output_folder'] or default)
+    os.makedirs(folder, exist_ok=True)
+    return folder
+
+
+def _exporter(settings, log, progress, exporter_class=PLC5ExcelExporter):
+    exporter = exporter_class.headless(settings, log or _quiet)
+    exporter.progress = progress or ExportProgress()
+    return exporter
+
+
+def export_project(path, options=None, log=None, progress=None):
+    """
+    Export one project (.rsp, .pc5 or .plc5rec). Writes next to the
+    project unless options['output_folder'] is set. Never raises for a
+    failed export; the error is in the result.
+    """
+    path = os.path.abspath(path)
+    settings = export_settings(options)
+    _output_folder(settings, os.path.dirname(path))
+    return _export(_exporter(settings, log, progress), path, settings)
+
+
+def export_csv(path, options=None, log=None, progress=None):
+    """
+    Export one project as CSV files, as the CSV exporter does: a file per
+    table, optionally streamed while the rungs are read and compressed.
+    options are the CSV exporter's settings; the export runs through the
+    same core as export_project.
+    """
+    # Imported here: the CSV exporter's GUI imports this module
+    from plc5_csv_exporter import CSV_OUTPUTS, DEFAULT_SETTINGS as CSV_SETTINGS
+
+    path = os.path.abspath(path)
+    settings = export_settings(export_settings(options, CSV_SETTINGS))
+    settings.update(CSV_OUTPUTS)
+    _output_folder(settings, os.path.dirname(path))
+    return _export(_exporter(settings, log, progress), path, settings)
+
+
+def _export(exporter, path, settings):
+    opener = ProjectOpener(exporter.log, settings['replay_latency'])
+    start = time.perf_counter()
+    try:
+        summary = exporter.export_project(opener, path)
+    except Exception as exc:
+        import traceback
+        exporter.log(f"ERROR processing {path}: {exc}")
+        return ExportResult(path, False, elapsed=time.perf_counter() - start, error=f"{exc}\n{traceback.format_exc()}")
+    finally:
+        opener.quit()
+    return ExportResult(path, True, summary['output'], summary['rungs'], summary['data_files'],
+                        summary.get('cancelled', False), time.perf_counter() - start)
+
+
+def export_folder(folder, options=None, log=None, progress=None, on_result=None):
+    """
+    Export every project in folder (recursively unless options['recursive']
+    is False), skipping unchanged projects unless options['force_export'].
+    .plc5rec fixtures are only included with options['replay_fixtures'].
+    Writes to folder unless options['output_folder'] is set. on_result, if
+    given, gets each project's ExportResult as it finishes.
+    """
+    folder = os.path.abspath(folder)
+    settings = export_settings(options)
+    if settings['output_folder']:
+        _output_folder(settings, folder)
+    exporter = _exporter(settings, log, progress)
+    batch = exporter.export_folder(
+        folder, on_result and (lambda result: on_result(ExportResult.from_project_result(result))))
+    return FolderResult(
+        folder,
+        [ExportResult.from_project_result(result) for result in batch['results']],
+        batch['found'], batch['unchanged'], batch['not_started'], batch['cancelled'],
+    )
+
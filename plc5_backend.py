@@ -0,0 +1,342 @@
+"""
+Project backends for the PLC-5 exporters.
+
+ProjectOpener hides where a project comes from: .rsp files are opened in
+RSLogix 5 over COM, .pc5 exports are parsed offline (plc5_pc5), and
+.plc5rec fixtures are replayed. Every backend exposes the same
+ProgramFiles / AddrSymRecords / DataFiles members the exporters use.
+
+A fixture is recorded by wrapping the COM project in a ComProxy whose hook
+stores every attribute read and call (keyed by its access path, e.g.
+'project.ProgramFiles(2).GetRungAsAscii(0)') together with its result.
+ReplayObject serves those results back on any platform, optionally
+sleeping per call to simulate COM latency, so exports can be profiled and
+benchmarked without RSLogix. Replay with the export options used while
+recording; a call that was never recorded raises FixtureMissError.
+
+The same proxy feeds plc5_stats.RunStats, which times every call for the
+Run Stats report; a project can be recorded and instrumented at once.
+
+RSLogix 5 and every project opened over COM (or replayed from a fixture)
+live on the opener's ComApartment thread (plc5_apartment); the exporters
+get them wrapped in an ApartmentProxy, so any thread can use them.
+"""
+import gzip
+import hashlib
+import json
+import os
+import time
+from collections import Counter
+
+try:
+    import win32com.client as win32com
+except ImportError:
+    # Only needed for .rsp projects; PC5 exports and fixtures need no RSLogix
+    win32com = None
+
+from plc5_apartment import ApartmentProxy, ComApartment
+from plc5_pc5 import PC5_EXTENSION, is_pc5_file, open_pc5
+
+
+FIXTURE_EXTENSION = '.plc5rec'
+FIXTURE_FORMAT = 1
+
+# Project file types the exporters can open
+PROJECT_EXTENSIONS = ('.rsp', PC5_EXTENSION, FIXTURE_EXTENSION)
+
+# Marker passed to proxy hooks when a result is a COM object rather than a value
+OBJECT_RESULT = object()
+
+_VALUE_TYPES = (str, int, float, bool, type(None))
+
+
+def is_fixture_file(path):
+    return path.lower().endswith(FIXTURE_EXTENSION)
+
+
+def find_projects(folder, recursive=True, fixtures=False):
+    """
+    Project files in folder (and its subfolders when recursive). .plc5rec
+    fixtures are only included when fixtures is set: recordings are saved
+    to the output folder, often the project folder, and would otherwise be
+    exported again by the next scan. A project found several times in one
+    folder under the same name (Line3.rsp, Line3.pc5, Line3.plc5rec) is
+    exported once, preferring .rsp, then .pc5, then the fixture.
+    """
+    extensions = PROJECT_EXTENSIONS if fixtures else tuple(ext for ext in PROJECT_EXTENSIONS
+                                                           if ext != FIXTURE_EXTENSION)
+    if recursive:
+        found = [os.path.join(root_dir, name) for root_dir, _, files in os.walk(folder) for name in files]
+    else:
+        found = [os.path.join(folder, name) for name in os.listdir(folder)]
+
+    projects = {}
+    for path in found:
+        stem, ext = os.path.splitext(path)
+        ext = ext.lower()
+        if ext not in extensions or not os.path.isfile(path):
+            continue
+        key = stem.lower()
+        current = projects.get(key)
+        if current is None or extensions.index(ext) < extensions.index(os.path.splitext(current)[1].lower()):
+            projects[key] = path
+    return list(projects.values())
+
+
+def output_names(paths, folder):
+    """
+    {path: base name of its output files}, unique (ignoring case) within
+    the batch: the file name without extension where no other project
+    shares it, else the path relative to folder joined with '_'
+    (sub/Line3.rsp -> sub_Line3), plus a short hash of the path if even
+    that is taken. Names only depend on the paths, so they are the same
+    from one run to the next.
+    """
+    stems = {path: os.path.splitext(os.path.basename(path))[0] for path in paths}
+    counts = Counter(stem.lower() for stem in stems.values())
+    names = {path: stem for path, stem in stems.items() if counts[stem.lower()] == 1}
+    taken = {name.lower() for name in names.values()}
+    for path in paths:
+        if path in names:
+            continue
+        relative = os.path.splitext(os.path.relpath(path, folder))[0]
+        name = relative.replace(os.sep, '_')
+        if os.altsep:
+            name = name.replace(os.altsep, '_')
+        if name.lower() in taken:
+            digest = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()[:8]
+            name = f"{name}_{digest}"
+        names[path] = name
+        taken.add(name.lower())
+    return {path: names[path] for path in paths}
+
+
+def _is_value(result):
+    if isinstance(result, _VALUE_TYPES):
+        return True
+    if isinstance(result, (tuple, list)):
+        return all(isinstance(item, _VALUE_TYPES) for item in result)
+    return False
+
+
+def _format_args(args):
+    return ','.join(json.dumps(arg, default=str) for arg in args)
+
+
+class ComProxy:
+    """
+    Wraps a COM object and reports every attribute read and call to hook(key,
+    elapsed, result, exc). Object results are wrapped in turn, so a proxied
+    project reports everything done through it.
+    """
+    __slots__ = ('_obj', '_path', '_hook')
+
+    def __init__(self, obj, path, hook):
+        self._obj = obj
+        self._path = path
+        self._hook = hook
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return self._invoke(f"{self._path}.{name}", getattr, self._obj, name)
+
+    def __call__(self, *args):
+        return self._invoke(f"{self._path}({_format_args(args)})", self._obj, *args)
+
+    def _invoke(self, key, fn, *args):
+        start = time.perf_counter()
+        try:
+            result = fn(*args)
+        except Exception as exc:
+            self._hook(key, time.perf_counter() - start, None, exc)
+            raise
+        elapsed = time.perf_counter() - start
+
+        if _is_value(result):
+            self._hook(key, elapsed, result, None)
+            return result
+        self._hook(key, elapsed, OBJECT_RESULT, None)
+        return ComProxy(result, key, self._hook)
+
+
+class Recorder:
+    """Collects proxy hook results into a replayable fixture"""
+
+    def __init__(self, source):
+        self.source = source
+        self.entries = {}
+
+    def hook(self, key, elapsed, result, exc):
+        if exc is not None:
+            self.entries[key] = ['e', type(exc).__name__, str(exc)]
+        elif result is OBJECT_RESULT:
+            self.entries[key] = ['o']
+        else:
+            self.entries[key] = ['v', list(result) if isinstance(result, tuple) else result]
+
+    def save(self, path):
+        fixture = {
+            'format': FIXTURE_FORMAT,
+            'source': self.source,
+            'entries': self.entries,
+        }
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            json.dump(fixture, f, separators=(',', ':'))
+
+
+class FixtureMissError(LookupError):
+    """Raised when a replayed export makes a call that was not recorded"""
+
+
+class ReplayedComError(Exception):
+    """Stands in for a COM error that was raised while recording"""
+
+
+class ReplayObject:
+    """Serves recorded results for one access path of a fixture"""
+    __slots__ = ('_entries', '_path', '_latency')
+
+    def __init__(self, entries, path, latency=0.0):
+        self._entries = entries
+        self._path = path
+        self._latency = latency
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        key = f"{self._path}.{name}"
+        if key not in self._entries:
+            # Keep getattr(obj, name, default) probing working
+            raise AttributeError(f"{key} was not recorded")
+        return self._replay(key)
+
+    def __call__(self, *args):
+        key = f"{self._path}({_format_args(args)})"
+        if key not in self._entries:
+            raise FixtureMissError(f"{key} was not recorded")
+        return self._replay(key)
+
+    def _replay(self, key):
+        if self._latency:
+            time.sleep(self._latency)
+        entry = self._entries[key]
+        kind = entry[0]
+        if kind == 'v':
+            value = entry[1]
+            return tuple(value) if isinstance(value, list) else value
+        if kind == 'o':
+            return ReplayObject(self._entries, key, self._latency)
+        if entry[1] == 'AttributeError':
+            raise AttributeError(entry[2])
+        raise ReplayedComError(entry[2])
+
+
+def open_fixture(path, latency=0.0):
+    """Open a recorded fixture as a replayed project"""
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        fixture = json.load(f)
+    if fixture.get('format') != FIXTURE_FORMAT:
+        raise ValueError(f"Unsupported fixture format in {path}")
+    return ReplayObject(fixture['entries'], 'project', latency)
+
+
+class ProjectOpener:
+    """
+    Opens projects for an export run, starting RSLogix 5 only when an .rsp
+    project needs it and reusing that instance for later projects. COM and
+    replayed projects are opened in the opener's apartment thread, started
+    with the first one and stopped by quit().
+    """
+
+    def __init__(self, log, replay_latency=0.0):
+        self.log = log
+        self.replay_latency = replay_latency
+        self.rslogix5 = None
+        self.apartment = None
+        self._recorders = {}
+
+    def open(self, path, record_to=None, stats=None):
+        """
+        Open a project. When record_to is given and the project is opened
+        over COM, every call made on it is recorded and saved there by close().
+        When stats (a RunStats) is given, every call is timed into it,
+        whichever backend opens the project.
+        """
+        abs_path = os.path.abspath(path)
+        if is_pc5_file(abs_path):
+            self.log(f"Reading PC5 export: {abs_path}")
+            return self._instrument(open_pc5(abs_path), stats)
+
+        if self.apartment is None:
+            self.apartment = ComApartment()
+        if is_fixture_file(abs_path):
+            self.log(f"Replaying fixture: {abs_path}")
+            project = self.apartment.call(self._open_fixture, abs_path, stats)
+            return ApartmentProxy(project, self.apartment)
+
+        if self.rslogix5 is None:
+            if win32com is None:
+                raise RuntimeError("pywin32 is required to open .rsp projects")
+            self.log("Opening RSLogix5 Application...")
+            self.rslogix5 = self.apartment.call(self._start_rslogix5)
+
+        self.log(f"Opening project: {abs_path}")
+        project, recorder = self.apartment.call(self._open_rsp, abs_path, record_to, stats)
+        project = ApartmentProxy(project, self.apartment)
+        if recorder is not None:
+            self._recorders[id(project)] = (recorder, record_to)
+        return project
+
+    # Run in the apartment thread
+
+    def _open_fixture(self, abs_path, stats):
+        return self._instrument(open_fixture(abs_path, self.replay_latency), stats)
+
+    @staticmethod
+    def _start_rslogix5():
+        rslogix5 = win32com.Dispatch("RSLogix5.Application.5")
+        rslogix5.visible = True
+        return rslogix5
+
+    def _open_rsp(self, abs_path, record_to, stats):
+        project = self.rslogix5.FileOpen(abs_path, False, False, True)
+        if not record_to:
+            return self._instrument(project, stats), None
+
+        recorder = Recorder(abs_path)
+        hook = recorder.hook
+        if stats is not None:
+            def hook(key, elapsed, result, exc):
+                recorder.hook(key, elapsed, result, exc)
+                stats.hook(key, elapsed, result, exc)
+        return ComProxy(project, 'project', hook), recorder
+
+    @staticmethod
+    def _instrument(project, stats):
+        if stats is None:
+            return project
+        return ComProxy(project, 'project', stats.hook)
+
+    def close(self, project):
+        """Save the project's fixture if it was recorded, then close it"""
+        recording = self._recorders.pop(id(project), None)
+        if recording:
+            recorder, record_to = recording
+            recorder.save(record_to)
+            self.log(f"Recorded {len(recorder.entries)} COM results to {record_to}")
+        try:
+            project.Close(False)
+        except Exception:
+            pass
+
+    def quit(self):
+        if self.rslogix5 is not None:
+            try:
+                self.apartment.call(self.rslogix5.Quit, True, False)
+            except Exception:
+                pass
+            self.rslogix5 = None
+        if self.apartment is not None:
+            self.apartment.close()
+            self.apartment = None
@@ -0,0 +1,192 @@
+"""
+Command-line export, without Tk.
+
+    python plc5_cli.py Line3.rsp --datatable --no-rungs
+    python plc5_cli.py C:/Projects --workers 4 --parquet --sqlite --output D:/Exports
+    python plc5_cli.py Line3.rsp --csv-only --stream-csv --compression gzip
+
+A project file exports that project; a folder exports every project in
+it, as the folder GUI does. The flags mirror the GUI checkboxes
+(--tags/--no-tags, ...) and start from the same defaults. --csv-only
+writes CSV files and nothing else, as the CSV exporter does.
+
+Progress is written to stdout as JSON Lines, one object per event:
+
+    {"event": "log", "message": "..."}
+    {"event": "progress", "fraction": 0.42, "rungs_done": ..., "eta_seconds": ...}
+    {"event": "project", "path": "...", "ok": true, "output": "...", ...}
+    {"event": "done", ...}
+
+Ctrl+C cancels cooperatively, like the GUI's Cancel button. The exit
+status is 0 when everything exported, 1 when any project failed and
+130 when cancelled.
+"""
+import argparse
+import json
+import os
+import signal
+import sys
+import threading
+
+from plc5_api import DEFAULT_SETTINGS, export_csv, export_folder, export_project
+from plc5_compress import COMPRESSIONS
+from plc5_csv_exporter import CSV_OUTPUTS, DEFAULT_SETTINGS as CSV_SETTINGS
+from plc5_progress import ExportProgress
+
+
+# Flag name -> setting, in GUI checkbox order
+OPTION_FLAGS = (
+    ('tags', 'export_tags'),
+    ('timers', 'export_timers'),
+    ('counters', 'export_counters'),
+    ('controls', 'export_controls'),
+    ('arrays', 'export_arrays'),
+    ('messages', 'export_messages'),
+    ('io', 'export_io'),
+    ('rungs', 'export_rungs'),
+    ('datatable', 'export_datatable'),
+    ('processor', 'export_processor'),
+    ('channel', 'export_channel_config'),
+    ('io-config', 'export_io_config'),
+    ('preload-symbols', 'preload_symbols'),
+    ('record-fixture', 'record_fixture'),
+    ('stats', 'collect_stats'),
+    ('message-aliases', 'message_aliases'),
+)
+
+# Output flags, one per sink (plc5_sinks.SINKS)
+OUTPUT_FLAGS = (
+    ('xlsx', 'export_xlsx'),
+    ('csv', 'export_csv'),
+    ('jsonl', 'export_jsonl'),
+    ('parquet', 'export_parquet'),
+    ('sqlite', 'export_database'),
+)
+
+EXIT_FAILED = 1
+EXIT_CANCELLED = 130
+
+PROGRESS_INTERVAL = 1.0
+
+
+class JsonEvents:
+    """Writes one JSON object per line to a stream, from any thread"""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self._lock = threading.Lock()
+
+    def emit(self, event, **fields):
+        line = json.dumps({'event': event, **fields}, default=str)
+        with self._lock:
+            self.stream.write(line + '\n')
+            self.stream.flush()
+
+    def log(self, message):
+        self.emit('log', message=message)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='plc5_cli',
+        description="Export PLC-5 projects (.rsp, .pc5, .plc5rec) without the GUI.",
+    )
+    parser.add_argument('path', help="project file, or folder of projects")
+    parser.add_argument('--output', dest='output_folder', default=None,
+                        help="output folder (default: next to the project / the folder itself)")
+
+    options = parser.add_argument_group("export options (mirror the GUI checkboxes)")
+    for flag, setting in OPTION_FLAGS:
+        options.add_argument(f'--{flag}', dest=setting, action=argparse.BooleanOptionalAction,
+                             default=DEFAULT_SETTINGS[setting])
+
+    outputs = parser.add_argument_group("outputs")
+    for flag, setting in OUTPUT_FLAGS:
+        outputs.add_argument(f'--{flag}', dest=setting, action=argparse.BooleanOptionalAction,
+                             default=DEFAULT_SETTINGS[setting])
+
+    csv_output = parser.add_argument_group("CSV output")
+    csv_output.add_argument('--csv-only', action='store_true',
+                            help="write only CSV files, as the CSV exporter does (ignores the output flags)")
+    csv_output.add_argument('--stream-csv', dest='stream_csv', action=argparse.BooleanOptionalAction,
+                            default=DEFAULT_SETTINGS['stream_csv'],
+                            help="write each CSV row as soon as it is found")
+    csv_output.add_argument('--compression', choices=COMPRESSIONS, default=DEFAULT_SETTINGS['compression'],
+                            help="compress CSV files on the fly")
+    csv_output.add_argument('--compression-level', type=int, default=DEFAULT_SETTINGS['compression_level'],
+                            help="gzip 1-9 or zstd 1-22; lower is faster")
+
+    batch = parser.add_argument_group("folder exports")
+    batch.add_argument('--recursive', action=argparse.BooleanOptionalAction,
+                       default=DEFAULT_SETTINGS['recursive'], help="include subfolders")
+    batch.add_argument('--workers', type=int, default=DEFAULT_SETTINGS['workers'],
+                       help="worker processes, one RSLogix instance each")
+    batch.add_argument('--force', dest='force_export', action='store_true',
+                       help="re-export projects that are unchanged since the last run")
+    batch.add_argument('--replay-fixtures', action=argparse.BooleanOptionalAction,
+                       default=DEFAULT_SETTINGS['replay_fixtures'],
+                       help="also export .plc5rec fixtures found in the folder")
+
+    parser.add_argument('--lookup-cache-size', type=int, default=None,
+                        help="max cached symbol/value lookups per project")
+    parser.add_argument('--replay-latency', type=float, default=0.0,
+                        help="simulated seconds per COM call when replaying .plc5rec fixtures")
+    parser.add_argument('--progress-interval', type=float, default=PROGRESS_INTERVAL,
+                        help="seconds between progress events")
+    return parser
+
+
+def _report_progress(events, progress, interval, stop):
+    while not stop.wait(interval):
+        events.emit('progress', **progress.snapshot())
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    options = {name: value for name, value in vars(args).items() if name in DEFAULT_SETTINGS}
+    if args.csv_only:
+        options.update(CSV_OUTPUTS)
+    elif not any(options[setting] for _, setting in OUTPUT_FLAGS):
+        parser.error("no outputs selected")
+
+    events = JsonEvents()
+    progress = ExportProgress()
+    # Ctrl+C stops at the next rung boundary and saves what was collected
+    signal.signal(signal.SIGINT, lambda signum, frame: progress.cancel())
+
+    def on_result(result):
+        events.emit('project', **result.to_dict())
+
+    stop = threading.Event()
+    reporter = threading.Thread(target=_report_progress,
+                                args=(events, progress, args.progress_interval, stop), daemon=True)
+    reporter.start()
+    try:
+        if os.path.isdir(args.path):
+            batch = export_folder(args.path, options, events.log, progress, on_result)
+            ok, cancelled = batch.ok, batch.cancelled
+            summary = batch.to_dict()
+        else:
+            if args.csv_only:
+                csv_options = {name: value for name, value in options.items() if name in CSV_SETTINGS}
+                result = export_csv(args.path, csv_options, events.log, progress)
+            else:
+                result = export_project(args.path, options, events.log, progress)
+            on_result(result)
+            ok, cancelled = result.ok, result.cancelled
+            summary = {'exported': int(result.ok), 'failed': int(not result.ok), 'cancelled': result.cancelled}
+    finally:
+        stop.set()
+        reporter.join()
+
+    events.emit('progress', **progress.snapshot())
+    events.emit('done', **summary)
+
+    if cancelled:
+        return EXIT_CANCELLED
+    return 0 if ok else EXIT_FAILED
+
+
+if __name__ == "__main__":
+    sys.exit(main())
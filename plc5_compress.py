@@ -0,0 +1,50 @@
+"""
+Compressed text output for the CSV files.
+
+CSV files (most of the bytes are in the Rungs dump) can be written
+through gzip or zstd, compressed on the fly as rows are written, so an
+export to a slow network share is limited by CPU rather than bandwidth.
+Lower levels are faster; zstd at its default level is both faster and
+smaller than gzip. gzip is in the standard library; zstd needs the
+optional zstandard package.
+"""
+import gzip
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+COMPRESSIONS = ('none', 'gzip', 'zstd')
+
+DEFAULT_LEVEL = 3
+
+# Rows between flushes when streaming compressed output; every flush ends a
+# compressed block, so flushing each row would ruin the compression ratio
+COMPRESSED_FLUSH_ROWS = 1000
+
+_EXTENSIONS = {'gzip': '.gz', 'zstd': '.zst'}
+_LEVEL_RANGES = {'gzip': (1, 9), 'zstd': (1, 22)}
+
+
+def compressed_path(path, compression):
+    """path with the extension of the chosen compression added"""
+    return path + _EXTENSIONS.get(compression, '')
+
+
+def open_text(path, compression='none', level=DEFAULT_LEVEL):
+    """Open path for writing CSV text (utf-8, no newline translation), compressed as chosen"""
+    if compression == 'none':
+        return open(path, 'w', newline='', encoding='utf-8')
+    if compression not in _LEVEL_RANGES:
+        raise ValueError(f"Unknown compression: {compression}")
+
+    low, high = _LEVEL_RANGES[compression]
+    level = min(max(int(level), low), high)
+    if compression == 'gzip':
+        return gzip.open(path, 'wt', compresslevel=level, encoding='utf-8', newline='')
+    if zstandard is None:
+        raise RuntimeError("The zstandard package is required for zstd output")
+    return zstandard.open(path, 'wt', cctx=zstandard.ZstdCompressor(level=level),
+                          encoding='utf-8', newline='')
@@ -0,0 +1,128 @@
+"""
+CSV tables for the csv output.
+
+Each collected table is written to its own CSV file in the layout of
+CSV_LAYOUTS, optionally compressed (plc5_compress). CSVTables opens a
+table's file with its first row, so tables that stay empty write no
+file; the exporters can feed it from the rung pipeline's writer thread
+while collecting (stream_csv), in which case each row is on disk as soon
+as it is found and the rows found so far survive an export that dies
+part way, or the csv sink feeds it from the collection afterwards.
+Compressed files are flushed every COMPRESSED_FLUSH_ROWS rows instead of
+every row.
+"""
+import csv
+import os
+
+from plc5_compress import COMPRESSED_FLUSH_ROWS, DEFAULT_LEVEL, compressed_path, open_text
+from plc5_datatable import DATATABLE_HEADERS
+
+
+# Ladder CSV files: table -> (file suffix, headers, record keys when they differ from the headers)
+CSV_LAYOUTS = {
+    'tags': ('Tags', ['PLC5_Address', 'Symbol', 'Description', 'DataType', 'Value'],
+             ['Address', 'Symbol', 'Description', 'DataType', 'Value']),
+    'io': ('IO', ['Type', 'Address', 'Symbol', 'Description', 'Value'], None),
+    'timers': ('Timers', ['Type', 'Address', 'Symbol', 'Description', 'Base', 'PRE', 'ACC'], None),
+    'counters': ('Counters', ['Type', 'Address', 'Symbol', 'Description', 'PRE', 'ACC'], None),
+    'controls': ('Controls', ['Instruction', 'Address', 'Symbol', 'Description', 'Length', 'Position'], None),
+    'messages': ('Messages', ['Address', 'Symbol', 'Description', 'Type', 'ThisPLC', 'Length', 'Port', 'Target', 'Node'], None),
+    'rungs': ('Rungs', ['File_Name', 'File_Number', 'Rung_Number', 'Rung_ASCII'], None),
+    'datatable': ('DataTable', DATATABLE_HEADERS, None),
+}
+
+
+def csv_path(output_folder, base_name, suffix, timestamp, compression='none'):
+    """Output path of one CSV file, with .gz/.zst added when compressing"""
+    suffix = suffix.replace(' ', '')
+    return compressed_path(os.path.join(output_folder, f"{base_name}_{suffix}_{timestamp}.csv"), compression)
+
+
+class SeenKeys:
+    """Dict stand-in for a table that is not written; remembers keys only"""
+
+    def __init__(self):
+        self._seen = set()
+
+    def __contains__(self, key):
+        return key in self._seen
+
+    def __len__(self):
+        return len(self._seen)
+
+    def __setitem__(self, key, record):
+        if key not in self._seen:
+            self._seen.add(key)
+            self.append(record)
+
+    def append(self, record):
+        pass
+
+    def close(self):
+        pass
+
+
+class StreamedTable(SeenKeys):
+    """A CSV file written one record at a time, de-duplicated by key"""
+
+    def __init__(self, path, headers, keys=None, compression='none', level=DEFAULT_LEVEL):
+        super().__init__()
+        self.path = path
+        self.keys = keys or headers
+        self.rows = 0
+        self._flush_rows = 1 if compression == 'none' else COMPRESSED_FLUSH_ROWS
+        self._file = open_text(path, compression, level)
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(headers)
+        self._file.flush()
+
+    def append(self, record):
+        """Write a record without de-duplication (e.g. a rung)"""
+        self._writer.writerow([record.get(key) for key in self.keys])
+        self.rows += 1
+        if self.rows % self._flush_rows == 0:
+            self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+class CSVTables:
+    """
+    Streams the rows of several tables to their CSV files as they are
+    found. Tables without a layout, or not in tables, are ignored.
+    """
+
+    def __init__(self, output_folder, base_name, timestamp, tables=tuple(CSV_LAYOUTS),
+                 compression='none', level=DEFAULT_LEVEL):
+        self.output_folder = output_folder
+        self.base_name = base_name
+        self.timestamp = timestamp
+        self.tables = set(tables) & set(CSV_LAYOUTS)
+        self.compression = compression
+        self.level = level
+        self.streams = {}
+
+    def append(self, table, row):
+        stream = self.streams.get(table)
+        if stream is None:
+            if table not in self.tables:
+                return
+            suffix, headers, keys = CSV_LAYOUTS[table]
+            path = csv_path(self.output_folder, self.base_name, suffix, self.timestamp, self.compression)
+            stream = self.streams[table] = StreamedTable(path, headers, keys, self.compression, self.level)
+        stream.append(row)
+
+    def close(self, log=None):
+        """Close every file; returns their paths in table order"""
+        paths = []
+        for table in CSV_LAYOUTS:
+            stream = self.streams.pop(table, None)
+            if stream is None:
+                continue
+            stream.close()
+            paths.append(stream.path)
+            if log:
+                log(f"  Wrote {stream.rows} rows to {os.path.basename(stream.path)}")
+        return paths
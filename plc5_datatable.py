@@ -0,0 +1,167 @@
+"""
+Data table export for the PLC-5 exporters.
+
+iter_datatable() yields one row (FileType, FileNumber, Element, Address,
+Value) per value of every B, N, F, L, T, C and R data file, all elements
+of each file, so a caller can write rows as they are read instead of
+collecting the table first.
+
+Each file is read in blocks of DATATABLE_BLOCK elements. A .pc5 export
+hands a block of words over directly. The RSLogix 5 COM API has no call
+that reads several words, so over COM a block is still one GetDataValue
+call per word; the block only batches those calls into one request to
+the project's apartment (plc5_apartment), saving a cross-thread round
+trip per word, not COM calls. If any read in a block fails, that block
+is read again element by element and only the elements that cannot be
+read are left out.
+
+The exporters stream the rows into their outputs as they are yielded:
+into a spool file (plc5_xlsx.RowSpool) that the sheet, CSV and database
+outputs read back, and straight into Parquet (and the DataTable CSV when
+streaming CSV) when that output is selected.
+
+Timer, counter and control elements are written as their members rather
+than one opaque value: T4:0.PRE, T4:0.ACC, then T4:0/EN, T4:0/TT, T4:0/DN
+(R: .LEN, .POS and its status bits). The status bits are taken from the
+element's status word, read once.
+"""
+from plc5_address import ELEMENT_WORDS, STATUS_BITS, STRUCTURE_WORDS, format_address
+from plc5_apartment import apartment_of
+
+
+DATATABLE_FILE_TYPES = ('B', 'N', 'F', 'L', 'T', 'C', 'R')
+
+DATATABLE_HEADERS = ['FileType', 'FileNumber', 'Element', 'Address', 'Value']
+
+# Elements read per block
+DATATABLE_BLOCK = 128
+
+
+def data_files(datafiles):
+    """
+    [(data file, type, number, element count)] for every exported data
+    file that has elements. Files that fail are skipped.
+    """
+    apartment = apartment_of(datafiles)
+    if apartment is not None and not apartment.current:
+        # One request to the COM apartment instead of four per file
+        return apartment.call(data_files, datafiles)
+    files = []
+    for file_idx in range(datafiles.Count()):
+        try:
+            datafile = datafiles(file_idx)
+            if not datafile:
+                continue
+            file_type = datafile.TypeAsString
+            if file_type not in DATATABLE_FILE_TYPES:
+                continue
+            length = datafile.NumberOfElements
+            if length > 0:
+                files.append((datafile, file_type, datafile.FileNumber, length))
+        except Exception:
+            continue
+    return files
+
+
+def element_addresses(file_type, file_number, element):
+    """The addresses read for one element: the element itself, or its status, first and second word"""
+    address = format_address(file_type, file_number, element)
+    members = STRUCTURE_WORDS.get(file_type)
+    if not members:
+        return [address]
+    return [address] + [f"{address}.{member}" for member in members]
+
+
+def _read_addresses(datafiles, addresses):
+    return [datafiles.GetDataValue(address) for address in addresses]
+
+
+def _read_block(datafiles, file_type, file_number, start, stop):
+    """Words of elements start..stop-1, element after element; raises if any read fails"""
+    addresses = []
+    for element in range(start, stop):
+        addresses.extend(element_addresses(file_type, file_number, element))
+    apartment = apartment_of(datafiles)
+    if apartment is None:
+        return _read_addresses(datafiles, addresses)
+    return apartment.call(_read_addresses, datafiles, addresses)
+
+
+def _read_elements(datafiles, file_type, file_number, start, stop):
+    """{element: words} for the elements of start..stop-1 that can be read"""
+    def read(element):
+        return _read_addresses(datafiles, element_addresses(file_type, file_number, element))
+
+    elements = range(start, stop)
+    apartment = apartment_of(datafiles)
+    if apartment is None:
+        results = []
+        for element in elements:
+            try:
+                results.append(read(element))
+            except Exception as exc:
+                results.append(exc)
+    else:
+        results = apartment.batch(read, elements)
+    return {element: words for element, words in zip(elements, results) if not isinstance(words, Exception)}
+
+
+def element_rows(file_type, file_number, element, words):
+    """The rows of one element from its words (see element_addresses)"""
+    address = format_address(file_type, file_number, element)
+
+    def row(text, value):
+        return {
+            'FileType': file_type,
+            'FileNumber': file_number,
+            'Element': element,
+            'Address': text,
+            'Value': value,
+        }
+
+    members = STRUCTURE_WORDS.get(file_type)
+    if not members:
+        return [row(address, words[0])]
+
+    rows = [row(f"{address}.{member}", words[offset]) for member, offset in members.items()]
+    try:
+        status = int(words[0])
+    except (TypeError, ValueError):
+        # Not a status word after all: keep it as it was read
+        rows.append(row(address, words[0]))
+        return rows
+    for name, bit in STATUS_BITS[file_type].items():
+        rows.append(row(f"{address}/{name}", (status >> bit) & 1))
+    return rows
+
+
+def iter_datatable(datafiles, cancel=None, block_size=DATATABLE_BLOCK):
+    """
+    Yield the data table rows of every exported data file, a block at a
+    time. cancel, a threading.Event, stops the export at a block boundary.
+    """
+    for datafile, file_type, file_number, length in data_files(datafiles):
+        # .pc5 data files hold their words and hand out a block directly
+        read_words = getattr(datafile, 'read_words', None) if apartment_of(datafiles) is None else None
+        element_words = ELEMENT_WORDS.get(file_type, 1)
+
+        for start in range(0, length, block_size):
+            if cancel is not None and cancel.is_set():
+                return
+            stop = min(start + block_size, length)
+            try:
+                if read_words is not None:
+                    words = read_words(start, stop - start)
+                else:
+                    words = _read_block(datafiles, file_type, file_number, start, stop)
+                if len(words) != (stop - start) * element_words:
+                    raise ValueError(f"Short block read from {file_type}{file_number}:{start}")
+                elements = {
+                    element: words[i * element_words:(i + 1) * element_words]
+                    for i, element in enumerate(range(start, stop))
+                }
+            except Exception:
+                elements = _read_elements(datafiles, file_type, file_number, start, stop)
+
+            for element, element_values in elements.items():
+                yield from element_rows(file_type, file_number, element, element_values)
@@ -0,0 +1,91 @@
+"""
+Thread-safe, batched log for the exporter GUIs.
+
+The export runs on a worker thread, which must not touch Tk. log()
+timestamps a message, appends it to the current log file (if one is
+open) and puts it on a queue; the Tk main loop drains the queue every
+DRAIN_INTERVAL_MS and inserts the whole batch into the Text widget at
+once, so a big export no longer forces a redraw per line. The widget
+keeps only the last MAX_LINES lines; the log file has all of them.
+
+call(fn, *args) queues a GUI action (a message box, re-enabling the
+Export button) to run on the main loop after the lines logged before it.
+"""
+import functools
+import queue
+import threading
+from datetime import datetime
+
+
+DRAIN_INTERVAL_MS = 100
+MAX_LINES = 2000
+
+
+class LogQueue:
+    """Log lines and GUI actions from any thread, applied to Tk in batches"""
+
+    def __init__(self, root, text, max_lines=MAX_LINES, interval_ms=DRAIN_INTERVAL_MS):
+        self.root = root
+        self.text = text
+        self.max_lines = max_lines
+        self.interval_ms = interval_ms
+        self._queue = queue.SimpleQueue()
+        self._file = None
+        self._file_lock = threading.Lock()
+        self.root.after(self.interval_ms, self._drain)
+
+    def log(self, message):
+        line = f"[{datetime.now().strftime('%H:%M:%S')}] {message}\n"
+        with self._file_lock:
+            if self._file is not None:
+                self._file.write(line)
+        self._queue.put(line)
+
+    def call(self, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) on the Tk main loop"""
+        self._queue.put(functools.partial(fn, *args, **kwargs))
+
+    def open_file(self, path):
+        """Stream every following line to path, until close_file()"""
+        with self._file_lock:
+            if self._file is not None:
+                self._file.close()
+            # Line buffered, so the file is complete up to the last line if the export dies
+            self._file = open(path, 'a', encoding='utf-8', buffering=1)
+
+    def close_file(self):
+        with self._file_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _drain(self):
+        lines = []
+        try:
+            while True:
+                item = self._queue.get_nowait()
+                if callable(item):
+                    self._insert(lines)
+                    lines = []
+                    item()
+                else:
+                    lines.append(item)
+        except queue.Empty:
+            pass
+        finally:
+            self._insert(lines)
+            self.root.after(self.interval_ms, self._drain)
+
+    def _insert(self, lines):
+        if not lines:
+            return
+        # Lines beyond the cap would be trimmed straight away; skip inserting them
+        lines = lines[-self.max_lines:]
+        text = self.text
+        text.config(state="normal")
+        text.insert("end", ''.join(lines))
+        excess = int(text.index("end-1c").split('.')[0]) - 1 - self.max_lines
+        if excess > 0:
+            text.delete("1.0", f"{excess + 1}.0")
+        text.see("end")
+        text.config(state="disabled")
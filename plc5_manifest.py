@@ -0,0 +1,144 @@
+"""
+Export manifest for incremental folder exports.
+
+For every exported project the manifest keeps the project file's size,
+mtime and SHA-256, the export options used and the workbook written. On
+the next run a project is skipped when its file and the options are
+unchanged and that workbook still exists. An output file belongs to one
+project only: recording a project forgets any other project that claimed
+the same file, so a workbook overwritten by another project is never
+taken for the first one's export. Size and mtime are checked
+first; the file is only hashed when they differ, so a copied or touched
+but otherwise identical project is still recognised without re-exporting
+it. A .pc5 project's symbol database CSV (read with it, see plc5_pc5) is
+checked the same way, so editing only the symbols re-exports it. The
+manifest is stored as JSON in the output folder, rewritten whole (via a
+temporary file) so an interrupted save leaves the previous one intact.
+"""
+import hashlib
+import json
+import os
+
+from plc5_pc5 import is_pc5_file, symbol_database_path
+
+
+MANIFEST_FILE = 'plc5_export_manifest.json'
+
+_HASH_CHUNK = 1 << 20
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def companion_file(path):
+    """The other file an export of path reads: a .pc5 export's symbol database, or None"""
+    if is_pc5_file(path):
+        return symbol_database_path(path)
+    return None
+
+
+def _file_entry(path):
+    stat = os.stat(path)
+    return {
+        'path': os.path.abspath(path),
+        'size': stat.st_size,
+        'mtime': stat.st_mtime,
+        'sha256': file_hash(path),
+    }
+
+
+def _same_file(path, entry):
+    """True if path still has the size and content recorded in entry"""
+    stat = os.stat(path)
+    if stat.st_size != entry.get('size'):
+        return False
+    if stat.st_mtime != entry.get('mtime'):
+        if file_hash(path) != entry.get('sha256'):
+            return False
+        # Same content under a new timestamp; skip the hash next time
+        entry['mtime'] = stat.st_mtime
+    return True
+
+
+def options_key(options):
+    """Stable text form of an options dict, for comparing runs"""
+    return json.dumps(options, sort_keys=True, default=str)
+
+
+class ExportManifest:
+    """Remembers what each project was exported from, with which options, to where"""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.projects = {}
+
+    @classmethod
+    def load(cls, folder):
+        """Load the manifest kept in folder, or start a new one there"""
+        manifest = cls(os.path.join(folder, MANIFEST_FILE))
+        try:
+            with open(manifest.path, encoding='utf-8') as f:
+                manifest.projects = json.load(f).get('projects', {})
+        except (OSError, ValueError):
+            pass
+        return manifest
+
+    def save(self):
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'projects': self.projects}, f, indent=2)
+        os.replace(temp_path, self.path)
+
+    @staticmethod
+    def _key(path):
+        return os.path.normcase(os.path.abspath(path))
+
+    def _claimants(self, output):
+        """Keys of every project whose recorded output is output"""
+        output = os.path.normcase(os.path.abspath(output))
+        return [key for key, entry in self.projects.items()
+                if entry.get('output') and os.path.normcase(entry['output']) == output]
+
+    def unchanged(self, path, options):
+        """
+        Return the previous output file if the project and options are
+        unchanged since it was written, else None.
+        """
+        entry = self.projects.get(self._key(path))
+        if not entry or entry.get('options') != options_key(options):
+            return None
+        output = entry.get('output')
+        if not output or not os.path.exists(output):
+            return None
+        if self._claimants(output) != [self._key(path)]:
+            # Written over by another project since
+            return None
+
+        if not _same_file(path, entry):
+            return None
+        companion = companion_file(path)
+        previous = entry.get('companion')
+        if (companion is None) != (previous is None):
+            return None
+        if companion is not None and (os.path.normcase(os.path.abspath(companion)) != os.path.normcase(previous['path'])
+                                      or not _same_file(companion, previous)):
+            return None
+        return output
+
+    def record(self, path, options, output):
+        """Remember a successful export of path, forgetting any other project that claimed output"""
+        for key in self._claimants(output):
+            del self.projects[key]
+        entry = _file_entry(path)
+        companion = companion_file(path)
+        entry.update(
+            companion=_file_entry(companion) if companion is not None else None,
+            options=options_key(options),
+            output=os.path.abspath(output),
+        )
+        self.projects[self._key(path)] = entry
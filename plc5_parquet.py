@@ -0,0 +1,260 @@
+"""
+Columnar Parquet output for the PLC-5 exporters.
+
+Each exported table (tags, I/O, timers, counters, controls, messages,
+rungs, data table) is written to its own .parquet file with typed
+columns: file numbers, element, bit and rung indexes are integers, data
+values are numeric wherever the value is a number (the raw text is kept
+in ValueText otherwise), and symbol, description, data type and file
+name columns are dictionary encoded. Rows are buffered per column and
+flushed as a row group every ROW_GROUP_SIZE rows, so a table can be
+written while its rows are still being produced: the exporters feed a
+ParquetTables from the rung pipeline and the data table reader.
+
+pyarrow is optional; it is only needed when Parquet output is selected.
+"""
+import os
+from functools import lru_cache
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+from plc5_address import parse_address
+
+
+ROW_GROUP_SIZE = 65536
+
+
+def _int(value):
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, int):
+        return value
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+def _float(value):
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+def _text(value):
+    if value is None or value == '':
+        return None
+    return str(value)
+
+
+def _non_numeric_text(value):
+    return None if _float(value) is not None else _text(value)
+
+
+def _field(name):
+    """Text column"""
+    return lambda row: _text(row.get(name))
+
+
+# Several columns are derived from each row's address; parse it once
+_parse_address = lru_cache(maxsize=4096)(parse_address)
+
+
+def _address_part(part):
+    def get(row):
+        address = _parse_address(row.get('Address', ''))
+        return getattr(address, part) if address else None
+    return get
+
+
+# Column specs per table: (column name, type name, value getter)
+_ADDRESS_COLUMNS = [
+    ('Address', 'string', _field('Address')),
+    ('FileType', 'dictionary', _address_part('file_type')),
+    ('FileNumber', 'int32', _address_part('file_number')),
+    ('Element', 'int32', _address_part('element')),
+    ('Member', 'dictionary', _address_part('member')),
+    ('Bit', 'int32', _address_part('bit')),
+    ('Symbol', 'dictionary', _field('Symbol')),
+    ('Description', 'dictionary', _field('Description')),
+]
+
+_VALUE_COLUMNS = [
+    ('Value', 'float64', lambda row: _float(row.get('Value'))),
+    ('ValueText', 'string', lambda row: _non_numeric_text(row.get('Value'))),
+]
+
+TABLES = {
+    'tags': _ADDRESS_COLUMNS + [
+        ('DataType', 'dictionary', _field('DataType')),
+    ] + _VALUE_COLUMNS,
+    'io': [
+        ('Type', 'dictionary', _field('Type')),
+    ] + _ADDRESS_COLUMNS + _VALUE_COLUMNS,
+    'timers': [
+        ('Type', 'dictionary', _field('Type')),
+    ] + _ADDRESS_COLUMNS + [
+        ('Base', 'float64', lambda row: _float(row.get('Base'))),
+        ('PRE', 'int32', lambda row: _int(row.get('PRE'))),
+        ('ACC', 'int32', lambda row: _int(row.get('ACC'))),
+    ],
+    'counters': [
+        ('Type', 'dictionary', _field('Type')),
+    ] + _ADDRESS_COLUMNS + [
+        ('PRE', 'int32', lambda row: _int(row.get('PRE'))),
+        ('ACC', 'int32', lambda row: _int(row.get('ACC'))),
+    ],
+    'controls': [
+        ('Instruction', 'dictionary', _field('Instruction')),
+    ] + _ADDRESS_COLUMNS + [
+        ('Length', 'int32', lambda row: _int(row.get('Length'))),
+        ('Position', 'int32', lambda row: _int(row.get('Position'))),
+    ],
+    'messages': _ADDRESS_COLUMNS + [
+        ('PLC_Family', 'dictionary', _field('PLC_Family')),
+        ('DataType', 'dictionary', _field('DataType')),
+        ('Direction', 'dictionary', _field('Direction')),
+        ('LocalAddr', 'string', _field('LocalAddr')),
+        ('LocalLength', 'int32', lambda row: _int(row.get('LocalLength', row.get('Target')))),
+        ('RemoteNode', 'dictionary', _field('RemoteNode')),
+        ('RemoteAddr', 'string', _field('RemoteAddr')),
+        ('RemoteLength', 'int32', lambda row: _int(row.get('RemoteLength'))),
+        ('PortType', 'dictionary', _field('PortType')),
+        ('Channel', 'dictionary', _field('Channel')),
+        ('RawParameters', 'string', _field('RawParameters')),
+    ],
+    'rungs': [
+        ('File_Name', 'dictionary', _field('File_Name')),
+        ('File_Number', 'int32', lambda row: _int(row.get('File_Number'))),
+        ('Rung_Number', 'int32', lambda row: _int(row.get('Rung_Number'))),
+        ('Rung_ASCII', 'string', _field('Rung_ASCII')),
+    ],
+    'datatable': [
+        ('FileType', 'dictionary', _field('FileType')),
+        ('FileNumber', 'int32', lambda row: _int(row.get('FileNumber'))),
+        ('Element', 'int32', lambda row: _int(row.get('Element'))),
+        ('Address', 'string', _field('Address')),
+    ] + _VALUE_COLUMNS,
+}
+
+# Output file suffix per table, matching the sheet and CSV names
+TABLE_NAMES = {
+    'tags': 'Tags', 'io': 'IO', 'timers': 'Timers', 'counters': 'Counters',
+    'controls': 'Controls', 'messages': 'Messages', 'rungs': 'Rungs', 'datatable': 'DataTable',
+}
+
+
+def _arrow_type(type_name):
+    if type_name == 'dictionary':
+        return pa.dictionary(pa.int32(), pa.string())
+    return getattr(pa, type_name)()
+
+
+class ParquetTableWriter:
+    """Writes rows (dicts) of one table to a Parquet file, a row group at a time"""
+
+    def __init__(self, path, table, row_group_size=ROW_GROUP_SIZE):
+        if pa is None:
+            raise RuntimeError("pyarrow is required for Parquet output")
+        self.path = path
+        self.columns = TABLES[table]
+        self.row_group_size = row_group_size
+        self.schema = pa.schema([(name, _arrow_type(type_name)) for name, type_name, _ in self.columns])
+        self.rows = 0
+        self._buffers = [[] for _ in self.columns]
+        self._writer = pq.ParquetWriter(path, self.schema)
+
+    def append(self, row):
+        for buffer, (_, _, get) in zip(self._buffers, self.columns):
+            buffer.append(get(row))
+        self.rows += 1
+        if len(self._buffers[0]) >= self.row_group_size:
+            self.flush()
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    def flush(self):
+        if not self._buffers[0]:
+            return
+        arrays = [
+            pa.array(buffer, type=field.type)
+            for buffer, field in zip(self._buffers, self.schema)
+        ]
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema))
+        self._buffers = [[] for _ in self.columns]
+
+    def close(self):
+        self.flush()
+        self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def table_path(output_folder, base_name, table, timestamp):
+    return os.path.join(output_folder, f"{base_name}_{TABLE_NAMES[table]}_{timestamp}.parquet")
+
+
+class ParquetTables:
+    """
+    Streams the rows of several tables to their Parquet files as they are
+    found. A table's file is created with its first row, so tables that
+    stay empty write no file, as with write_parquet_tables.
+    """
+
+    def __init__(self, output_folder, base_name, timestamp, tables=tuple(TABLES)):
+        if pa is None:
+            raise RuntimeError("pyarrow is required for Parquet output")
+        self.output_folder = output_folder
+        self.base_name = base_name
+        self.timestamp = timestamp
+        self.tables = set(tables) & set(TABLES)
+        self.writers = {}
+
+    def append(self, table, row):
+        writer = self.writers.get(table)
+        if writer is None:
+            if table not in self.tables:
+                return
+            path = table_path(self.output_folder, self.base_name, table, self.timestamp)
+            writer = self.writers[table] = ParquetTableWriter(path, table)
+        writer.append(row)
+
+    def close(self, log=None):
+        """Close every file; returns their paths in table order"""
+        paths = []
+        for table in TABLES:
+            writer = self.writers.pop(table, None)
+            if writer is None:
+                continue
+            writer.close()
+            paths.append(writer.path)
+            if log:
+                log(f"  Wrote {writer.rows} rows to {os.path.basename(writer.path)}")
+        return paths
+
+
+def write_parquet_tables(data, output_folder, base_name, timestamp, log):
+    """Write every collected table in data (as built by the exporters) to Parquet"""
+    for table in TABLES:
+        rows = data.get(table)
+        if not rows:
+            continue
+        if isinstance(rows, dict):
+            rows = rows.values()
+        path = table_path(output_folder, base_name, table, timestamp)
+        with ParquetTableWriter(path, table) as writer:
+            writer.extend(rows)
+        log(f"  Wrote {writer.rows} rows to {os.path.basename(path)}")
@@ -0,0 +1,293 @@
+"""
+Offline reader for RSLogix 5 .PC5 ASCII project exports.
+
+open_pc5() parses the export into objects that expose the same members the
+exporters use on the RSLogix 5 COM project (ProgramFiles, DataFiles,
+AddrSymRecords, NumberOfRungs, GetRungAsAscii, GetDataValue, ...), so the
+rest of the export runs unchanged without an RSLogix instance.
+
+The reader understands the parts of the export the exporters need:
+
+    PROJECT "NAME"
+    LADDER 2 MAIN                      program file number and name
+    SOR XIC I:000/00 OTE O:001/00 EOR  rungs (may span lines; %...% comments ignored)
+    DATA N7:0                          data file values from the given element on,
+    0 12 -5 ...                        whitespace separated, one word per value
+
+Timer, counter and control elements take three words (status, PRE/LEN,
+ACC/POS). Symbols and descriptions are not part of the PC5 file; they are
+read from the database CSV export with the same name next to it (a header
+row with ADDRESS, SYMBOL and DESC*/DESCRIPTION columns), if there is one.
+"""
+import csv
+import os
+import re
+
+from plc5_address import ELEMENT_WORDS, STATUS_BITS, STRUCTURE_WORDS, parse_address
+from plc5_symbols import SymbolIndex
+
+
+PC5_EXTENSION = '.pc5'
+
+_RUNG = re.compile(r'\bSOR\b.*?\bEOR\b', re.DOTALL)
+_COMMENT = re.compile(r'%[^%]*%')
+
+
+def is_pc5_file(path):
+    return path.lower().endswith(PC5_EXTENSION)
+
+
+def _parse_value(token):
+    """Convert a data table word to int or float where possible"""
+    try:
+        return int(token)
+    except ValueError:
+        pass
+    try:
+        return int(token, 0)
+    except ValueError:
+        pass
+    try:
+        return float(token)
+    except ValueError:
+        return token
+
+
+def _is_value(token):
+    return bool(re.match(r'^[-+]?(\d|\.\d)', token))
+
+
+def _unquote(text):
+    text = text.strip()
+    if len(text) >= 2 and text[0] == text[-1] == '"':
+        return text[1:-1]
+    return text
+
+
+class PC5ProgramFile:
+    def __init__(self, file_number, name):
+        self.FileNumber = file_number
+        self.Name = name
+        self.rungs = []
+
+    def NumberOfRungs(self):
+        return len(self.rungs)
+
+    def GetRungAsAscii(self, rung_idx):
+        return self.rungs[rung_idx]
+
+
+class PC5ProgramFiles:
+    """Program files indexed by file number, like project.ProgramFiles"""
+
+    def __init__(self):
+        self.files = {}
+
+    def Count(self):
+        return max(self.files) + 1 if self.files else 0
+
+    def Item(self, file_number):
+        return self.files.get(file_number)
+
+    def __call__(self, file_number):
+        return self.Item(file_number)
+
+
+class PC5DataFile:
+    def __init__(self, file_type, file_number):
+        self.TypeAsString = file_type
+        self.FileNumber = file_number
+        self.words = []
+
+    @property
+    def element_words(self):
+        return ELEMENT_WORDS.get(self.TypeAsString, 1)
+
+    @property
+    def NumberOfElements(self):
+        return len(self.words) // self.element_words
+
+    def store(self, element, values):
+        start = element * self.element_words
+        end = start + len(values)
+        if end > len(self.words):
+            self.words.extend([0] * (end - len(self.words)))
+        self.words[start:end] = values
+
+    def read_words(self, element, count):
+        """The words of count elements from element on, as one flat list"""
+        start = element * self.element_words
+        end = start + count * self.element_words
+        if end > len(self.words):
+            raise IndexError(f"Elements {element}..{element + count - 1} out of range")
+        return self.words[start:end]
+
+    def value(self, address):
+        """Return the value of a parsed address within this file"""
+        file_type = self.TypeAsString
+        base = address.element * self.element_words
+        word_offset = 0
+        bit = address.bit
+
+        if address.member is not None:
+            if address.member in STRUCTURE_WORDS.get(file_type, {}):
+                word_offset = STRUCTURE_WORDS[file_type][address.member]
+            elif address.member in STATUS_BITS.get(file_type, {}):
+                bit = STATUS_BITS[file_type][address.member]
+            else:
+                raise ValueError(f"Unknown member {address.member} for {file_type} file")
+
+        word = self.words[base + word_offset]
+        if bit is None:
+            return word
+        return (int(word) >> bit) & 1
+
+
+class PC5DataFiles:
+    """Data files indexed by file number, like project.DataFiles"""
+
+    def __init__(self):
+        self.files = {}
+
+    def Count(self):
+        return max(self.files) + 1 if self.files else 0
+
+    def Item(self, file_number):
+        return self.files.get(file_number)
+
+    def __call__(self, file_number):
+        return self.Item(file_number)
+
+    def get_or_create(self, file_type, file_number):
+        datafile = self.files.get(file_number)
+        if datafile is None:
+            datafile = self.files[file_number] = PC5DataFile(file_type, file_number)
+        return datafile
+
+    def GetDataValue(self, addr):
+        address = parse_address(addr)
+        if address is None:
+            raise ValueError(f"Invalid address: {addr}")
+        datafile = self.files.get(address.file_number)
+        if datafile is None or datafile.TypeAsString != address.file_type:
+            raise KeyError(f"No data file for {addr}")
+        try:
+            return datafile.value(address)
+        except IndexError:
+            raise KeyError(f"Element out of range: {addr}")
+
+
+class PC5Project:
+    def __init__(self, name):
+        self.Name = name
+        self.ProgramFiles = PC5ProgramFiles()
+        self.DataFiles = PC5DataFiles()
+        self.AddrSymRecords = SymbolIndex()
+
+    def Close(self, save=False):
+        pass
+
+
+def _read_ladder(project, header, text):
+    parts = header.split(None, 1)
+    try:
+        file_number = int(parts[0])
+    except (IndexError, ValueError):
+        return
+    name = _unquote(parts[1]) if len(parts) > 1 else f"LAD{file_number}"
+    program_file = PC5ProgramFile(file_number, name)
+    text = _COMMENT.sub(' ', text)
+    program_file.rungs = [' '.join(rung.split()) for rung in _RUNG.findall(text)]
+    project.ProgramFiles.files[file_number] = program_file
+
+
+def _read_data(project, header, values):
+    parts = header.split()
+    if not parts:
+        return
+    address = parse_address(parts[0])
+    if address is None:
+        return
+    values = parts[1:] + values
+    datafile = project.DataFiles.get_or_create(address.file_type, address.file_number)
+    datafile.store(address.element, [_parse_value(v) for v in values])
+
+
+def read_symbol_database(path, index):
+    """Add the records of an RSLogix 5 database CSV export to a SymbolIndex"""
+    with open(path, newline='', encoding='latin-1') as f:
+        header = None
+        for row in csv.reader(f):
+            cells = [cell.strip() for cell in row]
+            if header is None:
+                upper = [cell.upper() for cell in cells]
+                if 'SYMBOL' in upper and ('ADDRESS' in upper or 'ADDR' in upper):
+                    header = upper
+                    addr_col = upper.index('ADDRESS') if 'ADDRESS' in upper else upper.index('ADDR')
+                    sym_col = upper.index('SYMBOL')
+                    desc_cols = [i for i, h in enumerate(upper) if h.startswith('DESC')]
+                    width = max([addr_col, sym_col] + desc_cols) + 1
+                continue
+
+            cells += [''] * (width - len(cells))
+            desc = '\r\n'.join(cells[i] for i in desc_cols if cells[i])
+            index.add(cells[addr_col], cells[sym_col], desc)
+
+
+def symbol_database_path(pc5_path):
+    """The database CSV export read with a .pc5 export (same name, .csv), or None"""
+    folder = os.path.dirname(os.path.abspath(pc5_path))
+    stem = os.path.splitext(os.path.basename(pc5_path))[0].lower()
+    for name in os.listdir(folder):
+        if name.lower() == stem + '.csv':
+            return os.path.join(folder, name)
+    return None
+
+
+def open_pc5(path):
+    """Parse a .PC5 export (plus its database CSV, if present) into a PC5Project"""
+    project = PC5Project(os.path.splitext(os.path.basename(path))[0])
+
+    section = None
+    header = ''
+    body = []
+
+    def flush():
+        if section == 'LADDER':
+            _read_ladder(project, header, '\n'.join(body))
+        elif section == 'DATA':
+            _read_data(project, header, body)
+
+    with open(path, encoding='latin-1') as f:
+        for line in f:
+            words = line.split(None, 1)
+            if not words:
+                continue
+            keyword = words[0].upper()
+            rest = words[1].strip() if len(words) > 1 else ''
+
+            if keyword in ('LADDER', 'DATA'):
+                flush()
+                section, header, body = keyword, rest, []
+            elif keyword == 'PROJECT':
+                flush()
+                section, body = None, []
+                if rest:
+                    project.Name = _unquote(rest)
+            elif section == 'LADDER':
+                body.append(line)
+            elif section == 'DATA':
+                tokens = line.split()
+                if _is_value(tokens[0]):
+                    body.extend(tokens)
+                else:
+                    # Any other keyword ends the data section
+                    flush()
+                    section, body = None, []
+        flush()
+
+    database = symbol_database_path(path)
+    if database:
+        read_symbol_database(database, project.AddrSymRecords)
+
+    return project
@@ -0,0 +1,314 @@
+"""
+Three-stage rung pipeline: COM fetch and lookups, parse workers, writer.
+
+    fetch rungs --> parse pool --> symbol/value lookups --> writer
+    (COM thread)    (threads)      (COM thread)             (thread)
+
+The calling thread makes every COM request (to the project's apartment
+thread, see plc5_apartment): it fetches a batch of rungs, hands them to
+the parse pool, then resolves the lookups of whatever batches have been
+parsed (prefetch, one request per batch) and runs the extractors over
+them, and repeats. Tokenizing runs on the pool meanwhile, overlapping
+the COM round trips (pywin32 releases the GIL during a call). New
+records go to a writer thread, which builds the tables or streams them
+into the outputs while COM keeps going.
+
+Parsed rungs are analyzed in rung order, so the records, and which
+occurrence of an address wins de-duplication, are exactly those of a
+serial loop. Rungs and records move between stages in batches, to keep
+queue overhead per rung small, and every queue is bounded. Per-stage
+item counts, busy time and queue depth (in batches) are kept as
+StageStats for the run stats.
+"""
+import queue
+import threading
+import time
+
+from plc5_csvstream import SeenKeys
+from plc5_pc5 import is_pc5_file
+
+
+PARSE_WORKERS = 2
+# Queues hold batches of rungs (or of one batch's records)
+QUEUE_SIZE = 16
+BATCH_SIZE = 64
+
+STAGE_STATS_HEADERS = [
+    'Stage', 'Workers', 'Items', 'Busy_s', 'Busy_pct', 'Items_per_s', 'Queue_Max', 'Queue_Mean',
+]
+
+# How long a blocked stage waits before checking for shutdown
+_POLL = 0.05
+
+
+def parse_workers(path):
+    """Parse threads for a project: none for a .pc5 export, which is read in-process and never releases the GIL"""
+    return 0 if is_pc5_file(path) else PARSE_WORKERS
+
+
+class StageStats:
+    """Throughput (items: rungs, or records for the writer) and input queue depth of one pipeline stage"""
+
+    def __init__(self, name, workers=1):
+        self.name = name
+        self.workers = workers
+        self.items = 0
+        self.busy = 0.0
+        self.depth_max = 0
+        self.depth_total = 0
+        self.depth_samples = 0
+        self._lock = threading.Lock()
+
+    def done(self, elapsed, items=1):
+        with self._lock:
+            self.items += items
+            self.busy += elapsed
+
+    def sample(self, depth):
+        """Record the depth of this stage's input queue"""
+        self.depth_samples += 1
+        self.depth_total += depth
+        if depth > self.depth_max:
+            self.depth_max = depth
+
+    def row(self, wall):
+        capacity = wall * self.workers
+        return {
+            'Stage': self.name,
+            'Workers': self.workers,
+            'Items': self.items,
+            'Busy_s': round(self.busy, 3),
+            'Busy_pct': round(100 * self.busy / capacity, 1) if capacity else 0.0,
+            'Items_per_s': round(self.items / self.busy, 1) if self.busy else 0.0,
+            'Queue_Max': self.depth_max,
+            'Queue_Mean': round(self.depth_total / self.depth_samples, 1) if self.depth_samples else 0.0,
+        }
+
+
+class QueuedTable(SeenKeys):
+    """Dict stand-in filled on the COM thread; each new record is passed to the writer"""
+
+    def __init__(self, name, emit):
+        super().__init__()
+        self.name = name
+        self._emit = emit
+
+    def __setitem__(self, key, record):
+        if key not in self._seen:
+            self._seen.add(key)
+            self._emit(self.name, key, record)
+
+    def append(self, record):
+        """A record without a key (a rung, an array)"""
+        self._emit(self.name, None, record)
+
+
+class _Failed:
+    __slots__ = ('exc',)
+
+    def __init__(self, exc):
+        self.exc = exc
+
+
+class RungPipeline:
+    """
+    Runs rungs through parse(rung) on the pool and analyze(rung, parsed,
+    tables) on the calling (COM) thread; analyze fills the tables (one
+    QueuedTable per name in table_names) and write(table, key, record)
+    receives every new record on the writer thread. If 'rungs' is one of
+    the tables, each rung is written too. parse and analyze may be None
+    (rungs only). A rung that fails to parse or analyze is passed to
+    on_error(rung, exc) and skipped. prefetch, if given, receives each
+    batch's parse results before the batch is analyzed; if that fails,
+    each rung is prefetched on its own as it is analyzed, so only the
+    rungs whose lookups fail are skipped.
+
+    With workers=0 rungs are parsed on the calling thread: for backends
+    that read in-process (.pc5), where fetching never releases the GIL
+    and parse threads would only compete with it.
+    """
+
+    def __init__(self, table_names, parse, analyze, write, on_error=None, prefetch=None,
+                 workers=PARSE_WORKERS, queue_size=QUEUE_SIZE, batch_size=BATCH_SIZE):
+        self.parse = parse
+        self.analyze = analyze
+        self.write = write
+        self.on_error = on_error
+        self.prefetch = prefetch
+        self.workers = max(0, int(workers))
+        self.batch_size = batch_size
+        self.tables = {name: QueuedTable(name, self._emit) for name in table_names}
+
+        self._rungs = queue.Queue(queue_size)
+        self._parsed = queue.Queue(queue_size)
+        self._records = queue.Queue(queue_size)
+        self._stop = threading.Event()
+        self._write_error = None
+        # Records found in the batch being analyzed, sent to the writer together
+        self._pending = []
+
+        self.fetch_stats = StageStats('fetch')
+        self.parse_stats = StageStats('parse', self.workers or 1)
+        self.lookup_stats = StageStats('lookup')
+        self.write_stats = StageStats('write')
+        self.wall = 0.0
+
+    @property
+    def stages(self):
+        return [self.fetch_stats, self.parse_stats, self.lookup_stats, self.write_stats]
+
+    def stage_rows(self):
+        return [stage.row(self.wall) for stage in self.stages]
+
+    def run(self, rungs):
+        """Fetch rungs (an iterable doing COM reads) through every stage; returns when all are written"""
+        started = time.perf_counter()
+        threads = [threading.Thread(target=self._parse_worker, daemon=True) for _ in range(self.workers)]
+        threads.append(threading.Thread(target=self._writer, daemon=True))
+        for thread in threads:
+            thread.start()
+
+        source = iter(rungs)
+        exhausted = False
+        fetched = 0
+        analyzed = 0
+        ready = {}
+        try:
+            while not exhausted or analyzed < fetched:
+                # Fetch a batch of rungs for the parse pool
+                if not exhausted and not self._rungs.full():
+                    batch = []
+                    start = time.perf_counter()
+                    for rung in source:
+                        batch.append(rung)
+                        if len(batch) == self.batch_size:
+                            break
+                    else:
+                        exhausted = True
+                    if batch:
+                        self.fetch_stats.done(time.perf_counter() - start, len(batch))
+                        if self.workers:
+                            self.parse_stats.sample(self._rungs.qsize())
+                            self._rungs.put((fetched, batch))
+                        else:
+                            ready[fetched] = self._parse(batch)
+                        fetched += 1
+
+                # Then analyze every parsed batch that is next in order
+                if self.workers:
+                    waiting = analyzed < fetched and (exhausted or self._rungs.full())
+                    self._collect(ready, block=waiting)
+                while analyzed in ready:
+                    self._analyze(ready.pop(analyzed))
+                    analyzed += 1
+        except BaseException:
+            self._stop.set()
+            raise
+        finally:
+            for _ in range(self.workers):
+                self._put(self._rungs, None)
+            self._put(self._records, None)
+            for thread in threads:
+                thread.join()
+            self.wall = time.perf_counter() - started
+
+        if self._write_error is not None:
+            raise self._write_error
+
+    def _collect(self, ready, block):
+        """Move parsed batches into ready; when block is set, wait for at least one"""
+        self.lookup_stats.sample(self._parsed.qsize())
+        while True:
+            try:
+                seq, parsed = self._parsed.get(timeout=_POLL) if block else self._parsed.get_nowait()
+            except queue.Empty:
+                if block and not ready:
+                    continue
+                return
+            ready[seq] = parsed
+            block = False
+
+    def _analyze(self, batch):
+        """Analyze a parsed batch in rung order, then pass its new records to the writer"""
+        start = time.perf_counter()
+        prefetch_rungs = False
+        if self.prefetch is not None:
+            try:
+                self.prefetch([parsed for _, parsed in batch if parsed is not None and not isinstance(parsed, _Failed)])
+            except Exception:
+                prefetch_rungs = True
+        for rung, parsed in batch:
+            if 'rungs' in self.tables:
+                self.tables['rungs'].append(rung)
+            try:
+                if isinstance(parsed, _Failed):
+                    raise parsed.exc
+                if prefetch_rungs and parsed is not None:
+                    self.prefetch([parsed])
+                if self.analyze is not None:
+                    self.analyze(rung, parsed, self.tables)
+            except Exception as exc:
+                if self.on_error is not None:
+                    self.on_error(rung, exc)
+        self.lookup_stats.done(time.perf_counter() - start, len(batch))
+        if self._pending:
+            self.write_stats.sample(self._records.qsize())
+            self._put(self._records, self._pending)
+            self._pending = []
+
+    def _emit(self, table, key, record):
+        self._pending.append((table, key, record))
+
+    def _put(self, q, item):
+        while True:
+            try:
+                q.put(item, timeout=_POLL)
+                return
+            except queue.Full:
+                if self._stop.is_set() and item is not None:
+                    return
+
+    def _get(self, q):
+        while True:
+            try:
+                return q.get(timeout=_POLL)
+            except queue.Empty:
+                if self._stop.is_set():
+                    return None
+
+    def _parse(self, batch):
+        start = time.perf_counter()
+        parsed = []
+        for rung in batch:
+            try:
+                parsed.append((rung, self.parse(rung) if self.parse is not None else None))
+            except Exception as exc:
+                parsed.append((rung, _Failed(exc)))
+        self.parse_stats.done(time.perf_counter() - start, len(batch))
+        return parsed
+
+    def _parse_worker(self):
+        while True:
+            item = self._get(self._rungs)
+            if item is None:
+                return
+            seq, batch = item
+            self._put(self._parsed, (seq, self._parse(batch)))
+            if self._stop.is_set():
+                return
+
+    def _writer(self):
+        while True:
+            records = self._get(self._records)
+            if records is None:
+                return
+            if self._write_error is not None:
+                # Keep draining so the COM thread never blocks on a dead writer
+                continue
+            start = time.perf_counter()
+            try:
+                for record in records:
+                    self.write(*record)
+            except Exception as exc:
+                self._write_error = exc
+            self.write_stats.done(time.perf_counter() - start, len(records))
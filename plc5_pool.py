@@ -0,0 +1,216 @@
+"""
+Worker process pool for batch (folder) exports.
+
+Each worker process owns one ProjectOpener (and so its own COM apartment
+thread and at most one RSLogix 5 instance) and pulls project paths from
+a shared queue until it receives a stop sentinel. Log lines, rung
+progress and per-project results come back over a single event queue,
+which the caller drains on its own thread, so the GUI sees one
+interleaved log tagged with the worker number.
+
+Cancel is a multiprocessing.Event shared with every worker and used as
+the cancel flag of the worker's ExportProgress, so a running project
+stops at the next rung or data table block, as in a serial export, and
+saves what it collected.
+
+The exporter is built in each worker by factory(settings, log), which must
+be picklable (a module-level function or a classmethod) and return an
+object with export_project(opener, path, name), name being the base name
+of the project's output files (None for the exporter's default). Workers use the 'spawn' start
+method on every platform, so a run on Linux against .pc5 exports or
+.plc5rec fixtures behaves like the COM run on Windows.
+"""
+import multiprocessing
+import queue
+import signal
+import time
+import traceback
+
+from plc5_backend import ProjectOpener
+from plc5_progress import ExportProgress
+
+
+# How often the collector checks for workers that died without reporting
+_POLL_INTERVAL = 0.5
+
+# How often a worker reports its rung progress, in seconds
+_PROGRESS_INTERVAL = 0.25
+
+
+class WorkerProgress(ExportProgress):
+    """A worker's ExportProgress: cancelled through the pool's shared event, rung counts sent back as events"""
+
+    def __init__(self, worker_id, cancel_event, events):
+        self.worker_id = worker_id
+        self.events = events
+        self._reported = 0.0
+        super().__init__()
+        # Set after reset(): clearing the shared event is the pool caller's job
+        self.cancel_event = cancel_event
+
+    def start_project(self, rungs_total):
+        super().start_project(rungs_total)
+        self._report()
+
+    def rung_done(self):
+        super().rung_done()
+        now = time.perf_counter()
+        if now - self._reported >= _PROGRESS_INTERVAL or self.rungs_done == self.rungs_total:
+            self._report(now)
+
+    def _report(self, now=None):
+        self._reported = now or time.perf_counter()
+        self.events.put(('progress', self.worker_id, self.rungs_done, self.rungs_total))
+
+
+def _worker_main(worker_id, factory, settings, jobs, events, cancel_event):
+    # Ctrl+C reaches the whole process group; the parent cancels through cancel_event
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    def log(message):
+        events.put(('log', worker_id, message))
+
+    opener = ProjectOpener(log, settings.get('replay_latency', 0.0))
+    try:
+        exporter = factory(settings, log)
+        exporter.progress = WorkerProgress(worker_id, cancel_event, events)
+        while True:
+            job = jobs.get()
+            if job is None:
+                break
+            path, name = job
+            events.put(('start', worker_id, path))
+            start = time.perf_counter()
+            try:
+                result = exporter.export_project(opener, path, name)
+            except Exception as exc:
+                events.put(('error', worker_id, path, f"{exc}\n{traceback.format_exc()}",
+                            time.perf_counter() - start))
+            else:
+                events.put(('done', worker_id, path, result, time.perf_counter() - start))
+    finally:
+        opener.quit()
+        events.put(('exit', worker_id))
+
+
+def _drop_pending(jobs, worker_count):
+    """Empty the job queue, then stop every worker; returns the number of paths dropped"""
+    dropped = 0
+    try:
+        while True:
+            if jobs.get_nowait() is not None:
+                dropped += 1
+    except queue.Empty:
+        pass
+    for _ in range(worker_count):
+        jobs.put(None)
+    return dropped
+
+
+class ProjectResult:
+    """Outcome of one project in a pool run"""
+    __slots__ = ('path', 'ok', 'result', 'error', 'elapsed', 'worker')
+
+    def __init__(self, path, ok, result=None, error=None, elapsed=0.0, worker=None):
+        self.path = path
+        self.ok = ok
+        self.result = result
+        self.error = error
+        self.elapsed = elapsed
+        self.worker = worker
+
+
+class ExportPool:
+    """Runs export_project for many projects across worker processes"""
+
+    def __init__(self, factory, settings, workers):
+        self.factory = factory
+        self.settings = settings
+        self.workers = max(1, int(workers))
+
+    def run(self, paths, log, on_result=None, cancel=None, on_progress=None, names=None):
+        """
+        Export every path, calling log(message) for each worker log line,
+        on_progress(worker, path, rungs done, rungs total) as workers fetch
+        rungs and on_result(ProjectResult) as each project finishes. Blocks
+        until all projects are done (or every worker has exited) and
+        returns the results in completion order. names ({path: output
+        base name}, see plc5_backend.output_names) keeps the output files
+        of same-named projects apart.
+
+        Once cancel (a threading.Event) is set, projects not yet started are
+        dropped, and running projects stop at their next rung or data table
+        block and save what they collected.
+        """
+        context = multiprocessing.get_context('spawn')
+        jobs = context.Queue()
+        events = context.Queue()
+        stop = context.Event()
+        worker_count = min(self.workers, len(paths)) or 1
+
+        for path in paths:
+            jobs.put((path, names.get(path) if names else None))
+        for _ in range(worker_count):
+            jobs.put(None)
+
+        processes = []
+        for worker_id in range(1, worker_count + 1):
+            process = context.Process(
+                target=_worker_main,
+                args=(worker_id, self.factory, self.settings, jobs, events, stop),
+                daemon=True,
+            )
+            process.start()
+            processes.append(process)
+        log(f"Started {worker_count} export worker(s)")
+
+        results = []
+        running = {}
+        exited = set()
+        cancelling = False
+        while len(results) < len(paths) and len(exited) < worker_count:
+            if cancel is not None and cancel.is_set() and not cancelling:
+                cancelling = True
+                stop.set()
+                dropped = _drop_pending(jobs, worker_count)
+                log(f"Cancelled: {dropped} queued project(s) will not be started")
+            try:
+                event = events.get(timeout=_POLL_INTERVAL)
+            except queue.Empty:
+                for worker_id, process in enumerate(processes, start=1):
+                    # A clean exit is reported by its 'exit' event; only crashes are handled here
+                    if worker_id not in exited and not process.is_alive() and process.exitcode != 0:
+                        exited.add(worker_id)
+                        path = running.pop(worker_id, None)
+                        log(f"[w{worker_id}] Worker exited unexpectedly (exit code {process.exitcode})")
+                        if path is not None:
+                            result = ProjectResult(path, False, error="Worker process died", worker=worker_id)
+                            results.append(result)
+                            if on_result:
+                                on_result(result)
+                continue
+
+            kind, worker_id = event[0], event[1]
+            if kind == 'log':
+                log(f"[w{worker_id}] {event[2]}")
+            elif kind == 'start':
+                running[worker_id] = event[2]
+            elif kind == 'progress':
+                if on_progress and worker_id in running:
+                    on_progress(worker_id, running[worker_id], event[2], event[3])
+            elif kind == 'exit':
+                exited.add(worker_id)
+            else:
+                path, payload, elapsed = event[2], event[3], event[4]
+                running.pop(worker_id, None)
+                if kind == 'done':
+                    result = ProjectResult(path, True, result=payload, elapsed=elapsed, worker=worker_id)
+                else:
+                    result = ProjectResult(path, False, error=payload, elapsed=elapsed, worker=worker_id)
+                results.append(result)
+                if on_result:
+                    on_result(result)
+
+        for process in processes:
+            process.join(timeout=5)
+        return results
@@ -0,0 +1,211 @@
+"""
+Determinate progress, throughput/ETA and cooperative cancel for exports.
+
+The worker thread updates an ExportProgress as it goes: the rung total
+is counted before any rung is fetched, each fetched rung is counted,
+and in folder mode each finished project adds its predicted cost (from
+the batch cost model). The GUI never waits on the worker: a ProgressView
+polls the progress from the Tk main loop and shows it on the progress
+bar and a status line (rungs/sec and ETA).
+
+Cancel only sets a flag. The rung loops check it at every rung boundary
+and stop there; the exporter then skips the remaining collection steps,
+writes what it has collected, closes the project and does not start
+another one.
+
+Pool workers (plc5_pool) run with an ExportProgress of their own whose
+cancel flag is an event shared with the batch, and report their rung
+counts back; the batch progress adds them up with worker_progress().
+"""
+import threading
+import time
+
+from plc5_apartment import apartment_of
+
+
+POLL_INTERVAL_MS = 250
+
+# Progress bar resolution
+_BAR_MAXIMUM = 1000
+
+
+def ladder_files(program_files):
+    """
+    Pre-count the ladder: [(ladder file, rung count)] for every program
+    file (from file 2 on) that has rungs. Files that fail are skipped.
+    """
+    apartment = apartment_of(program_files)
+    if apartment is not None and not apartment.current:
+        # One request to the COM apartment instead of two per file
+        return apartment.call(ladder_files, program_files)
+    files = []
+    for file_idx in range(2, program_files.Count()):
+        try:
+            ladder_file = program_files(file_idx)
+            if not ladder_file:
+                continue
+            rung_count = ladder_file.NumberOfRungs()
+            if rung_count > 0:
+                files.append((ladder_file, rung_count))
+        except Exception:
+            continue
+    return files
+
+
+def _clock(seconds):
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+class ExportProgress:
+    """Progress of the running export, written by the worker and read by the GUI"""
+
+    def __init__(self, cancel_event=None):
+        # Any Event-like flag: a multiprocessing.Event in pool workers
+        self.cancel_event = cancel_event if cancel_event is not None else threading.Event()
+        self.reset()
+
+    def reset(self):
+        self.cancel_event.clear()
+        self.started = time.perf_counter()
+        self.rungs_total = 0
+        self.rungs_done = 0
+        self.rungs_started = self.started
+        self.rungs_finished = None
+        # Folder mode: projects, weighted by predicted seconds
+        self.projects_total = 0
+        self.projects_done = 0
+        self.work_total = 0.0
+        self.work_done = 0.0
+        self.current_work = 0.0
+        self._unit_work = False
+        # Folder mode with worker processes: worker -> [work, rungs done, rungs total]
+        self.running = {}
+        self.worker_rungs = 0
+
+    def start_batch(self, predicted_seconds):
+        """Begin a folder batch of projects with these predicted durations"""
+        self.projects_total = len(predicted_seconds)
+        self.work_total = float(sum(predicted_seconds))
+        # Without predictions every project counts the same
+        self._unit_work = not self.work_total
+        if self._unit_work:
+            self.work_total = float(self.projects_total)
+
+    def project_started(self, work):
+        """A batch project is starting; work is its predicted seconds"""
+        self.current_work = 1.0 if self._unit_work else work
+
+    def start_project(self, rungs_total):
+        """Begin fetching a project's rungs"""
+        self.rungs_total = rungs_total
+        self.rungs_done = 0
+        self.rungs_started = time.perf_counter()
+        self.rungs_finished = None
+
+    def rung_done(self):
+        self.rungs_done += 1
+        if self.rungs_done == self.rungs_total:
+            self.rungs_finished = time.perf_counter()
+
+    def project_done(self, work=0.0, worker=None):
+        self.projects_done += 1
+        self.work_done += 1.0 if self._unit_work else work
+        self.current_work = 0.0
+        self.running.pop(worker, None)
+
+    def worker_progress(self, worker, work, rungs_done, rungs_total):
+        """A pool worker has fetched rungs_done of rungs_total rungs of a project with predicted work"""
+        previous = self.running.get(worker)
+        self.worker_rungs += max(0, rungs_done - (previous[1] if previous else 0))
+        self.running[worker] = [1.0 if self._unit_work else work, rungs_done, rungs_total]
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def fraction(self):
+        """Share of the whole export done, 0..1"""
+        rung_fraction = self.rungs_done / self.rungs_total if self.rungs_total else 0.0
+        if self.projects_total:
+            running = sum(work * done / total for work, done, total in self.running.values() if total)
+            return min(1.0, (self.work_done + self.current_work * rung_fraction + running) / self.work_total)
+        return rung_fraction
+
+    def rate(self):
+        """Rungs fetched per second in the current project, or by all pool workers since the batch started"""
+        if self.worker_rungs:
+            return self.worker_rungs / max(time.perf_counter() - self.started, 1e-6)
+        end = self.rungs_finished or time.perf_counter()
+        return self.rungs_done / max(end - self.rungs_started, 1e-6)
+
+    def eta(self):
+        """Seconds left, estimated from the time taken so far; None until there is progress"""
+        fraction = self.fraction()
+        if not 0 < fraction < 1:
+            return None
+        # Batches are timed from the start, single projects from the first rung
+        elapsed = time.perf_counter() - (self.started if self.projects_total else self.rungs_started)
+        return elapsed / fraction * (1 - fraction)
+
+    def snapshot(self):
+        """Plain dict of the progress, for machine-readable output"""
+        eta = self.eta()
+        return {
+            'fraction': round(self.fraction(), 4),
+            'projects_done': self.projects_done,
+            'projects_total': self.projects_total,
+            'rungs_done': self.rungs_done + self.worker_rungs,
+            'rungs_total': self.rungs_total,
+            'rungs_per_sec': round(self.rate(), 1),
+            'eta_seconds': None if eta is None else round(eta, 1),
+            'cancelled': self.cancelled,
+        }
+
+    def status(self):
+        parts = []
+        if self.projects_total:
+            parts.append(f"Project {min(self.projects_done + 1, self.projects_total)}/{self.projects_total}")
+        if self.worker_rungs:
+            parts.append(f"{self.worker_rungs} rungs in {len(self.running)} worker(s), {self.rate():.0f} rungs/s")
+        elif self.rungs_total:
+            parts.append(f"{self.rungs_done}/{self.rungs_total} rungs, {self.rate():.0f} rungs/s")
+        eta = self.eta()
+        if eta is not None:
+            parts.append(f"ETA {_clock(eta)}")
+        if self.cancelled:
+            parts.append("cancelling...")
+        return ", ".join(parts)
+
+
+class ProgressView:
+    """Shows an ExportProgress on a progress bar and label, polled from the Tk main loop"""
+
+    def __init__(self, root, bar, label, progress, interval_ms=POLL_INTERVAL_MS):
+        self.root = root
+        self.bar = bar
+        self.label = label
+        self.progress = progress
+        self.interval_ms = interval_ms
+        self._running = False
+        self.bar.config(mode='determinate', maximum=_BAR_MAXIMUM, value=0)
+
+    def start(self):
+        self._running = True
+        self._poll()
+
+    def stop(self):
+        self._running = False
+        self._update()
+
+    def _poll(self):
+        self._update()
+        if self._running:
+            self.root.after(self.interval_ms, self._poll)
+
+    def _update(self):
+        self.bar.config(value=self.progress.fraction() * _BAR_MAXIMUM)
+        self.label.config(text=self.progress.status())
@@ -0,0 +1,107 @@
+"""
+Cost model and largest-first ordering for folder (batch) exports.
+
+Before a batch starts, every project gets a predicted duration:
+
+    - the last measured duration, if the project file has not changed size;
+    - otherwise rung and data file counts from an earlier run times the
+      learned seconds per rung/data file;
+    - otherwise the file size times the learned seconds per megabyte.
+
+Projects are then run longest-predicted-first, so one huge project does
+not start last and dominate the tail of a parallel batch. After each
+project the measured duration is fed back and both rates are updated as
+moving averages. The model is stored as JSON in the output folder.
+"""
+import json
+import os
+
+
+COST_MODEL_FILE = 'plc5_cost_model.json'
+
+# Starting rates until the first projects have been measured
+DEFAULT_SECONDS_PER_MB = 30.0
+DEFAULT_SECONDS_PER_UNIT = 0.05
+
+# Weight of the newest measurement in the moving-average rates
+_SMOOTHING = 0.3
+
+
+def _blend(old, new):
+    return old + _SMOOTHING * (new - old)
+
+
+class CostModel:
+    """Predicts per-project export durations and learns from measured ones"""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.seconds_per_mb = DEFAULT_SECONDS_PER_MB
+        self.seconds_per_unit = DEFAULT_SECONDS_PER_UNIT
+        self.projects = {}
+
+    @classmethod
+    def load(cls, folder):
+        """Load the model kept in folder, or start a new one there"""
+        model = cls(os.path.join(folder, COST_MODEL_FILE))
+        try:
+            with open(model.path, encoding='utf-8') as f:
+                stored = json.load(f)
+            model.seconds_per_mb = stored.get('seconds_per_mb', model.seconds_per_mb)
+            model.seconds_per_unit = stored.get('seconds_per_unit', model.seconds_per_unit)
+            model.projects = stored.get('projects', {})
+        except (OSError, ValueError):
+            pass
+        return model
+
+    def save(self):
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'seconds_per_mb': self.seconds_per_mb,
+                'seconds_per_unit': self.seconds_per_unit,
+                'projects': self.projects,
+            }, f, indent=2)
+        os.replace(temp_path, self.path)
+
+    @staticmethod
+    def _key(path):
+        return os.path.normcase(os.path.abspath(path))
+
+    def predict(self, path):
+        """Predicted export duration of a project, in seconds"""
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = 0
+        known = self.projects.get(self._key(path))
+        if known:
+            if known.get('size') == size and known.get('seconds'):
+                return known['seconds']
+            if known.get('units'):
+                return known['units'] * self.seconds_per_unit
+        return size / 1e6 * self.seconds_per_mb
+
+    def order(self, paths):
+        """Return [(path, predicted seconds)], longest predicted first"""
+        predicted = [(path, self.predict(path)) for path in paths]
+        predicted.sort(key=lambda item: item[1], reverse=True)
+        return predicted
+
+    def observe(self, path, seconds, rungs=None, data_files=None):
+        """Record a measured duration (and the project's size counts) and update the rates"""
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = 0
+        units = (rungs or 0) + (data_files or 0)
+
+        if size and seconds > 0:
+            self.seconds_per_mb = _blend(self.seconds_per_mb, seconds / (size / 1e6))
+        if units and seconds > 0:
+            self.seconds_per_unit = _blend(self.seconds_per_unit, seconds / units)
+
+        entry = {'size': size, 'seconds': round(seconds, 3)}
+        if units:
+            entry.update(rungs=rungs, data_files=data_files, units=units)
+        self.projects[self._key(path)] = entry
@@ -0,0 +1,39 @@
+"""
+Export settings as the GUIs, plc5_api and the worker pool pass them.
+
+In a GUI every export option is a Tk variable on the exporter. settings()
+snapshots them into a plain dict (picklable, so it can go to plc5_api and
+to worker processes), and an exporter built without Tk gets each option
+back as a read-only Setting with the same get(), so the export code reads
+options the same way in both cases.
+"""
+
+# Settings kept as plain attributes rather than Tk variables
+PLAIN_SETTINGS = ('output_folder', 'lookup_cache_size', 'replay_latency')
+
+
+class Setting:
+    """Read-only stand-in for a Tk variable when the exporter runs without a GUI"""
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+def snapshot(exporter, names):
+    """{name: value} for each setting in names, read from exporter's variables and plain attributes"""
+    return {
+        name: getattr(exporter, name) if name in PLAIN_SETTINGS else getattr(exporter, name).get()
+        for name in names
+    }
+
+
+def apply_settings(exporter, settings, defaults=None):
+    """Give exporter every setting in defaults, then in settings, as Settings or plain attributes"""
+    values = dict(defaults or {})
+    values.update(settings)
+    for name, value in values.items():
+        setattr(exporter, name, value if name in PLAIN_SETTINGS else Setting(value))
@@ -0,0 +1,213 @@
+"""
+One collection pass fanned out to several outputs.
+
+An exporter collects a project once and lays it out as sheets (name,
+headers, rows), the same tables it would write to the workbook, plus
+the raw collected tables for the typed outputs. Sheet rows are spooled
+to temporary files (plc5_xlsx.RowSpool) as they are laid out, and every
+sink reads them back from there, so no sink holds a copy of a sheet.
+Each selected sink then writes from that one collection:
+
+    xlsx     the workbook (plc5_xlsx)
+    csv      one CSV per collected table (plc5_csvstream.CSV_LAYOUTS),
+             or the CSVTables the exporter streamed while collecting, plus
+             one per remaining sheet; gzip/zstd compressed if chosen
+    jsonl    one JSON Lines file per sheet
+    parquet  typed Parquet tables (plc5_parquet), or the ParquetTables
+             the exporter streamed while collecting
+    sqlite   the shared export database (plc5_sqlite)
+
+Sinks run concurrently on threads; most of their time goes to file I/O,
+zip/Parquet compression and sqlite, which release the GIL, so a slow
+sink (usually the workbook) no longer holds up the others.
+"""
+import csv
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from plc5_compress import DEFAULT_LEVEL, open_text
+from plc5_csvstream import CSV_LAYOUTS, CSVTables, csv_path
+from plc5_parquet import TABLES, table_path, write_parquet_tables
+from plc5_sqlite import EXPORT_DB_FILE, write_export_database
+from plc5_xlsx import RowSpool, new_workbook, sheet_values, stream_sheet
+
+
+SINKS = ('xlsx', 'csv', 'jsonl', 'parquet', 'sqlite')
+
+
+class ExportSheets:
+    """Collects the sheets an exporter lays out, in order, for every sink"""
+
+    def __init__(self):
+        self.sheets = []
+        # Spools add_sheet created; RowSpools passed in belong to the caller
+        self._spools = []
+
+    def add_sheet(self, title, headers, rows):
+        """Same interface as StreamingWorkbook.add_sheet; returns the row count"""
+        if not isinstance(rows, RowSpool):
+            rows = RowSpool(rows)
+            self._spools.append(rows)
+        rows.flush()
+        self.sheets.append((title, headers, rows))
+        return len(rows)
+
+    def close(self):
+        """Remove the spool files, once every sink is done"""
+        for spool in self._spools:
+            spool.close()
+        self._spools = []
+
+
+class ExportJob:
+    """Everything the sinks need from one collected project"""
+
+    def __init__(self, output_folder, base_name, timestamp, project_path, sheets, tables, rungs, parquet=None,
+                 csv_tables=None, compression='none', compression_level=DEFAULT_LEVEL):
+        self.output_folder = output_folder
+        self.base_name = base_name
+        self.timestamp = timestamp
+        self.project_path = project_path
+        self.sheets = sheets
+        self.tables = tables
+        self.rungs = rungs
+        # plc5_parquet.ParquetTables already written while collecting, if any
+        self.parquet = parquet
+        # plc5_csvstream.CSVTables likewise, and how CSV output is compressed
+        self.csv_tables = csv_tables
+        self.compression = compression
+        self.compression_level = compression_level
+
+    def path(self, suffix, extension):
+        """Output file for this project: {base}_{suffix}_{timestamp}{extension}"""
+        suffix = suffix.replace(' ', '')
+        return os.path.join(self.output_folder, f"{self.base_name}_{suffix}_{self.timestamp}{extension}")
+
+
+def _rows(headers, rows):
+    for row in rows:
+        yield sheet_values(headers, row)
+
+
+def write_xlsx(job, log):
+    workbook = new_workbook()
+    for title, headers, rows in job.sheets.sheets:
+        stream_sheet(workbook, title, headers, rows)
+    excel_file = job.path('Export', '.xlsx')
+    workbook.save(excel_file)
+    log(f"  Workbook saved: {os.path.basename(excel_file)}")
+    return [excel_file]
+
+
+def write_csv(job, log):
+    tables = job.csv_tables
+    if tables is None:
+        tables = CSVTables(job.output_folder, job.base_name, job.timestamp,
+                           compression=job.compression, level=job.compression_level)
+        try:
+            for table in CSV_LAYOUTS:
+                rows = job.tables.get(table)
+                if not rows:
+                    continue
+                if isinstance(rows, dict):
+                    rows = rows.values()
+                for row in rows:
+                    tables.append(table, row)
+        except Exception:
+            tables.close()
+            raise
+    paths = tables.close(log)
+
+    # Sheets with no table layout (configuration, stats) are written as laid out
+    laid_out = {suffix for suffix, _, _ in CSV_LAYOUTS.values()}
+    for title, headers, rows in job.sheets.sheets:
+        if title in laid_out:
+            continue
+        csv_file = csv_path(job.output_folder, job.base_name, title, job.timestamp, job.compression)
+        with open_text(csv_file, job.compression, job.compression_level) as f:
+            writer = csv.writer(f)
+            writer.writerow(headers)
+            writer.writerows(_rows(headers, rows))
+        paths.append(csv_file)
+    log(f"  Wrote {len(paths)} CSV files")
+    return paths
+
+
+def write_jsonl(job, log):
+    paths = []
+    for title, headers, rows in job.sheets.sheets:
+        jsonl_file = job.path(title, '.jsonl')
+        with open(jsonl_file, 'w', encoding='utf-8') as f:
+            for values in _rows(headers, rows):
+                f.write(json.dumps(dict(zip(headers, values)), default=str))
+                f.write('\n')
+        paths.append(jsonl_file)
+    log(f"  Wrote {len(paths)} JSON Lines files")
+    return paths
+
+
+def write_parquet(job, log):
+    if job.parquet is not None:
+        return job.parquet.close(log)
+    write_parquet_tables(job.tables, job.output_folder, job.base_name, job.timestamp, log)
+    return [
+        table_path(job.output_folder, job.base_name, table, job.timestamp)
+        for table in TABLES if job.tables.get(table)
+    ]
+
+
+def write_sqlite(job, log):
+    write_export_database(job.tables, job.rungs, job.output_folder, job.project_path, log)
+    return [os.path.join(job.output_folder, EXPORT_DB_FILE)]
+
+
+def primary_output(outputs):
+    """The main output file: the workbook if one was written, else the first file written"""
+    if outputs.get('xlsx'):
+        return outputs['xlsx'][0]
+    for paths in outputs.values():
+        if paths:
+            return paths[0]
+    return None
+
+
+_WRITERS = {
+    'xlsx': write_xlsx,
+    'csv': write_csv,
+    'jsonl': write_jsonl,
+    'parquet': write_parquet,
+    'sqlite': write_sqlite,
+}
+
+
+def write_outputs(job, sinks, log):
+    """
+    Write job to every sink in sinks, concurrently. Returns {sink: [paths]}.
+    Every sink is allowed to finish; if any failed, the first error is
+    raised afterwards.
+    """
+    if not sinks:
+        raise RuntimeError("No outputs selected")
+
+    lock = threading.Lock()
+
+    def locked_log(message):
+        # One line at a time from the sink threads
+        with lock:
+            log(message)
+
+    outputs = {}
+    errors = []
+    with ThreadPoolExecutor(max_workers=len(sinks)) as executor:
+        futures = {sink: executor.submit(_WRITERS[sink], job, locked_log) for sink in sinks}
+        for sink, future in futures.items():
+            try:
+                outputs[sink] = future.result()
+            except Exception as exc:
+                locked_log(f"  ERROR writing {sink} output: {exc}")
+                errors.append(exc)
+    if errors:
+        raise errors[0]
+    return outputs
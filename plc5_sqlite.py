@@ -0,0 +1,171 @@
+"""
+SQLite export database for plant-wide queries.
+
+Every project export can be added to one database in the output folder,
+so questions across a whole archive ("which PLCs use symbol X", "every
+MSG to node 12") are a single query instead of opening hundreds of
+workbooks. The database has a projects table, a program_files table and
+one table per exported table (tags, io, timers, counters, controls,
+messages, rungs, datatable) with the same typed columns as the Parquet
+output, each row keyed by project_id. Address, Symbol and RemoteNode are
+indexed.
+
+Each project is written with bulk executemany inserts inside a single
+transaction. Exporting a project again replaces its earlier rows, and
+several exporters (or folder export workers) can append to the same
+database; writers wait for each other's transactions.
+"""
+import os
+import sqlite3
+from datetime import datetime
+
+from plc5_parquet import TABLES
+
+
+EXPORT_DB_FILE = 'plc5_export.db'
+
+# How long a writer waits for another process's transaction, in seconds
+_BUSY_TIMEOUT = 60.0
+
+_SQL_TYPES = {'int32': 'INTEGER', 'float64': 'REAL', 'string': 'TEXT', 'dictionary': 'TEXT'}
+
+_INDEXED_COLUMNS = ('Address', 'Symbol', 'RemoteNode')
+
+_PROGRAM_FILE_COLUMNS = [('File_Number', 'INTEGER'), ('File_Name', 'TEXT'), ('Rungs', 'INTEGER')]
+
+
+def _schema():
+    statements = [
+        'CREATE TABLE IF NOT EXISTS projects ('
+        'id INTEGER PRIMARY KEY, path TEXT UNIQUE NOT NULL, name TEXT, '
+        'exported_at TEXT, size INTEGER, mtime REAL)'
+    ]
+    tables = {'program_files': _PROGRAM_FILE_COLUMNS}
+    for table, columns in TABLES.items():
+        tables[table] = [(name, _SQL_TYPES[type_name]) for name, type_name, _ in columns]
+
+    for table, columns in tables.items():
+        column_sql = ', '.join(f'"{name}" {sql_type}' for name, sql_type in columns)
+        statements.append(
+            f'CREATE TABLE IF NOT EXISTS {table} ('
+            f'project_id INTEGER NOT NULL REFERENCES projects(id), {column_sql})'
+        )
+        statements.append(f'CREATE INDEX IF NOT EXISTS ix_{table}_project ON {table}(project_id)')
+        for name, _ in columns:
+            if name in _INDEXED_COLUMNS:
+                statements.append(f'CREATE INDEX IF NOT EXISTS ix_{table}_{name} ON {table}("{name}")')
+    return statements
+
+
+def program_file_rows(rungs):
+    """Program files (with their rung counts) from collected rung records"""
+    files = {}
+    for rung in rungs:
+        key = (rung['File_Number'], rung['File_Name'])
+        files[key] = files.get(key, 0) + 1
+    return [(number, name, count) for (number, name), count in files.items()]
+
+
+class ExportDatabase:
+    """One SQLite database holding the exports of many projects"""
+
+    def __init__(self, path):
+        self.path = path
+        self.project_id = None
+        # Transactions are managed explicitly: one per project. The
+        # database is opened, written and closed by the sqlite sink's
+        # thread once a project is collected (write_export_database)
+        self.connection = sqlite3.connect(path, timeout=_BUSY_TIMEOUT, isolation_level=None)
+        self.connection.execute('BEGIN IMMEDIATE')
+        try:
+            for statement in _schema():
+                self.connection.execute(statement)
+            self.connection.execute('COMMIT')
+        except Exception:
+            self.connection.execute('ROLLBACK')
+            raise
+
+    @classmethod
+    def open_in(cls, folder):
+        return cls(os.path.join(folder, EXPORT_DB_FILE))
+
+    def begin_project(self, project_path):
+        """Start the transaction for a project, replacing any earlier export of it"""
+        path = os.path.abspath(project_path)
+        stat = os.stat(project_path)
+        self.connection.execute('BEGIN IMMEDIATE')
+        row = self.connection.execute('SELECT id FROM projects WHERE path = ?', (path,)).fetchone()
+        if row:
+            self.project_id = row[0]
+            for table in ['program_files'] + list(TABLES):
+                self.connection.execute(f'DELETE FROM {table} WHERE project_id = ?', (self.project_id,))
+            self.connection.execute(
+                'UPDATE projects SET exported_at = ?, size = ?, mtime = ? WHERE id = ?',
+                (datetime.now().isoformat(timespec='seconds'), stat.st_size, stat.st_mtime, self.project_id)
+            )
+        else:
+            cursor = self.connection.execute(
+                'INSERT INTO projects (path, name, exported_at, size, mtime) VALUES (?, ?, ?, ?, ?)',
+                (path, os.path.splitext(os.path.basename(path))[0],
+                 datetime.now().isoformat(timespec='seconds'), stat.st_size, stat.st_mtime)
+            )
+            self.project_id = cursor.lastrowid
+
+    def insert(self, table, rows):
+        """Bulk insert rows (dicts, or a dict of them) into table; returns the row count"""
+        if isinstance(rows, dict):
+            rows = rows.values()
+        columns = TABLES[table]
+        names = ', '.join(f'"{name}"' for name, _, _ in columns)
+        placeholders = ', '.join('?' * (len(columns) + 1))
+        project_id = self.project_id
+        cursor = self.connection.executemany(
+            f'INSERT INTO {table} (project_id, {names}) VALUES ({placeholders})',
+            ([project_id] + [get(row) for _, _, get in columns] for row in rows)
+        )
+        return cursor.rowcount
+
+    def insert_program_files(self, rows):
+        """Insert (file number, name, rung count) rows"""
+        self.connection.executemany(
+            'INSERT INTO program_files (project_id, "File_Number", "File_Name", "Rungs") VALUES (?, ?, ?, ?)',
+            ((self.project_id,) + row for row in rows)
+        )
+        return len(rows)
+
+    def commit(self):
+        self.connection.execute('COMMIT')
+        self.project_id = None
+
+    def rollback(self):
+        if self.connection.in_transaction:
+            self.connection.execute('ROLLBACK')
+        self.project_id = None
+
+    def write_project(self, project_path, data, rungs):
+        """Replace a project's rows with the tables in data, in one transaction"""
+        self.begin_project(project_path)
+        try:
+            counts = {'program_files': self.insert_program_files(program_file_rows(rungs))}
+            for table in TABLES:
+                if data.get(table):
+                    counts[table] = self.insert(table, data[table])
+            self.commit()
+        except Exception:
+            self.rollback()
+            raise
+        return counts
+
+    def close(self):
+        self.rollback()
+        self.connection.close()
+
+
+def write_export_database(data, rungs, output_folder, project_path, log):
+    """Add one project's collected tables (as built by the exporters) to the folder's database"""
+    database = ExportDatabase.open_in(output_folder)
+    try:
+        counts = database.write_project(project_path, data, rungs)
+    finally:
+        database.close()
+    log(f"  Wrote {sum(counts.values())} rows to {os.path.basename(database.path)}")
@@ -0,0 +1,140 @@
+"""
+COM call instrumentation for the PLC-5 exporters.
+
+RunStats is a ComProxy hook (see plc5_backend). It groups every attribute
+read and call made on the project by member name, so all
+'project.ProgramFiles(2).GetRungAsAscii(0)', '...(1)', ... calls are
+reported together as 'GetRungAsAscii()', and keeps a count, error count,
+total time and a log-scale latency histogram for each. The summary is
+written as a "Run Stats" sheet and as a JSON sidecar next to the export.
+The rung pipeline's per-stage throughput and queue depths (see
+plc5_pipeline) are added with add_stages and reported alongside.
+"""
+import json
+import math
+import re
+import time
+
+
+RUN_STATS_HEADERS = [
+    'Member', 'Calls', 'Errors', 'Total_s', 'Mean_ms', 'P50_ms', 'P90_ms', 'P99_ms', 'Max_ms',
+]
+
+# Histogram resolution: buckets per doubling of latency, starting at 1 us
+_BUCKETS_PER_OCTAVE = 4
+
+_STRING_ARG = re.compile(r'"(?:[^"\\]|\\.)*"')
+_ARGS = re.compile(r'\([^()]*\)')
+
+
+def member_name(key):
+    """Reduce an access path such as 'project.DataFiles.GetDataValue("N7:0")' to 'GetDataValue()'"""
+    key = _ARGS.sub('()', _STRING_ARG.sub('', key))
+    return key.rsplit('.', 1)[-1]
+
+
+class LatencyHistogram:
+    """Fixed-size log-scale histogram, so memory stays flat however many calls are made"""
+    __slots__ = ('buckets', 'count', 'total', 'max')
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, elapsed):
+        micros = elapsed * 1e6
+        bucket = int(math.log2(micros) * _BUCKETS_PER_OCTAVE) + 1 if micros > 1 else 0
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+
+    def percentile(self, fraction):
+        """Upper bound (seconds) of the bucket holding the given fraction of calls"""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                upper = 2 ** (bucket / _BUCKETS_PER_OCTAVE) / 1e6
+                return min(upper, self.max)
+        return self.max
+
+
+class RunStats:
+    """Per-member call counts and latencies for one project export"""
+
+    def __init__(self, source):
+        self.source = source
+        self.members = {}
+        self.errors = {}
+        self.stages = []
+        self.started = time.time()
+
+    def hook(self, key, elapsed, result, exc):
+        name = member_name(key)
+        histogram = self.members.get(name)
+        if histogram is None:
+            histogram = self.members[name] = LatencyHistogram()
+        histogram.add(elapsed)
+        if exc is not None:
+            self.errors[name] = self.errors.get(name, 0) + 1
+
+    @property
+    def total_calls(self):
+        return sum(h.count for h in self.members.values())
+
+    @property
+    def total_time(self):
+        return sum(h.total for h in self.members.values())
+
+    def rows(self):
+        """Summary rows for the Run Stats sheet, slowest members first"""
+        rows = []
+        for name, histogram in sorted(self.members.items(), key=lambda item: -item[1].total):
+            rows.append({
+                'Member': name,
+                'Calls': histogram.count,
+                'Errors': self.errors.get(name, 0),
+                'Total_s': round(histogram.total, 3),
+                'Mean_ms': round(histogram.total / histogram.count * 1000, 3),
+                'P50_ms': round(histogram.percentile(0.50) * 1000, 3),
+                'P90_ms': round(histogram.percentile(0.90) * 1000, 3),
+                'P99_ms': round(histogram.percentile(0.99) * 1000, 3),
+                'Max_ms': round(histogram.max * 1000, 3),
+            })
+        return rows
+
+    def add_stages(self, pipeline):
+        """Keep a finished RungPipeline's stage rows"""
+        self.stages.extend(pipeline.stage_rows())
+
+    def summary(self):
+        """One-line report for the export log"""
+        slowest = max(self.members.items(), key=lambda item: item[1].total, default=None)
+        text = f"COM calls: {self.total_calls} in {self.total_time:.1f}s"
+        if slowest:
+            text += f", most time in {slowest[0]} ({slowest[1].total:.1f}s)"
+        busiest = max(self.stages, key=lambda row: row['Busy_pct'], default=None)
+        if busiest:
+            text += f", busiest stage {busiest['Stage']} ({busiest['Busy_pct']}% busy)"
+        return text
+
+    def save(self, path):
+        """Write the summary as a JSON sidecar"""
+        report = {
+            'source': self.source,
+            'started': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started)),
+            'wall_s': round(time.time() - self.started, 3),
+            'total_calls': self.total_calls,
+            'total_s': round(self.total_time, 3),
+            'members': self.rows(),
+            'stages': self.stages,
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
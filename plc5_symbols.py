@@ -0,0 +1,265 @@
+"""
+Address/symbol database helpers shared by the PLC-5 exporters.
+"""
+import re
+import time
+from collections import OrderedDict
+
+from plc5_address import parse_address, value_word
+from plc5_apartment import apartment_of
+
+
+_ADDRESS_NUMBER = re.compile(r'\d+')
+
+# Cached in place of a word value that could not be read
+_UNREADABLE = object()
+
+
+def normalize_address(addr):
+    """Normalize an address so that e.g. 'i:012/07', 'I:12/7' and '#I:012/07' share one key"""
+    addr = str(addr).strip().upper().lstrip('#')
+    return _ADDRESS_NUMBER.sub(lambda m: str(int(m.group())), addr)
+
+
+def normalize_symbol(symbol):
+    """Symbols are case-insensitive in RSLogix 5"""
+    return str(symbol).strip().upper()
+
+
+class SymbolRecord:
+    """Plain copy of an AddrSymRecord, exposing the same properties as the COM object"""
+    __slots__ = ('Address', 'Symbol', 'Description')
+
+    def __init__(self, address, symbol, description):
+        self.Address = address
+        self.Symbol = symbol
+        self.Description = description
+
+
+class SymbolIndex:
+    """
+    In-memory snapshot of project.AddrSymRecords.
+
+    The records are enumerated once with Item(i) and indexed by normalized
+    address and by symbol. The index exposes Count(), Item() and
+    GetRecordViaAddrOrSym() so it can be passed anywhere the COM collection
+    is used, without a cross-process round trip per lookup.
+    """
+
+    def __init__(self):
+        self.records = []
+        self._by_address = {}
+        self._by_symbol = {}
+
+    @classmethod
+    def from_records(cls, addr_sym_records):
+        """Build an index by enumerating a COM AddrSymRecords collection"""
+        apartment = apartment_of(addr_sym_records)
+        if apartment is not None and not apartment.current:
+            # One request to the COM apartment instead of several per record
+            return apartment.call(cls.from_records, addr_sym_records)
+        index = cls()
+        try:
+            record_count = addr_sym_records.Count()
+        except TypeError:
+            # Count might be property, not method
+            record_count = addr_sym_records.Count
+
+        for i in range(record_count):
+            try:
+                record = addr_sym_records.Item(i)
+                if record:
+                    index.add(record.Address, record.Symbol, record.Description)
+            except Exception:
+                # Skip records with inaccessible properties
+                continue
+        return index
+
+    def add(self, address, symbol, description):
+        if not address:
+            return
+        record = SymbolRecord(address, symbol or "", description or "")
+        self.records.append(record)
+        self._by_address.setdefault(normalize_address(address), record)
+        if record.Symbol:
+            self._by_symbol.setdefault(normalize_symbol(record.Symbol), record)
+
+    def lookup(self, addr_or_sym):
+        """Return the SymbolRecord for an address or symbol, or None"""
+        if not addr_or_sym:
+            return None
+        record = self._by_address.get(normalize_address(addr_or_sym))
+        if record is None:
+            record = self._by_symbol.get(normalize_symbol(addr_or_sym))
+        return record
+
+    def __len__(self):
+        return len(self.records)
+
+    # COM-compatible surface (mirrors project.AddrSymRecords)
+    def Count(self):
+        return len(self.records)
+
+    def Item(self, i):
+        return self.records[i]
+
+    def GetRecordViaAddrOrSym(self, addr_or_sym, _flags=0):
+        return self.lookup(addr_or_sym)
+
+
+class LookupResolver:
+    """
+    Memoizes symbol/description and data value lookups for one project export.
+
+    Every extract_* method resolves through the same resolver, so an address
+    seen by several extractors (or in several rungs) costs one COM call.
+    max_entries bounds each cache as an LRU; None keeps every result.
+    prefetch() resolves many addresses in one COM apartment request; they
+    are counted as misses when first looked up.
+
+    Values are read a word at a time: B3:0/0 .. B3:0/15 cost one read of
+    B3:0, and the status bits of a timer, counter or control element (/EN,
+    /DN, ...) one read of its status word; each bit is taken from the word
+    locally. .PRE/.ACC/.LEN/.POS are one word each. When a word cannot be
+    read, its addresses are read one by one as before.
+    """
+
+    def __init__(self, addr_sym_records, datafiles, max_entries=None):
+        self.addr_sym_records = addr_sym_records
+        self.datafiles = datafiles
+        self.max_entries = max_entries
+        self._symbols = OrderedDict()
+        self._values = OrderedDict()
+        self._words = OrderedDict()
+        # Prefetched keys not looked up yet
+        self._prefetched_symbols = set()
+        self._prefetched_values = set()
+        self.hits = 0
+        self.misses = 0
+        # Misses served from a word already read, without a COM call
+        self.derived = 0
+        self.miss_time = 0.0
+
+    def symbol_desc(self, addr):
+        """Return (symbol, description) for an address or symbol"""
+        return self._cached(self._symbols, self._prefetched_symbols, addr, self._fetch_symbol_desc)
+
+    def value(self, addr):
+        """Return the current data value of an address, or '' if unreadable"""
+        return self._cached(self._values, self._prefetched_values, addr, self._fetch_value)
+
+    def prefetch(self, addresses, symbol_addresses=()):
+        """
+        Resolve the symbol/description and value of every address not cached
+        yet, and the symbol/description of each of symbol_addresses (MSG
+        control blocks, whose value is never read), with one request to the
+        project's COM apartment. Does nothing for in-process projects, where
+        each lookup is already cheap.
+        """
+        apartment = apartment_of(self.datafiles)
+        if apartment is None:
+            return
+        addresses = list(dict.fromkeys(addresses))
+        symbols = [addr for addr in dict.fromkeys(addresses + list(symbol_addresses)) if addr not in self._symbols]
+        values = [addr for addr in addresses if addr not in self._values]
+        if not symbols and not values:
+            return
+
+        start = time.perf_counter()
+        symbol_results, value_results = apartment.call(self._fetch_many, symbols, values)
+        self.miss_time += time.perf_counter() - start
+
+        for addr, result in zip(symbols, symbol_results):
+            self._store(self._symbols, addr, result)
+            self._prefetched_symbols.add(addr)
+        for addr, result in zip(values, value_results):
+            self._store(self._values, addr, result)
+            self._prefetched_values.add(addr)
+
+    def _cached(self, cache, prefetched, key, fetch):
+        if key in cache:
+            if key in prefetched:
+                prefetched.discard(key)
+                self.misses += 1
+            else:
+                self.hits += 1
+            if self.max_entries:
+                cache.move_to_end(key)
+            return cache[key]
+
+        start = time.perf_counter()
+        result = fetch(key)
+        self.miss_time += time.perf_counter() - start
+        self.misses += 1
+        prefetched.discard(key)
+        self._store(cache, key, result)
+        return result
+
+    def _store(self, cache, key, result):
+        cache[key] = result
+        if self.max_entries and len(cache) > self.max_entries:
+            cache.popitem(last=False)
+
+    def _fetch_many(self, symbols, values):
+        return [self._fetch_symbol_desc(addr) for addr in symbols], [self._fetch_value(addr) for addr in values]
+
+    def _fetch_symbol_desc(self, addr):
+        try:
+            record = self.addr_sym_records.GetRecordViaAddrOrSym(addr, 0)
+            if record:
+                return (
+                    record.Symbol or "",
+                    (record.Description or "").replace('\r\n', ' | ')
+                )
+        except Exception:
+            pass
+        return "", ""
+
+    def _fetch_value(self, addr):
+        address = parse_address(addr)
+        word = value_word(address) if address is not None else None
+        if word is None:
+            return self._read_value(addr)
+
+        word_addr, bit = word
+        if word_addr in self._words:
+            self.derived += 1
+            if self.max_entries:
+                self._words.move_to_end(word_addr)
+            word_value = self._words[word_addr]
+        else:
+            try:
+                word_value = self.datafiles.GetDataValue(word_addr)
+            except Exception:
+                word_value = _UNREADABLE
+            self._store(self._words, word_addr, word_value)
+
+        if word_value is _UNREADABLE:
+            return self._read_value(addr)
+        if bit is None:
+            return word_value
+        try:
+            bit_value = (int(word_value) >> bit) & 1
+        except (TypeError, ValueError):
+            return self._read_value(addr)
+        # Match the type GetDataValue returns for the word
+        return str(bit_value) if isinstance(word_value, str) else bit_value
+
+    def _read_value(self, addr):
+        try:
+            return self.datafiles.GetDataValue(addr)
+        except Exception:
+            return ""
+
+    def summary(self):
+        """One-line hit/miss report for the export log"""
+        lookups = self.hits + self.misses
+        hit_rate = self.hits / lookups if lookups else 0.0
+        reads = self.misses - self.derived
+        avg_miss = self.miss_time / reads if reads else 0.0
+        saved = (self.hits + self.derived) * avg_miss
+        return (
+            f"Lookup cache: {self.hits} hits, {self.misses} misses "
+            f"({hit_rate:.0%} hit rate, {self.derived} taken from words already read), "
+            f"{self.miss_time:.1f}s in lookups, ~{saved:.1f}s saved"
+        )
@@ -0,0 +1,172 @@
+"""
+Single-pass tokenizer for RSLogix 5 rung ASCII.
+
+A rung such as
+
+    SOR BST XIC I:000/00 NXB XIC B3:0/5 BND TON T4:0 1.0 100 0 EOR
+
+is walked once, character by character, and turned into a list of
+Instruction(mnemonic, operands) tuples. The number of operands each
+mnemonic takes comes from OPERAND_ARITY, so an operand is never mistaken
+for the start of the next instruction, and a known mnemonic is never taken
+as an operand. Quoted operands (CPT/FAL expressions) are kept as a single
+token; an unquoted expression runs up to the next mnemonic that is not an
+expression operator and is kept as one operand.
+"""
+import re
+from collections import namedtuple
+
+from plc5_address import STATUS_BITS, STRUCTURE_WORDS, normalize_address
+
+
+Instruction = namedtuple('Instruction', ['mnemonic', 'operands'])
+
+_MEMBERS = '|'.join(sorted({member for members in STRUCTURE_WORDS.values() for member in members}))
+_STATUS_BITS = '|'.join(sorted({name for names in STATUS_BITS.values() for name in names}))
+
+# PLC-5 data table addresses, e.g. I:012/07, B3:0/5, N7:10, T4:0, plus
+# structure members (T4:0.ACC, R6:0.POS), status bits (T4:0/DN, T4:0.DN)
+# and bit-file addresses (B3/21)
+ADDRESS_PATTERN = re.compile(
+    r'\b([IONBFLTCRS]:\d+(?:/\d+)?'
+    rf'|[BNTCR]\d+:\d+(?:\.(?:{_MEMBERS}|{_STATUS_BITS})|/(?:\d+|{_STATUS_BITS}))?'
+    r'|B\d+/\d+)\b'
+)
+
+TIMER_INSTRUCTIONS = frozenset(['TON', 'TOF', 'RTO'])
+COUNTER_INSTRUCTIONS = frozenset(['CTU', 'CTD'])
+CONTROL_INSTRUCTIONS = frozenset(['FAL', 'FSC', 'FFL', 'FFU', 'COP', 'DDT', 'FBC'])
+
+# Operand count per mnemonic. None means variable: operands run up to the
+# next known mnemonic (MSG, JSR/SBR/RET parameter lists, PID, ...).
+OPERAND_ARITY = {
+    # Rung and branch structure
+    'SOR': 0, 'EOR': 0, 'BST': 0, 'NXB': 0, 'BND': 0,
+    # Bit
+    'XIC': 1, 'XIO': 1, 'OTE': 1, 'OTL': 1, 'OTU': 1, 'ONS': 1,
+    # Storage bit, output bit number, output word
+    'OSR': 3, 'OSF': 3,
+    # Timer and counter
+    'TON': 4, 'TOF': 4, 'RTO': 4, 'CTU': 3, 'CTD': 3, 'RES': 1,
+    # Compare
+    'EQU': 2, 'NEQ': 2, 'LES': 2, 'LEQ': 2, 'GRT': 2, 'GEQ': 2,
+    'LIM': 3, 'MEQ': 3, 'CMP': 1,
+    # Compute and math
+    'CPT': 2, 'ADD': 3, 'SUB': 3, 'MUL': 3, 'DIV': 3, 'XPY': 3,
+    'NEG': 2, 'SQR': 2, 'ABS': 2, 'ACS': 2, 'ASN': 2, 'ATN': 2,
+    'COS': 2, 'SIN': 2, 'TAN': 2, 'LN': 2, 'LOG': 2, 'DEG': 2, 'RAD': 2,
+    'TOD': 2, 'FRD': 2,
+    # Logical and move
+    'AND': 3, 'OR': 3, 'XOR': 3, 'NOT': 2, 'MOV': 2, 'MVM': 3, 'CLR': 1,
+    'BTD': 5,
+    # File, shift and sequencer
+    'FAL': 6, 'FSC': 5, 'COP': 3, 'FLL': 3,
+    'BSL': 4, 'BSR': 4, 'FFL': 5, 'FFU': 5, 'LFL': 5, 'LFU': 5,
+    'SQO': 6, 'SQI': 6, 'SQL': 5,
+    'AVE': 5, 'STD': 5, 'SRT': 4,
+    'DDT': 9, 'FBC': 9,
+    # Program control
+    'JMP': 1, 'LBL': 1, 'MCR': 0, 'AFI': 0, 'TND': 0, 'EOT': 0,
+    'FOR': 5, 'NXT': 1, 'BRK': 0, 'UID': 0, 'UIE': 0,
+    'JSR': None, 'SBR': None, 'RET': None,
+    'IIN': 1, 'IOT': 1, 'IDI': None, 'IDO': None,
+    # Communications and process control
+    'MSG': None, 'BTR': 7, 'BTW': 7, 'PID': None,
+}
+
+# Index of the expression operand of the instructions that take one
+EXPRESSION_OPERAND = {'CPT': 1, 'CMP': 0, 'FAL': 5, 'FSC': 4}
+
+# Operators and functions that may appear in a CPT/CMP/FAL/FSC expression.
+# They are also mnemonics, but inside an expression they are read as part of it
+EXPRESSION_WORDS = frozenset([
+    'AND', 'OR', 'XOR', 'NOT', 'SQR', 'NEG', 'ABS', 'LN', 'LOG', 'SIN', 'COS', 'TAN',
+    'ASN', 'ACS', 'ATN', 'DEG', 'RAD', 'FRD', 'TOD',
+])
+
+
+def _split_tokens(rung):
+    """Split rung ASCII on whitespace, keeping quoted expressions together"""
+    tokens = []
+    length = len(rung)
+    i = 0
+    while i < length:
+        ch = rung[i]
+        if ch.isspace():
+            i += 1
+            continue
+        start = i
+        if ch == '"':
+            end = rung.find('"', i + 1)
+            i = length if end == -1 else end + 1
+        else:
+            while i < length and not rung[i].isspace():
+                i += 1
+        tokens.append(rung[start:i])
+    return tokens
+
+
+def tokenize_rung(rung):
+    """Return the rung's instructions as a list of Instruction tuples"""
+    instructions = []
+    operands = None
+    remaining = 0
+
+    expression = False
+
+    for token in _split_tokens(rung):
+        mnemonic = token.upper()
+        arity = OPERAND_ARITY.get(mnemonic, -1)
+        in_expression = arity == -1 or mnemonic in EXPRESSION_WORDS
+
+        if expression:
+            if in_expression:
+                operands[-1] = f"{operands[-1]} {token}"
+                continue
+            expression = False
+
+        if remaining:
+            if len(operands) == EXPRESSION_OPERAND.get(instructions[-1].mnemonic):
+                if in_expression:
+                    operands.append(token)
+                    remaining -= 1
+                    expression = True
+                    continue
+            elif arity == -1:
+                operands.append(token)
+                remaining -= 1
+                continue
+            # A known mnemonic starts the next instruction even if this one
+            # is short of operands
+
+        if arity == -1 and operands is not None and (remaining is None or not token.isalpha()):
+            # Operand of a variable-length instruction, or a trailing operand
+            # the arity table did not expect
+            operands.append(token)
+            continue
+
+        operands = []
+        instructions.append(Instruction(mnemonic, operands))
+        # Unknown mnemonics are treated as variable length
+        remaining = None if arity == -1 else arity
+
+    return instructions
+
+
+def find_message_blocks(instructions):
+    """Yield the control block of every MSG instruction (e.g. MG9:0), in rung order"""
+    for instruction in instructions:
+        if instruction.mnemonic == 'MSG' and instruction.operands:
+            yield instruction.operands[0]
+
+
+def find_addresses(instructions):
+    """
+    Yield every data table address referenced by the instructions, in rung
+    order, normalized so B3/21 and B3:1/5 (or T4:0.DN and T4:0/DN) are one
+    address
+    """
+    for instruction in instructions:
+        for operand in instruction.operands:
+            for address in ADDRESS_PATTERN.findall(operand):
+                yield normalize_address(address)
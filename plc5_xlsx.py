@@ -0,0 +1,438 @@
+"""
+Streaming xlsx sheet writer shared by the Excel exporters.
+
+Sheets are written through openpyxl write-only worksheets, so no cell
+objects are kept once a row is written. Column widths are computed from
+the values as each row passes through. A sheet's <cols> element comes
+before its rows in the xlsx XML, so rows are spooled to a temporary file
+while the widths are gathered and then streamed into the sheet; peak
+memory does not grow with the number of rows.
+
+Sheets of RAW_XML_MIN_ROWS rows or more (typically Rungs and DataTable)
+skip openpyxl's per-cell objects entirely: their rows are rendered
+straight to sheet XML with inline strings, and StreamingWorkbook.save
+splices that XML into the saved package in place of an empty placeholder
+sheet.
+
+StreamingWorkbook renders its sheets when it is saved. Until then each
+sheet's rows wait in a RowSpool, a temporary file of pickled rows, so
+queued sheets hold no rows in memory; a RowSpool passed in (the rungs or
+data table an exporter already spooled) is read as it is. When the
+workbook holds PARALLEL_SAVE_MIN_ROWS rows or more, every sheet's XML
+part is rendered in its own worker process, which reads the rows from
+the spool file, so the save takes about as long as the largest sheet
+rather than the sum of all of them; openpyxl then only writes the
+package around them.
+"""
+import math
+import multiprocessing
+import os
+import pickle
+import re
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+import zipfile
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
+
+
+DESCRIPTION_COLUMNS = ['Desc1', 'Desc2', 'Desc3', 'Desc4', 'Desc5']
+MAX_COLUMN_WIDTH = 50
+
+# Sheets with at least this many rows are written as raw XML
+RAW_XML_MIN_ROWS = 20000
+
+# Workbooks with at least this many rows in total render their sheets in parallel
+PARALLEL_SAVE_MIN_ROWS = 50000
+
+_MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_DOC_REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_PKG_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+# Control characters are not allowed in XML 1.0 text
+_ILLEGAL_XML_CHARS = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+# Rendered rows are written to the spool in chunks of this many
+_RAW_CHUNK_ROWS = 1000
+
+# RowSpool pickles rows in chunks of this many
+_SPOOL_CHUNK_ROWS = 1000
+
+# Descriptions are split on pipe, comma or semicolon
+_DESCRIPTION_SEPARATORS = re.compile(r'\||,|;')
+
+
+class RowSpool:
+    """
+    Rows pickled to a temporary file as they are appended and read back
+    (by any number of readers, once appending is done) in the same order.
+    The file is removed by close().
+    """
+
+    def __init__(self, rows=()):
+        fd, self.path = tempfile.mkstemp(prefix='plc5_rows_', suffix='.pickle')
+        self._file = os.fdopen(fd, 'wb')
+        self._chunk = []
+        # Readers on several threads (the sinks) each flush before reading
+        self._lock = threading.Lock()
+        self.count = 0
+        self.extend(rows)
+
+    def append(self, row):
+        self._chunk.append(row)
+        self.count += 1
+        if len(self._chunk) >= _SPOOL_CHUNK_ROWS:
+            self._write_chunk()
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    def _write_chunk(self):
+        pickle.dump(self._chunk, self._file, pickle.HIGHEST_PROTOCOL)
+        self._chunk = []
+
+    def flush(self):
+        with self._lock:
+            if self._chunk:
+                self._write_chunk()
+            self._file.flush()
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        self.flush()
+        return iter_spool(self.path)
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._file.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+def iter_spool(path):
+    """Yield the rows of a RowSpool file (e.g. in another process)"""
+    with open(path, 'rb') as f:
+        while True:
+            try:
+                chunk = pickle.load(f)
+            except EOFError:
+                return
+            yield from chunk
+
+
+class StreamingWorkbook(Workbook):
+    """
+    Write-only workbook whose sheets are rendered when it is saved: through
+    openpyxl or as raw XML depending on size, and in parallel worker
+    processes when the workbook is large enough to pay for starting them.
+    """
+
+    def __init__(self, parallel=True):
+        super().__init__(write_only=True)
+        self.parallel = parallel
+        self._pending = []
+        # Spools add_sheet created; the others belong to the caller
+        self._spools = []
+
+    def add_sheet(self, title, headers, rows):
+        """Queue a sheet for save(), spooling its rows; returns its row count"""
+        if not isinstance(rows, RowSpool):
+            rows = RowSpool(rows)
+            self._spools.append(rows)
+        # Create the (empty) sheet now so sheets keep the order they were added in
+        ws = self.create_sheet(title=title)
+        self._pending.append((ws, headers, rows))
+        return len(rows)
+
+    def _parallel_save(self, pending):
+        if not self.parallel or len(pending) < 2 or (os.cpu_count() or 1) < 2:
+            return False
+        # Pool workers (plc5_pool) are daemonic and cannot start processes of their own
+        if multiprocessing.current_process().daemon:
+            return False
+        return sum(len(rows) for _, _, rows in pending) >= PARALLEL_SAVE_MIN_ROWS
+
+    def save(self, filename):
+        pending, self._pending = self._pending, []
+        raw_sheets = {}
+        render_dir = None
+        try:
+            if self._parallel_save(pending):
+                render_dir = tempfile.mkdtemp(prefix='plc5_xlsx_')
+                raw_sheets = _render_in_workers(pending, render_dir)
+            else:
+                for ws, headers, rows in pending:
+                    if len(rows) >= RAW_XML_MIN_ROWS:
+                        raw_sheet = raw_sheets[ws.title] = RawSheet()
+                        raw_sheet.write_rows(iter_sheet_rows(headers, rows, raw_sheet.widths))
+                    else:
+                        _append_rows(ws, headers, rows)
+
+            super().save(filename)
+            if raw_sheets:
+                _splice_raw_sheets(filename, raw_sheets)
+        finally:
+            for raw_sheet in raw_sheets.values():
+                raw_sheet.close()
+            if render_dir:
+                shutil.rmtree(render_dir, ignore_errors=True)
+            for spool in self._spools:
+                spool.close()
+            self._spools = []
+
+
+def new_workbook():
+    """An empty streaming (write-only) workbook"""
+    return StreamingWorkbook()
+
+
+def sheet_headers(headers):
+    """Sheet header row, with Description replaced by Desc1..Desc5"""
+    if 'Description' not in headers:
+        return list(headers)
+    desc_index = headers.index('Description')
+    return headers[:desc_index] + DESCRIPTION_COLUMNS + headers[desc_index + 1:]
+
+
+def split_description(text):
+    """Split a description into exactly five columns, padding with empty strings"""
+    parts = [part.strip() for part in _DESCRIPTION_SEPARATORS.split(str(text).strip()) if part.strip()]
+    return (parts + [''] * 5)[:5]
+
+
+def sheet_values(headers, row, desc_index=None):
+    """Cell values for one row (a dict keyed by header, or a sequence)"""
+    if isinstance(row, dict):
+        values = [row.get(h, '') for h in headers]
+    else:
+        values = list(row)
+    if desc_index is not None:
+        values[desc_index:desc_index + 1] = split_description(values[desc_index])
+    return values
+
+
+class ColumnWidths:
+    """Tracks the longest value per column as rows pass through"""
+
+    def __init__(self):
+        self.lengths = []
+
+    def update(self, values):
+        lengths = self.lengths
+        if len(values) > len(lengths):
+            lengths.extend([0] * (len(values) - len(lengths)))
+        for col, value in enumerate(values):
+            if value and lengths[col] < MAX_COLUMN_WIDTH:
+                length = len(str(value))
+                if length > lengths[col]:
+                    lengths[col] = length
+
+    def widths(self):
+        return [min(length + 2, MAX_COLUMN_WIDTH) for length in self.lengths]
+
+
+def iter_sheet_rows(headers, rows, widths=None):
+    """Yield the header row and then every value row, updating widths if given"""
+    header_row = sheet_headers(headers)
+    desc_index = headers.index('Description') if 'Description' in headers else None
+    if widths is not None:
+        widths.update(header_row)
+    yield header_row
+    for row in rows:
+        values = sheet_values(headers, row, desc_index)
+        if widths is not None:
+            widths.update(values)
+        yield values
+
+
+def stream_sheet(wb, sheet_name, headers, rows):
+    """
+    Add a sheet of rows with auto-sized columns; returns the row count.
+    Workbooks (or collections) with add_sheet queue the rows for later.
+    """
+    if hasattr(wb, 'add_sheet'):
+        return wb.add_sheet(sheet_name, headers, rows)
+    return _append_rows(wb.create_sheet(title=sheet_name), headers, rows)
+
+
+def _append_rows(ws, headers, rows):
+    """Stream rows into an empty write-only sheet; returns the row count"""
+    widths = ColumnWidths()
+    count = 0
+    with tempfile.TemporaryFile() as spool:
+        for values in iter_sheet_rows(headers, rows, widths):
+            pickle.dump(values, spool, pickle.HIGHEST_PROTOCOL)
+            count += 1
+
+        for col_idx, width in enumerate(widths.widths(), 1):
+            ws.column_dimensions[get_column_letter(col_idx)].width = width
+
+        spool.seek(0)
+        for _ in range(count):
+            ws.append(pickle.load(spool))
+    return count - 1
+
+
+def _cell_xml(ref, value):
+    if isinstance(value, bool):
+        return f'<c r="{ref}" t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, int) or (isinstance(value, float) and math.isfinite(value)):
+        return f'<c r="{ref}"><v>{value!r}</v></c>'
+    text = escape(_ILLEGAL_XML_CHARS.sub('', str(value)))
+    return f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+class RawSheet:
+    """
+    Sheet rows rendered directly to <sheetData> XML in a temporary file,
+    with column widths tracked as they are written.
+    """
+
+    def __init__(self):
+        self.body = tempfile.TemporaryFile()
+        self.widths = ColumnWidths()
+        self.rows = 0
+        self._letters = []
+
+    def _letter(self, col):
+        letters = self._letters
+        while len(letters) <= col:
+            letters.append(get_column_letter(len(letters) + 1))
+        return letters[col]
+
+    def write_rows(self, rows):
+        chunk = []
+        for values in rows:
+            self.rows += 1
+            r = self.rows
+            cells = ''.join(
+                _cell_xml(f"{self._letter(col)}{r}", value)
+                for col, value in enumerate(values)
+                if value is not None and value != ''
+            )
+            chunk.append(f'<row r="{r}">{cells}</row>')
+            if len(chunk) >= _RAW_CHUNK_ROWS:
+                self.body.write(''.join(chunk).encode('utf-8'))
+                chunk = []
+        if chunk:
+            self.body.write(''.join(chunk).encode('utf-8'))
+
+    def write_to(self, out):
+        """Write the complete worksheet XML to a binary file object"""
+        cols = ''.join(
+            f'<col min="{col}" max="{col}" width="{width}" customWidth="1"/>'
+            for col, width in enumerate(self.widths.widths(), 1)
+        )
+        out.write(
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<worksheet xmlns="{_MAIN_NS}">'
+            '<sheetViews><sheetView workbookViewId="0"/></sheetViews>'
+            '<sheetFormatPr defaultRowHeight="15"/>'
+            f'{"<cols>" + cols + "</cols>" if cols else ""}'
+            '<sheetData>'.encode('utf-8')
+        )
+        self.body.seek(0)
+        while True:
+            block = self.body.read(1 << 20)
+            if not block:
+                break
+            out.write(block)
+        out.write(
+            '</sheetData>'
+            '<pageMargins left="0.75" right="0.75" top="1" bottom="1" header="0.5" footer="0.5"/>'
+            '</worksheet>'.encode('utf-8')
+        )
+
+    def close(self):
+        self.body.close()
+
+
+class _SheetFile:
+    """A worksheet part rendered to a file by a worker process"""
+
+    def __init__(self, path):
+        self.path = path
+
+    def write_to(self, out):
+        with open(self.path, 'rb') as f:
+            shutil.copyfileobj(f, out, 1 << 20)
+
+    def close(self):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+def _render_sheet_file(headers, spool_path, path):
+    """Worker process: render one complete worksheet part to path from a RowSpool file"""
+    raw_sheet = RawSheet()
+    try:
+        raw_sheet.write_rows(iter_sheet_rows(headers, iter_spool(spool_path), raw_sheet.widths))
+        with open(path, 'wb') as out:
+            raw_sheet.write_to(out)
+    finally:
+        raw_sheet.close()
+    return path
+
+
+def _render_in_workers(pending, render_dir):
+    """Render every pending sheet in its own worker process; returns {title: _SheetFile}"""
+    # Largest first, so the longest render starts straight away
+    pending = sorted(pending, key=lambda item: len(item[2]), reverse=True)
+    for _, _, rows in pending:
+        rows.flush()
+    workers = min(len(pending), os.cpu_count() or 1)
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        futures = {
+            ws.title: executor.submit(
+                _render_sheet_file, headers, rows.path, os.path.join(render_dir, f"sheet{index}.xml")
+            )
+            for index, (ws, headers, rows) in enumerate(pending)
+        }
+        return {title: _SheetFile(future.result()) for title, future in futures.items()}
+
+
+def _sheet_parts(package):
+    """Map sheet titles to their worksheet part names in an xlsx zip"""
+    workbook = ElementTree.fromstring(package.read('xl/workbook.xml'))
+    rels = ElementTree.fromstring(package.read('xl/_rels/workbook.xml.rels'))
+    targets = {
+        rel.get('Id'): rel.get('Target')
+        for rel in rels.iter(f'{{{_PKG_REL_NS}}}Relationship')
+    }
+    parts = {}
+    for sheet in workbook.iter(f'{{{_MAIN_NS}}}sheet'):
+        target = targets[sheet.get(f'{{{_DOC_REL_NS}}}id')]
+        parts[sheet.get('name')] = target[1:] if target.startswith('/') else f'xl/{target}'
+    return parts
+
+
+def _splice_raw_sheets(filename, raw_sheets):
+    """Rewrite a saved xlsx, replacing each placeholder sheet with its raw XML"""
+    spliced = f"{filename}.tmp"
+    with zipfile.ZipFile(filename) as package:
+        parts = _sheet_parts(package)
+        raw_parts = {parts[title]: raw_sheet for title, raw_sheet in raw_sheets.items()}
+        # Fast deflate for the raw parts, which are large and mostly text
+        with zipfile.ZipFile(spliced, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as out:
+            for item in package.infolist():
+                raw_sheet = raw_parts.get(item.filename)
+                if raw_sheet is None:
+                    out.writestr(item, package.read(item.filename))
+                    continue
+                with out.open(item.filename, 'w', force_zip64=True) as part:
+                    raw_sheet.write_to(part)
+    os.replace(spliced, filename)
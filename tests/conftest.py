@@ -0,0 +1,70 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import plc5_backend
+from plc5_api import export_project
+from plc5_backend import ComProxy, Recorder
+
+
+DEMO_PC5 = """\
+PROJECT "DEMO"
+LADDER 2 MAIN
+SOR XIC I:000/00 XIC B3:0/5 TON T4:0 1.0 100 0 EOR
+SOR XIC T4:0/DN CTU C5:0 10 0 EOR
+SOR MSG MG9:0 PLC5 N7:0 READ N7:10 5 12 N7:20 5 LOCAL 1A EOR
+SOR XIC I:000/01 OTE O:001/00 MOV N7:0 N7:1 EOR
+LADDER 3 SUB
+SOR FAL R6:0 10 0 ALL N7:0 N7:10 EOR
+DATA B3:0
+32 0 0
+DATA N7:0
+5 10 15 20
+DATA T4:0
+8192 100 50
+DATA C5:0
+0 10 3
+DATA R6:0
+0 10 0
+DATA I:000
+3
+DATA O:001
+1
+"""
+
+# Outputs every test export writes: quick to produce and read back
+CSV_OPTIONS = {'export_xlsx': False, 'export_csv': True}
+
+
+@pytest.fixture
+def write_pc5(tmp_path):
+    """write_pc5('sub/X.pc5') writes the demo project there (under tmp_path) and returns its path"""
+    def write(relative, text=DEMO_PC5):
+        path = tmp_path / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding='utf-8')
+        return str(path)
+    return write
+
+
+@pytest.fixture
+def record_fixture(tmp_path, monkeypatch):
+    """record_fixture(pc5_path, fixture_path, options) records an export of a .pc5 project as a .plc5rec fixture"""
+    def record(pc5_path, fixture_path, options=CSV_OPTIONS):
+        recorder = Recorder(os.path.basename(pc5_path))
+        open_project = plc5_backend.ProjectOpener.open
+
+        def open_recorded(self, path, record_to=None, stats=None):
+            return ComProxy(open_project(self, path, None, stats), 'project', recorder.hook)
+
+        with monkeypatch.context() as patch:
+            patch.setattr(plc5_backend.ProjectOpener, 'open', open_recorded)
+            output = tmp_path / 'recording'
+            result = export_project(pc5_path, dict(options, output_folder=str(output)))
+        assert result.ok, result.error
+        recorder.save(fixture_path)
+        return fixture_path
+    return record
@@ -0,0 +1,63 @@
+import pytest
+
+from plc5_address import Address, data_type, format_address, normalize_address, parse_address, value_word
+
+
+@pytest.mark.parametrize('text, address', [
+    ('N7:0', Address('N', 7, 0, None, None)),
+    ('I:012/07', Address('I', 1, 10, None, 7)),
+    ('O:001/00', Address('O', 0, 1, None, 0)),
+    ('B3:0/5', Address('B', 3, 0, None, 5)),
+    ('B3/21', Address('B', 3, 1, None, 5)),
+    ('T4:0.ACC', Address('T', 4, 0, 'ACC', None)),
+    ('T4:0/DN', Address('T', 4, 0, 'DN', None)),
+    ('S:1', Address('S', 2, 1, None, None)),
+])
+def test_parse_address(text, address):
+    assert parse_address(text) == address
+
+
+@pytest.mark.parametrize('text', ['', 'ALL', 'N:0', 'I:019', 'T4:0.ACC/DN'])
+def test_parse_address_rejects(text):
+    assert parse_address(text) is None
+
+
+@pytest.mark.parametrize('text, normalized', [
+    ('B3/21', 'B3:1/5'),
+    ('B3/0', 'B3:0/0'),
+    ('T4:0.DN', 'T4:0/DN'),
+    ('R6:0.EN', 'R6:0/EN'),
+    ('T4:0/DN', 'T4:0/DN'),
+    ('T4:0.ACC', 'T4:0.ACC'),
+    ('I:012/07', 'I:012/07'),
+    ('N7:0', 'N7:0'),
+    ('PLC5', 'PLC5'),
+])
+def test_normalize_address(text, normalized):
+    assert normalize_address(text) == normalized
+
+
+@pytest.mark.parametrize('text, name', [
+    ('B3/21', 'Bit'),
+    ('N7:0', 'Integer'),
+    ('F8:1', 'Float'),
+    ('T4:0.DN', 'Timer'),
+    ('C5:0/DN', 'Counter'),
+    ('R6:0.POS', 'Control'),
+    ('I:000/01', 'Input'),
+    ('LOCAL', 'Unknown'),
+])
+def test_data_type(text, name):
+    assert data_type(text) == name
+
+
+def test_format_address():
+    assert format_address('I', 1, 10) == 'I:012'
+    assert format_address('S', 2, 1) == 'S:1'
+    assert format_address('T', 4, 0, 'ACC') == 'T4:0.ACC'
+
+
+def test_value_word():
+    assert value_word(parse_address('B3:0/5')) == ('B3:0', 5)
+    assert value_word(parse_address('T4:0/DN')) == ('T4:0', 13)
+    assert value_word(parse_address('T4:0.ACC')) == ('T4:0.ACC', None)
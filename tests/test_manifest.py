@@ -0,0 +1,87 @@
+import os
+
+from plc5_manifest import MANIFEST_FILE, ExportManifest
+
+
+OPTIONS = {'export_tags': True}
+
+
+def exported(write_pc5, tmp_path, relative, output_name):
+    """A project and an output file standing in for its workbook"""
+    project = write_pc5(relative)
+    output = tmp_path / output_name
+    output.write_text('workbook', encoding='utf-8')
+    return project, str(output)
+
+
+def test_unchanged_after_save_and_load(write_pc5, tmp_path):
+    project, output = exported(write_pc5, tmp_path, 'in/X.pc5', 'X_Export.xlsx')
+    manifest = ExportManifest.load(str(tmp_path))
+    assert manifest.unchanged(project, OPTIONS) is None
+    manifest.record(project, OPTIONS, output)
+    manifest.save()
+
+    assert os.path.exists(tmp_path / MANIFEST_FILE)
+    reloaded = ExportManifest.load(str(tmp_path))
+    assert reloaded.unchanged(project, OPTIONS) == os.path.abspath(output)
+
+
+def test_touched_but_identical_project_is_unchanged(write_pc5, tmp_path):
+    project, output = exported(write_pc5, tmp_path, 'in/X.pc5', 'X_Export.xlsx')
+    manifest = ExportManifest.load(str(tmp_path))
+    manifest.record(project, OPTIONS, output)
+    stat = os.stat(project)
+    os.utime(project, (stat.st_atime, stat.st_mtime + 60))
+    assert manifest.unchanged(project, OPTIONS) == os.path.abspath(output)
+
+
+def test_changes_are_detected(write_pc5, tmp_path):
+    project, output = exported(write_pc5, tmp_path, 'in/X.pc5', 'X_Export.xlsx')
+    manifest = ExportManifest.load(str(tmp_path))
+    manifest.record(project, OPTIONS, output)
+
+    assert manifest.unchanged(project, {'export_tags': False}) is None
+
+    # A symbol database added next to the project
+    with open(os.path.splitext(project)[0] + '.csv', 'w', encoding='utf-8') as f:
+        f.write('"N7:0","Speed","Line speed"\n')
+    assert manifest.unchanged(project, OPTIONS) is None
+    manifest.record(project, OPTIONS, output)
+    assert manifest.unchanged(project, OPTIONS) == os.path.abspath(output)
+
+    with open(project, 'a', encoding='utf-8') as f:
+        f.write('DATA N7:1\n1\n')
+    assert manifest.unchanged(project, OPTIONS) is None
+
+
+def test_missing_output_is_not_unchanged(write_pc5, tmp_path):
+    project, output = exported(write_pc5, tmp_path, 'in/X.pc5', 'X_Export.xlsx')
+    manifest = ExportManifest.load(str(tmp_path))
+    manifest.record(project, OPTIONS, output)
+    os.remove(output)
+    assert manifest.unchanged(project, OPTIONS) is None
+
+
+def test_output_claimed_by_another_project(write_pc5, tmp_path):
+    first, output = exported(write_pc5, tmp_path, 'in/X.pc5', 'X_Export.xlsx')
+    second = write_pc5('in/sub/X.pc5')
+    manifest = ExportManifest.load(str(tmp_path))
+    manifest.record(first, OPTIONS, output)
+    manifest.record(second, OPTIONS, output)
+
+    # The file now holds the second project's export
+    assert manifest.unchanged(first, OPTIONS) is None
+    assert manifest.unchanged(second, OPTIONS) == os.path.abspath(output)
+    assert len(manifest.projects) == 1
+
+
+def test_output_claimed_twice_in_an_old_manifest(write_pc5, tmp_path):
+    first, output = exported(write_pc5, tmp_path, 'in/X.pc5', 'X_Export.xlsx')
+    second = write_pc5('in/sub/X.pc5')
+    manifest = ExportManifest.load(str(tmp_path))
+    manifest.record(first, OPTIONS, output)
+    manifest.record(second, OPTIONS, str(tmp_path / 'other.xlsx'))
+    manifest.projects[manifest._key(second)]['output'] = os.path.abspath(output)
+
+    assert manifest.unchanged(first, OPTIONS) is None
+    assert manifest.unchanged(second, OPTIONS) is None
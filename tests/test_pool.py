@@ -0,0 +1,103 @@
+import os
+
+import pytest
+
+from conftest import CSV_OPTIONS, DEMO_PC5
+from PLC5ExcelExporterMsgs_Folder import PLC5ExcelExporter
+from plc5_api import export_folder, export_settings
+from plc5_backend import output_names
+from plc5_manifest import ExportManifest
+from plc5_pool import ExportPool
+
+
+def test_output_names():
+    folder = os.path.join(os.sep, 'projects')
+    paths = [os.path.join(folder, *parts) for parts in (
+        ('X.pc5',), ('sub', 'X.pc5'), ('Y.rsp',), ('a', 'sub', 'X.pc5'), ('sub_X.pc5',), ('other', 'y.pc5'))]
+    names = output_names(paths, folder)
+
+    assert names[paths[0]] == 'X'
+    assert names[paths[3]] == 'a_sub_X'
+    assert names[paths[4]] == 'sub_X'
+    # sub_X is taken by sub_X.pc5, so sub/X.pc5 gets a hash of its path
+    assert names[paths[1]].startswith('sub_X_') and len(names[paths[1]]) == len('sub_X_') + 8
+    # y.pc5 would overwrite Y.rsp's files on Windows
+    assert names[paths[2]] == 'Y'
+    assert names[paths[5]] == 'other_y'
+    assert len({name.lower() for name in names.values()}) == len(paths)
+
+
+def test_pool_exports_pc5_and_fixtures(write_pc5, record_fixture, tmp_path):
+    pc5 = write_pc5('in/Line1.pc5')
+    fixture = record_fixture(write_pc5('source/Line2.pc5'), str(tmp_path / 'in' / 'Line2.plc5rec'))
+    output = tmp_path / 'out'
+    output.mkdir()
+    settings = export_settings(dict(CSV_OPTIONS, output_folder=str(output)))
+    logged = []
+
+    results = ExportPool(PLC5ExcelExporter.headless, settings, 2).run([pc5, fixture], logged.append)
+
+    assert sorted(result.path for result in results) == sorted([pc5, fixture])
+    for result in results:
+        assert result.ok, result.error
+        assert result.result['rungs'] == 5
+        assert result.worker in (1, 2)
+    assert any(name.startswith('Line1_Rungs_') for name in os.listdir(output))
+    assert any(name.startswith('Line2_Rungs_') for name in os.listdir(output))
+    assert any(message.startswith('[w') for message in logged)
+
+
+def test_pool_reports_failures(write_pc5, tmp_path):
+    good = write_pc5('in/Good.pc5')
+    missing = str(tmp_path / 'in' / 'Missing.pc5')
+    settings = export_settings(dict(CSV_OPTIONS, output_folder=str(tmp_path / 'out')))
+    os.makedirs(settings['output_folder'])
+
+    results = {result.path: result for result in
+               ExportPool(PLC5ExcelExporter.headless, settings, 2).run([good, missing], lambda message: None)}
+
+    assert results[good].ok
+    assert not results[missing].ok and results[missing].error
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_same_name_in_two_subfolders(write_pc5, tmp_path, workers):
+    first = write_pc5('in/X.pc5')
+    second = write_pc5('in/sub/X.pc5', DEMO_PC5.replace('"DEMO"', '"OTHER"'))
+    output = tmp_path / 'out'
+    options = dict(CSV_OPTIONS, export_jsonl=True, workers=workers, output_folder=str(output))
+
+    batch = export_folder(str(tmp_path / 'in'), options)
+
+    assert batch.ok and batch.exported == 2
+    outputs = {result.path: result.output for result in batch.results}
+    assert len(set(outputs.values())) == 2
+    assert os.path.basename(outputs[first]).startswith('X_')
+    assert os.path.basename(outputs[second]).startswith('sub_X_')
+    names = os.listdir(output)
+    for suffix in ('Tags', 'Rungs', 'Processor'):
+        assert len([name for name in names if f'X_{suffix}_' in name and name.endswith('.csv')]) == 2
+        assert len([name for name in names if f'X_{suffix}_' in name and name.endswith('.jsonl')]) == 2
+
+    manifest = ExportManifest.load(str(output))
+    assert sorted(entry['output'] for entry in manifest.projects.values()) == sorted(outputs.values())
+
+    again = export_folder(str(tmp_path / 'in'), options)
+    assert again.unchanged == 2 and not again.results
+
+
+def test_same_name_fixtures_in_two_subfolders(write_pc5, record_fixture, tmp_path):
+    source = write_pc5('source/X.pc5')
+    fixtures = []
+    for folder in ('a', 'b'):
+        os.makedirs(tmp_path / 'in' / folder)
+        fixtures.append(record_fixture(source, str(tmp_path / 'in' / folder / 'X.plc5rec')))
+    output = tmp_path / 'out'
+
+    batch = export_folder(str(tmp_path / 'in'), dict(CSV_OPTIONS, replay_fixtures=True, workers=2,
+                                                     output_folder=str(output)))
+
+    assert batch.ok and batch.exported == 2
+    names = {result.path: os.path.basename(result.output) for result in batch.results}
+    assert names[fixtures[0]].startswith('a_X_') and names[fixtures[1]].startswith('b_X_')
+    assert sorted(result.path for result in batch.results) == sorted(fixtures)
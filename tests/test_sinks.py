@@ -0,0 +1,83 @@
+import csv
+import gzip
+import json
+import os
+
+from plc5_csvstream import CSV_LAYOUTS, CSVTables, csv_path
+from plc5_sinks import ExportJob, ExportSheets, primary_output, write_outputs
+
+
+TIMESTAMP = '20240101_120000'
+
+TAGS = {
+    'N7:0': {'Address': 'N7:0', 'Symbol': 'Speed', 'Description': 'Line speed', 'DataType': 'Integer', 'Value': 5},
+    'B3:0/5': {'Address': 'B3:0/5', 'Symbol': '', 'Description': '', 'DataType': 'Bit', 'Value': 1},
+}
+RUNGS = [
+    {'File_Name': 'MAIN', 'File_Number': 2, 'Rung_Number': 0, 'Rung_ASCII': 'SOR XIC B3:0/5 EOR'},
+]
+
+
+def read_csv(path):
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8', newline='') as f:
+        return list(csv.reader(f))
+
+
+def export_job(folder, **kwargs):
+    sheets = ExportSheets()
+    sheets.add_sheet('Processor', ['Name', 'Value'], [{'Name': 'Type', 'Value': 'PLC-5/40'}])
+    sheets.add_sheet('Tags', CSV_LAYOUTS['tags'][2], list(TAGS.values()))
+    return ExportJob(str(folder), 'X', TIMESTAMP, 'X.pc5', sheets, {'tags': TAGS, 'rungs': RUNGS}, None, **kwargs)
+
+
+def test_csv_tables_write_only_tables_with_rows(tmp_path):
+    tables = CSVTables(str(tmp_path), 'X', TIMESTAMP)
+    for row in TAGS.values():
+        tables.append('tags', row)
+    tables.append('unknown', {'Address': 'N7:0'})
+    paths = tables.close()
+
+    assert paths == [csv_path(str(tmp_path), 'X', 'Tags', TIMESTAMP)]
+    rows = read_csv(paths[0])
+    assert rows[0] == ['PLC5_Address', 'Symbol', 'Description', 'DataType', 'Value']
+    assert rows[1] == ['N7:0', 'Speed', 'Line speed', 'Integer', '5']
+    assert len(rows) == 3
+
+
+def test_csv_tables_limited_to_tables(tmp_path):
+    tables = CSVTables(str(tmp_path), 'X', TIMESTAMP, tables=('rungs',))
+    tables.append('tags', TAGS['N7:0'])
+    tables.append('rungs', RUNGS[0])
+    assert [os.path.basename(path) for path in tables.close()] == [f'X_Rungs_{TIMESTAMP}.csv']
+
+
+def test_csv_and_jsonl_sinks(tmp_path):
+    outputs = write_outputs(export_job(tmp_path), ('csv', 'jsonl'), lambda message: None)
+
+    names = sorted(os.path.basename(path) for path in outputs['csv'])
+    assert names == [f'X_Processor_{TIMESTAMP}.csv', f'X_Rungs_{TIMESTAMP}.csv', f'X_Tags_{TIMESTAMP}.csv']
+    assert read_csv(str(tmp_path / f'X_Rungs_{TIMESTAMP}.csv'))[1] == ['MAIN', '2', '0', 'SOR XIC B3:0/5 EOR']
+    assert read_csv(str(tmp_path / f'X_Processor_{TIMESTAMP}.csv')) == [['Name', 'Value'], ['Type', 'PLC-5/40']]
+
+    with open(tmp_path / f'X_Tags_{TIMESTAMP}.jsonl', encoding='utf-8') as f:
+        records = [json.loads(line) for line in f]
+    assert records == list(TAGS.values())
+    assert primary_output(outputs) in outputs['csv'] + outputs['jsonl']
+
+
+def test_compressed_csv(tmp_path):
+    outputs = write_outputs(export_job(tmp_path, compression='gzip'), ('csv',), lambda message: None)
+    assert all(path.endswith('.csv.gz') for path in outputs['csv'])
+    assert read_csv(str(tmp_path / f'X_Tags_{TIMESTAMP}.csv.gz'))[1][0] == 'N7:0'
+
+
+def test_streamed_csv_tables_are_used(tmp_path):
+    # Tables streamed while collecting are closed by the sink, not written again
+    streamed = CSVTables(str(tmp_path), 'X', TIMESTAMP, tables=('rungs',))
+    streamed.append('rungs', RUNGS[0])
+    job = export_job(tmp_path, csv_tables=streamed)
+    outputs = write_outputs(job, ('csv',), lambda message: None)
+
+    names = sorted(os.path.basename(path) for path in outputs['csv'])
+    assert names == [f'X_Processor_{TIMESTAMP}.csv', f'X_Rungs_{TIMESTAMP}.csv']
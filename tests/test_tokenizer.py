@@ -0,0 +1,62 @@
+import pytest
+
+from plc5_tokenizer import Instruction, find_addresses, find_message_blocks, tokenize_rung
+
+
+def mnemonics(rung):
+    return [instruction.mnemonic for instruction in tokenize_rung(rung)]
+
+
+def test_fixed_arity_operands():
+    assert tokenize_rung('SOR XIC I:000/00 TON T4:0 1.0 100 0 EOR') == [
+        Instruction('SOR', []),
+        Instruction('XIC', ['I:000/00']),
+        Instruction('TON', ['T4:0', '1.0', '100', '0']),
+        Instruction('EOR', []),
+    ]
+
+
+@pytest.mark.parametrize('mnemonic', ['OSR', 'OSF'])
+def test_one_shot_takes_three_operands(mnemonic):
+    instructions = tokenize_rung(f'SOR XIC B3:0/0 {mnemonic} B3:0/1 0 N7:0 OTE O:001/00 EOR')
+    assert instructions[2] == Instruction(mnemonic, ['B3:0/1', '0', 'N7:0'])
+    assert instructions[3] == Instruction('OTE', ['O:001/00'])
+
+
+def test_unquoted_expression_is_one_operand():
+    # AND is an expression operator here, not the start of an AND instruction
+    instructions = tokenize_rung('SOR CPT N7:0 N7:1 AND N7:2 TON T4:0 1.0 100 0 EOR')
+    assert instructions[1] == Instruction('CPT', ['N7:0', 'N7:1 AND N7:2'])
+    assert instructions[2] == Instruction('TON', ['T4:0', '1.0', '100', '0'])
+
+
+def test_compare_expression():
+    instructions = tokenize_rung('SOR CMP N7:0 > N7:1 OTE B3:0/1 EOR')
+    assert instructions[1] == Instruction('CMP', ['N7:0 > N7:1'])
+    assert instructions[2] == Instruction('OTE', ['B3:0/1'])
+
+
+def test_quoted_expression_is_kept_whole():
+    instructions = tokenize_rung('SOR CPT N7:0 "N7:1 * 2" EOR')
+    assert instructions[1] == Instruction('CPT', ['N7:0', '"N7:1 * 2"'])
+
+
+def test_known_mnemonic_never_fills_an_operand_slot():
+    # MOV is short of its second operand; OTE still starts an instruction
+    assert mnemonics('SOR MOV N7:0 OTE B3:0/1 EOR') == ['SOR', 'MOV', 'OTE', 'EOR']
+
+
+def test_variable_length_instruction():
+    instructions = tokenize_rung('SOR MSG MG9:0 PLC5 N7:0 READ N7:10 5 12 N7:20 5 LOCAL 1A EOR')
+    assert instructions[1].operands == ['MG9:0', 'PLC5', 'N7:0', 'READ', 'N7:10', '5', '12', 'N7:20', '5', 'LOCAL', '1A']
+    assert list(find_message_blocks(instructions)) == ['MG9:0']
+
+
+def test_branches():
+    assert mnemonics('SOR BST XIC I:000/00 NXB XIC B3:0/5 BND OTE O:001/00 EOR') == [
+        'SOR', 'BST', 'XIC', 'NXB', 'XIC', 'BND', 'OTE', 'EOR']
+
+
+def test_addresses_are_normalized():
+    instructions = tokenize_rung('SOR XIC T4:0.DN XIO B3/21 CPT N7:0 N7:1 AND N7:2 EOR')
+    assert list(find_addresses(instructions)) == ['T4:0/DN', 'B3:1/5', 'N7:0', 'N7:1', 'N7:2']